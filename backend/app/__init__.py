@@ -1,32 +1,42 @@
-from flask import Flask,request
-from .extensions import db, migrate, cors
+from flask import Flask
+from .extensions import db, migrate, cors, response_cache
 from app.logging import setup_logging
 from app.errors.handlers import register_error_handlers
+from app.serialization import FastJSONProvider
+from app.metrics import init_metrics
+from app.cooperative import init_cooperative_io
+from app.events import campaign_events
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object("app.config.Config")
+    app.json = FastJSONProvider(app)
 
-    setup_logging(app)
+    # No-op unless running in a gevent worker (GUNICORN_WORKER_CLASS=gevent).
+    init_cooperative_io()
 
-    @app.before_request
-    def log_request():
-        app.logger.info(
-            f"{request.method} {request.path} from {request.remote_addr}"
-        )
-    @app.after_request
-    def log_response(response):
-        app.logger.info(
-            f"{request.method} {request.path} -> {response.status_code}"
-        )
-        return response
+    setup_logging(app)
+    init_metrics(app)
 
     db.init_app(app)
     migrate.init_app(app, db)
     cors.init_app(app)
+    response_cache.init_app(app)
+    campaign_events.init_app(app)
 
-    from .routes.campaigns import campaigns_bp
+    from .routes.accounts import accounts_bp
+    from .routes.campaigns import campaigns_bp, campaign_collection_bp
+    from .routes.jobs import jobs_bp
+    from .routes.system import system_bp
+    app.register_blueprint(accounts_bp, url_prefix="/api/accounts")
     app.register_blueprint(campaigns_bp, url_prefix="/api/campaigns")
+    app.register_blueprint(campaign_collection_bp, url_prefix="/api")
+    app.register_blueprint(jobs_bp, url_prefix="/api/jobs")
+    app.register_blueprint(system_bp, url_prefix="/api/system")
+
+    from .cli import accounts_cli, jobs_cli
+    app.cli.add_command(jobs_cli)
+    app.cli.add_command(accounts_cli)
     register_error_handlers(app)
 
     return app
\ No newline at end of file
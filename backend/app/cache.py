@@ -0,0 +1,183 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timezone
+
+from cachetools import TTLCache
+from flask import current_app, request
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+class LRUCacheBackend:
+    """In-process LRU with per-entry TTL. Entries are per process, but the
+    namespace versions live in the ``cache_versions`` table, so a bump by
+    any process (another web worker, a job worker, the scheduler) moves
+    every process onto fresh keys on its next read."""
+
+    def __init__(self, max_entries: int, ttl: float, db, versions):
+        self._entries = TTLCache(maxsize=max_entries, ttl=ttl)
+        self._lock = threading.Lock()
+        self._db = db
+        self._versions = versions
+
+    def get(self, key: str):
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: dict):
+        with self._lock:
+            self._entries[key] = value
+
+    def get_version(self, namespace: str) -> int:
+        # A primary-key read in the request's own transaction.
+        try:
+            version = self._db.session.execute(
+                self._db.select(self._versions.c.version).where(
+                    self._versions.c.namespace == namespace
+                )
+            ).scalar()
+        except Exception:
+            self._db.session.rollback()
+            raise
+        return version or 0
+
+    def bump_version(self, namespace: str):
+        # On a connection of its own, leaving the caller's session alone.
+        table = self._versions
+        with self._db.engine.begin() as conn:
+            dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+            statement = dialect.insert(table).values(
+                namespace=namespace, version=1
+            )
+            conn.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["namespace"],
+                    set_={"version": table.c.version + 1},
+                )
+            )
+
+
+class RedisCacheBackend:
+    """Redis (or any Redis-compatible server) backend shared by every worker
+    process, so a version bump invalidates all of them at once."""
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis
+        except ImportError as ex:
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the redis package"
+            ) from ex
+
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = max(1, int(ttl))
+
+    def get(self, key: str):
+        raw = self._redis.get(key)
+        return json.loads(raw) if raw else None
+
+    def set(self, key: str, value: dict):
+        self._redis.set(key, json.dumps(value), ex=self._ttl)
+
+    def get_version(self, namespace: str) -> int:
+        return int(self._redis.get(f"{namespace}:version") or 0)
+
+    def bump_version(self, namespace: str):
+        self._redis.incr(f"{namespace}:version")
+
+
+class NullCacheBackend:
+    def get(self, key: str):
+        return None
+
+    def set(self, key: str, value: dict):
+        pass
+
+    def get_version(self, namespace: str) -> int:
+        return 0
+
+    def bump_version(self, namespace: str):
+        pass
+
+
+class ResponseCache:
+    """Read-through cache of serialized JSON responses.
+
+    Entries are keyed on a namespace, the namespace's current version and the
+    request's path and query parameters. Writers call ``bump`` after committing, which
+    moves readers onto fresh keys; stale entries simply age out.
+    """
+
+    def __init__(self, app=None):
+        self.backend = NullCacheBackend()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        kind = app.config.get("CACHE_BACKEND", "lru")
+        ttl = app.config.get("CACHE_TTL", 5)
+
+        if kind == "redis":
+            self.backend = RedisCacheBackend(app.config["CACHE_REDIS_URL"], ttl)
+        elif kind == "lru":
+            from app.extensions import db
+            from app.models.cache_version import CacheVersion
+
+            self.backend = LRUCacheBackend(
+                app.config.get("CACHE_MAX_ENTRIES", 1024),
+                ttl,
+                db,
+                CacheVersion.__table__,
+            )
+        else:
+            self.backend = NullCacheBackend()
+
+    def bump(self, namespace: str):
+        try:
+            self.backend.bump_version(namespace)
+        except Exception:
+            # The write already committed; a cache outage must not fail it.
+            current_app.logger.exception("Cache invalidation failed")
+
+    def cached_json(self, namespace: str, build):
+        """Returns a JSON response for the current request, serving it from
+        the cache when possible and answering 304 when the client's
+        ETag/Last-Modified still match. ``build`` returns the payload."""
+        entry = None
+        key = None
+
+        try:
+            version = self.backend.get_version(namespace)
+            key = f"{namespace}:v{version}:{_request_key()}"
+            entry = self.backend.get(key)
+        except Exception:
+            current_app.logger.exception("Cache read failed")
+
+        if entry is None:
+            body = current_app.json.dumps(build())
+            entry = {
+                "body": body,
+                "etag": hashlib.sha1(body.encode()).hexdigest(),
+                "last_modified": time.time(),
+            }
+            if key is not None:
+                try:
+                    self.backend.set(key, entry)
+                except Exception:
+                    current_app.logger.exception("Cache write failed")
+
+        response = current_app.response_class(
+            entry["body"], mimetype="application/json"
+        )
+        response.set_etag(entry["etag"])
+        response.last_modified = datetime.fromtimestamp(
+            int(entry["last_modified"]), tz=timezone.utc
+        )
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+
+def _request_key() -> str:
+    params = sorted(request.args.items(multi=True))
+    return hashlib.sha1(json.dumps([request.path, params]).encode()).hexdigest()
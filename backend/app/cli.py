@@ -0,0 +1,158 @@
+import click
+from flask.cli import AppGroup
+from app.config import Config
+from app.services.account_service import AccountService
+from app.services.campaign_service import CampaignService
+from app.services.metrics_service import MetricsService
+from app.services.sync_service import SyncService
+from app.workers.job_worker import run_periodic, run_workers
+from app.workers.scheduler import run_due, run_scheduler
+
+jobs_cli = AppGroup("jobs", help="Background job queue commands.")
+accounts_cli = AppGroup("accounts", help="Google Ads account commands.")
+
+
+@jobs_cli.command("work")
+@click.option(
+    "--concurrency",
+    "-c",
+    type=int,
+    default=None,
+    help="Number of worker processes (defaults to JOB_WORKER_CONCURRENCY).",
+)
+def work(concurrency):
+    """Run the job worker pool."""
+    run_workers(concurrency or Config.JOB_WORKER_CONCURRENCY)
+
+
+@jobs_cli.command("reconcile")
+def reconcile():
+    """Settle interrupted publishes against Google Ads once."""
+    summary = run_periodic("campaign-reconciler")
+    if summary is None:
+        click.echo("Another reconciler is running")
+        return
+    click.echo(
+        f"Checked {summary['checked']}: {summary['published']} published, "
+        f"{summary['reverted']} reverted to DRAFT"
+    )
+
+
+@jobs_cli.command("sync")
+def sync():
+    """Pull campaign status and budgets from Google Ads once."""
+    summary = SyncService.sync(min_interval=0)
+    if summary is None:
+        click.echo("No account to sync, or all are being synced")
+        return
+    for account in summary["accounts"]:
+        if "error" in account:
+            click.echo(
+                f"Sync of {account['customer_id']} failed: {account['error']}"
+            )
+            continue
+        click.echo(
+            f"{account['mode'].capitalize()} sync of {account['customer_id']}: "
+            f"{account['fetched']} fetched, {account['updated']} updated"
+        )
+
+
+@jobs_cli.command("compact-changes")
+def compact_changes():
+    """Compact the campaign change log and apply its retention once."""
+    summary = run_periodic("campaign-change-log")
+    if summary is None:
+        click.echo("Another compaction is running")
+        return
+    click.echo(
+        f"Removed {summary['compacted']} superseded and "
+        f"{summary['expired']} expired changes"
+    )
+
+
+@jobs_cli.command("schedule")
+@click.option(
+    "--once", is_flag=True,
+    help="Launch and end the campaigns due now, then exit.",
+)
+def schedule(once):
+    """Run the campaign launch scheduler (one instance leads at a time)."""
+    if not once:
+        run_scheduler()
+        return
+    summary = run_due()
+    click.echo(
+        f"Updated {summary['updated']} campaigns, {summary['failed']} failed"
+    )
+
+
+@jobs_cli.command("validate-drafts")
+def validate_drafts():
+    """Validate the creatives of every DRAFT campaign and store the results."""
+    summary = CampaignService.validate_drafts()
+    click.echo(
+        f"Checked {summary['checked']} drafts: {summary['invalid']} invalid; "
+        f"pruned {summary['pruned']} expired results"
+    )
+
+
+@jobs_cli.command("ingest-metrics")
+@click.option(
+    "--from", "start", type=click.DateTime(["%Y-%m-%d"]), default=None,
+    help="First day to load (defaults to the watermark minus the lookback).",
+)
+@click.option(
+    "--to", "end", type=click.DateTime(["%Y-%m-%d"]), default=None,
+    help="Last day to load (defaults to today).",
+)
+def ingest_metrics(start, end):
+    """Load daily campaign metrics from Google Ads once, or backfill a range."""
+    summary = MetricsService.ingest(
+        start.date() if start else None,
+        end.date() if end else None,
+        min_interval=0,
+    )
+    if summary is None:
+        click.echo("No account to load, or all are being loaded")
+        return
+    for account in summary["accounts"]:
+        if "error" in account:
+            click.echo(
+                f"Loading {account['customer_id']} failed: {account['error']}"
+            )
+            continue
+        click.echo(
+            f"Loaded {account['loaded']} of {account['fetched']} rows "
+            f"for {account['customer_id']}, {account['from']}..{account['to']}"
+        )
+
+
+@accounts_cli.command("list")
+def list_accounts():
+    """List registered Google Ads accounts."""
+    for account in AccountService.list_accounts():
+        click.echo(
+            f"{account.customer_id}  {account.status:<10} "
+            f"{account.login_customer_id or '-':<10}  {account.name or ''}"
+        )
+
+
+@accounts_cli.command("add")
+@click.argument("customer_id")
+@click.option("--name", default=None, help="Display name.")
+@click.option(
+    "--login-customer-id", default=None,
+    help="Manager account to call through (defaults to "
+    "GOOGLE_ADS_LOGIN_CUSTOMER_ID).",
+)
+def add_account(customer_id, name, login_customer_id):
+    """Register a Google Ads account."""
+    account = AccountService.add_account(customer_id, name, login_customer_id)
+    click.echo(f"Registered {account.customer_id}")
+
+
+@accounts_cli.command("discover")
+def discover_accounts():
+    """Register every client account under GOOGLE_ADS_LOGIN_CUSTOMER_ID."""
+    summary = AccountService.discover()
+    click.echo(f"Found {summary['found']} client accounts")
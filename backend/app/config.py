@@ -1,15 +1,206 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy.pool import NullPool
+from app.db_pool import InstrumentedQueuePool
 
 load_dotenv()
 
 
+def _flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+def _engine_options() -> dict:
+    url = os.getenv("DATABASE_URL") or ""
+    statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+    if _flag("DB_PGBOUNCER"):
+        # PgBouncer (transaction pooling) already pools server connections
+        # and rejects startup options, so keep no client-side pool and set
+        # statement_timeout on the database role instead.
+        return {"poolclass": NullPool, "pool_pre_ping": False}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_pre_ping": _flag("DB_POOL_PRE_PING", "true"),
+    }
+
+    if url.startswith("postgresql") and statement_timeout > 0:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={statement_timeout}"
+        }
+
+    return options
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options()
     GOOGLE_ADS_DEVELOPER_TOKEN = os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN")
     GOOGLE_ADS_CLIENT_ID = os.getenv("GOOGLE_ADS_CLIENT_ID")
     GOOGLE_ADS_CLIENT_SECRET = os.getenv("GOOGLE_ADS_CLIENT_SECRET")
     GOOGLE_ADS_REFRESH_TOKEN = os.getenv("GOOGLE_ADS_REFRESH_TOKEN")
     GOOGLE_ADS_LOGIN_CUSTOMER_ID = os.getenv("GOOGLE_ADS_LOGIN_CUSTOMER_ID")
-    GOOGLE_ADS_CUSTOMER_ID = os.getenv("GOOGLE_ADS_CUSTOMER_ID")
\ No newline at end of file
+    GOOGLE_ADS_CUSTOMER_ID = os.getenv("GOOGLE_ADS_CUSTOMER_ID")
+
+    # "fake" answers Google Ads calls from an in-process stand-in (see
+    # app/services/fake_google_ads.py) for local runs and load tests, with
+    # injected latency (+ jitter), UNAVAILABLE errors and per-customer
+    # mutate operation quota (0 = unlimited).
+    GOOGLE_ADS_BACKEND = os.getenv("GOOGLE_ADS_BACKEND", "api").lower()
+    FAKE_ADS_LATENCY_MS = float(os.getenv("FAKE_ADS_LATENCY_MS", "50"))
+    FAKE_ADS_JITTER_MS = float(os.getenv("FAKE_ADS_JITTER_MS", "20"))
+    FAKE_ADS_ERROR_RATE = float(os.getenv("FAKE_ADS_ERROR_RATE", "0"))
+    FAKE_ADS_OPS_PER_SECOND = float(os.getenv("FAKE_ADS_OPS_PER_SECOND", "0"))
+
+    JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "2"))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "5"))
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+    # Jobs of one Google Ads account running at once across all workers.
+    JOB_MAX_RUNNING_PER_CUSTOMER = int(
+        os.getenv("JOB_MAX_RUNNING_PER_CUSTOMER", "1")
+    )
+
+    # Seconds between reconciler runs in the job workers (0 disables), how
+    # long a publish may be in flight before it is checked, and how many
+    # campaigns one run (and one GAQL query) covers.
+    RECONCILE_INTERVAL = float(os.getenv("RECONCILE_INTERVAL", "60"))
+    RECONCILE_GRACE_SECONDS = int(os.getenv("RECONCILE_GRACE_SECONDS", "600"))
+    RECONCILE_BATCH_SIZE = int(os.getenv("RECONCILE_BATCH_SIZE", "200"))
+
+    # Status sync from Google Ads: seconds between runs (0 disables), the
+    # change_status rows read per run, the most changed campaigns fetched
+    # incrementally before falling back to a full read, and rows per UPDATE.
+    STATUS_SYNC_INTERVAL = float(os.getenv("STATUS_SYNC_INTERVAL", "300"))
+    STATUS_SYNC_CHANGE_LIMIT = int(
+        os.getenv("STATUS_SYNC_CHANGE_LIMIT", "10000")
+    )
+    STATUS_SYNC_MAX_INCREMENTAL = int(
+        os.getenv("STATUS_SYNC_MAX_INCREMENTAL", "1000")
+    )
+    STATUS_SYNC_BATCH_SIZE = int(os.getenv("STATUS_SYNC_BATCH_SIZE", "1000"))
+
+    GOOGLE_ADS_MAX_OPERATIONS_PER_REQUEST = int(
+        os.getenv("GOOGLE_ADS_MAX_OPERATIONS_PER_REQUEST", "1000")
+    )
+    BATCH_PUBLISH_MAX_CAMPAIGNS = int(
+        os.getenv("BATCH_PUBLISH_MAX_CAMPAIGNS", "1000")
+    )
+
+    # Per-attempt gRPC deadline, and the retry budget around it.
+    GOOGLE_ADS_CALL_TIMEOUT = float(os.getenv("GOOGLE_ADS_CALL_TIMEOUT", "30"))
+    GOOGLE_ADS_RETRY_ATTEMPTS = int(os.getenv("GOOGLE_ADS_RETRY_ATTEMPTS", "4"))
+    GOOGLE_ADS_RETRY_BASE_DELAY = float(
+        os.getenv("GOOGLE_ADS_RETRY_BASE_DELAY", "0.5")
+    )
+    GOOGLE_ADS_RETRY_MAX_DELAY = float(
+        os.getenv("GOOGLE_ADS_RETRY_MAX_DELAY", "8")
+    )
+    GOOGLE_ADS_RETRY_DEADLINE = float(
+        os.getenv("GOOGLE_ADS_RETRY_DEADLINE", "90")
+    )
+    GOOGLE_ADS_BREAKER_THRESHOLD = int(
+        os.getenv("GOOGLE_ADS_BREAKER_THRESHOLD", "5")
+    )
+    GOOGLE_ADS_BREAKER_RESET_SECONDS = float(
+        os.getenv("GOOGLE_ADS_BREAKER_RESET_SECONDS", "30")
+    )
+
+    # Client-side mutate operation budgets (see QuotaService).
+    ADS_QUOTA_DAILY_OPERATIONS = int(
+        os.getenv("ADS_QUOTA_DAILY_OPERATIONS", "15000")
+    )
+    ADS_QUOTA_CUSTOMER_OPS_PER_SECOND = float(
+        os.getenv("ADS_QUOTA_CUSTOMER_OPS_PER_SECOND", "50")
+    )
+    ADS_QUOTA_CUSTOMER_BURST = int(os.getenv("ADS_QUOTA_CUSTOMER_BURST", "1000"))
+    ADS_QUOTA_RESERVED_FRACTION = float(
+        os.getenv("ADS_QUOTA_RESERVED_FRACTION", "0.2")
+    )
+    ADS_QUOTA_MAX_WAIT = float(os.getenv("ADS_QUOTA_MAX_WAIT", "10"))
+
+    # Metrics ingestion: seconds between runs (0 disables), days loaded on
+    # the first run, days re-read before the watermark to pick up restated
+    # conversions, days per Ads query, and the longest range served.
+    METRICS_INGEST_INTERVAL = float(os.getenv("METRICS_INGEST_INTERVAL", "3600"))
+    METRICS_BACKFILL_DAYS = int(os.getenv("METRICS_BACKFILL_DAYS", "30"))
+    METRICS_LOOKBACK_DAYS = int(os.getenv("METRICS_LOOKBACK_DAYS", "3"))
+    METRICS_CHUNK_DAYS = int(os.getenv("METRICS_CHUNK_DAYS", "7"))
+    METRICS_MAX_RANGE_DAYS = int(os.getenv("METRICS_MAX_RANGE_DAYS", "731"))
+
+    # Scheduled launches (flask jobs schedule): the time zone campaign
+    # start and end dates are in, seconds between reloads of the upcoming
+    # launches and ends, how far ahead each reload looks, seconds a standby
+    # instance waits before trying to lead again, and campaigns claimed per
+    # transaction. Launches overdue by more than SCHEDULE_LAUNCH_GRACE_DAYS
+    # days are skipped, so campaigns published (and left paused) before
+    # the scheduler ran are not enabled all at once. Claimed campaigns are
+    # taken over after SCHEDULER_CLAIM_LEASE seconds (longer than the Ads
+    # calls of one batch can take); a failed switch is retried after
+    # SCHEDULER_RETRY_BASE_DELAY seconds, doubled per attempt up to
+    # SCHEDULER_RETRY_MAX_DELAY, and given up after SCHEDULER_MAX_ATTEMPTS.
+    SCHEDULE_TIMEZONE = os.getenv("SCHEDULE_TIMEZONE", "UTC")
+    SCHEDULE_LAUNCH_GRACE_DAYS = int(os.getenv("SCHEDULE_LAUNCH_GRACE_DAYS", "1"))
+    SCHEDULER_REFRESH_INTERVAL = float(os.getenv("SCHEDULER_REFRESH_INTERVAL", "60"))
+    SCHEDULER_LOOKAHEAD = float(os.getenv("SCHEDULER_LOOKAHEAD", "3600"))
+    SCHEDULER_LEADER_RETRY = float(os.getenv("SCHEDULER_LEADER_RETRY", "15"))
+    SCHEDULER_BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", "1000"))
+    SCHEDULER_CLAIM_LEASE = float(os.getenv("SCHEDULER_CLAIM_LEASE", "900"))
+    SCHEDULER_RETRY_BASE_DELAY = float(
+        os.getenv("SCHEDULER_RETRY_BASE_DELAY", "60")
+    )
+    SCHEDULER_RETRY_MAX_DELAY = float(
+        os.getenv("SCHEDULER_RETRY_MAX_DELAY", "3600")
+    )
+    SCHEDULER_MAX_ATTEMPTS = int(os.getenv("SCHEDULER_MAX_ATTEMPTS", "6"))
+
+    CAMPAIGN_PAGE_SIZE = int(os.getenv("CAMPAIGN_PAGE_SIZE", "50"))
+    CAMPAIGN_MAX_PAGE_SIZE = int(os.getenv("CAMPAIGN_MAX_PAGE_SIZE", "500"))
+
+    # Campaign change log (GET /api/campaigns/changes): seconds between
+    # compaction and retention runs in the job workers (0 disables), days a
+    # change stays readable, and the page sizes served.
+    CHANGE_LOG_INTERVAL = float(os.getenv("CHANGE_LOG_INTERVAL", "600"))
+    CHANGE_LOG_RETENTION_DAYS = int(os.getenv("CHANGE_LOG_RETENTION_DAYS", "7"))
+    CHANGES_PAGE_SIZE = int(os.getenv("CHANGES_PAGE_SIZE", "500"))
+    CHANGES_MAX_PAGE_SIZE = int(os.getenv("CHANGES_MAX_PAGE_SIZE", "5000"))
+
+    # Creative validation before publishing: seconds a stored result is
+    # reused, whether final URLs are fetched, URL checks run at once, the
+    # timeout of each, and seconds (and entries) a URL's outcome is cached
+    # per process; a creative whose URL failed is rechecked after that too.
+    CREATIVE_VALIDATION_MAX_AGE = float(os.getenv("CREATIVE_VALIDATION_MAX_AGE", "86400"))
+    URL_CHECK_ENABLED = _flag("URL_CHECK_ENABLED", "true")
+    URL_CHECK_CONCURRENCY = int(os.getenv("URL_CHECK_CONCURRENCY", "20"))
+    URL_CHECK_TIMEOUT = float(os.getenv("URL_CHECK_TIMEOUT", "5"))
+    URL_CHECK_CACHE_TTL = float(os.getenv("URL_CHECK_CACHE_TTL", "600"))
+    URL_CHECK_CACHE_SIZE = int(os.getenv("URL_CHECK_CACHE_SIZE", "10000"))
+
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+    BULK_CREATE_MAX_ROWS = int(os.getenv("BULK_CREATE_MAX_ROWS", "50000"))
+    BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "1000"))
+    BULK_COPY_THRESHOLD = int(os.getenv("BULK_COPY_THRESHOLD", "5000"))
+
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "lru")  # lru, redis or none
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_TTL = float(os.getenv("CACHE_TTL", "5"))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+
+    # Campaign status events (GET /api/campaigns/events, gevent workers
+    # only): events kept per web worker for Last-Event-ID resume, seconds
+    # between keep-alive comments on open streams, and the reconnect delay
+    # sent to clients.
+    # LISTEN needs a session-pooled connection: behind PgBouncer in
+    # transaction mode, point EVENTS_DATABASE_URL at the database directly.
+    EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "1000"))
+    EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+    EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+    EVENTS_DATABASE_URL = os.getenv("EVENTS_DATABASE_URL")
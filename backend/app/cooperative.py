@@ -0,0 +1,52 @@
+import sys
+
+_initialized = False
+
+
+def gevent_active() -> bool:
+    """True in a process whose sockets gevent has monkey patched (Gunicorn
+    ``gevent`` workers)."""
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("socket")
+
+
+def init_cooperative_io():
+    """Makes the drivers that don't go through Python sockets yield to
+    other greenlets while they wait, once per process.
+
+    gevent's monkey patching covers sockets, ``time.sleep`` and locks, which
+    is enough for HTTP, Redis and quota waits, but psycopg2 and gRPC do
+    their I/O in C: psycopg2 gets a wait callback that polls its socket
+    through gevent, and gRPC is switched to its gevent-compatible polling
+    so Google Ads calls park only the greenlet that made them. Does nothing
+    outside a patched process, so the same app runs under sync workers.
+    Green psycopg2 connections can't ``COPY``, so bulk creates fall back to
+    INSERTs in patched processes.
+    """
+    global _initialized
+
+    if _initialized or not gevent_active():
+        return
+
+    import grpc.experimental.gevent
+    from psycopg2 import extensions
+
+    grpc.experimental.gevent.init_gevent()
+    extensions.set_wait_callback(_psycopg2_wait)
+    _initialized = True
+
+
+def _psycopg2_wait(connection, timeout=None):
+    from gevent.socket import wait_read, wait_write
+    from psycopg2 import OperationalError, extensions
+
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            return
+        if state == extensions.POLL_READ:
+            wait_read(connection.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(connection.fileno(), timeout=timeout)
+        else:
+            raise OperationalError(f"Bad result from poll: {state!r}")
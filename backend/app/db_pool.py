@@ -0,0 +1,94 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from app.metrics import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_SATURATION,
+    DB_POOL_TIMEOUTS,
+)
+
+
+class PoolStats:
+    """Process-wide connection checkout counters, shared by every pool the
+    engine creates (``engine.dispose()`` replaces the pool instance)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        DB_POOL_CHECKOUT_WAIT.observe(waited)
+        if timed_out:
+            DB_POOL_TIMEOUTS.inc()
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a free
+    connection (including time spent opening a new one)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - start)
+        DB_POOL_CHECKED_OUT.inc()
+        self._observe_saturation()
+        return record
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        DB_POOL_CHECKED_OUT.dec()
+        self._observe_saturation()
+
+    def _observe_saturation(self):
+        capacity = self.size() + max(self._max_overflow, 0)
+        if capacity:
+            DB_POOL_SATURATION.set(self.checkedout() / capacity)
+
+
+def pool_status(engine) -> dict:
+    """Current occupancy of ``engine``'s pool plus the checkout counters."""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__, **pool_stats.snapshot()}
+
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=checked_out,
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            saturation=round(checked_out / capacity, 4) if capacity else None,
+        )
+
+    return status
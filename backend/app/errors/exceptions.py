@@ -23,6 +23,30 @@ class ConflictError(AppError):
     message = "Conflict"
 
 
+class UnsupportedError(AppError):
+    status_code = 501
+    message = "Not supported by this server"
+
+
 class ExternalServiceError(AppError):
     status_code = 502
     message = "External service error"
+
+
+class ServiceUnavailableError(ExternalServiceError):
+    status_code = 503
+    message = "Service temporarily unavailable"
+
+    def __init__(self, message: str | None = None, retry_after: int | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class RateLimitedError(ServiceUnavailableError):
+    status_code = 429
+    message = "Rate limit exceeded"
+
+
+class GoneError(AppError):
+    status_code = 410
+    message = "Resource no longer available"
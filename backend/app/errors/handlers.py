@@ -8,9 +8,12 @@ def register_error_handlers(app):
     @app.errorhandler(AppError)
     def handle_app_error(error):
         app.logger.warning(str(error))
+        headers = {}
+        if getattr(error, "retry_after", None):
+            headers["Retry-After"] = str(error.retry_after)
         return jsonify({
             "error": error.message
-        }), error.status_code
+        }), error.status_code, headers
 
     @app.errorhandler(404)
     def handle_404(error):
@@ -0,0 +1,347 @@
+import itertools
+import json
+import os
+import select
+import threading
+import time
+import uuid
+from collections import deque
+
+from flask import current_app
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import NullPool
+
+from app.extensions import db
+from app.models.campaign import Campaign
+
+# PostgreSQL channel the status deltas are sent on.
+CHANNEL = "campaign_events"
+
+# NOTIFY payloads must stay under 8000 bytes.
+MAX_PAYLOAD_BYTES = 7500
+
+# How far before a time marker (see CampaignEvents) events are sent again,
+# covering clock skew between hosts and a list loaded just before the
+# stream was opened. Deltas are idempotent, so repeats are harmless.
+MARKER_MARGIN_SECONDS = 5
+
+# session.info keys of the transaction's event id prefix, the number of
+# events it sent and (off PostgreSQL) the deltas held until commit.
+_TXID = "campaign_events.txid"
+_COUNT = "campaign_events.count"
+_PENDING = "campaign_events.pending"
+
+
+def status_delta(campaign_id, status: str, google_campaign_id) -> dict:
+    return {
+        "id": str(campaign_id),
+        "status": status,
+        "google_campaign_id": google_campaign_id,
+    }
+
+
+class CampaignEvents:
+    """Campaign status deltas, fanned out to every web worker.
+
+    Services call ``publish`` inside the transaction that changes the
+    statuses. On PostgreSQL the deltas go out with ``pg_notify``, so they
+    are delivered when (and only if) the transaction commits, in commit
+    order, to every process listening on ``CHANNEL``. Each web worker
+    starts one listener thread on its first subscriber; it keeps the last
+    ``EVENTS_BUFFER_SIZE`` events in a ring buffer so a reconnecting client
+    resumes after its ``Last-Event-ID``. Ids that aren't a buffered event's
+    are time markers (``@`` and epoch milliseconds), which any worker can
+    resume from: new clients get one straight away, and so does every
+    reset. A client whose id is no longer (or not yet) buffered gets a
+    ``reset`` event and reloads its list. On
+    other databases (SQLite in local development) deltas are delivered
+    after commit to the committing process only.
+    """
+
+    def __init__(self, app=None):
+        self._condition = threading.Condition()
+        self._buffer = deque(maxlen=1000)
+        self._seq = 0
+        # Receive time of the newest event that fell out of the buffer.
+        self._evicted_at = 0.0
+        self._ids = itertools.count()
+        self._token = uuid.uuid4().hex[:8]
+        self._listener_pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self._buffer = deque(
+            self._buffer, maxlen=app.config.get("EVENTS_BUFFER_SIZE", 1000)
+        )
+
+        for name, listener in (
+            ("after_commit", self._after_commit),
+            ("after_soft_rollback", self._after_rollback),
+        ):
+            if not event.contains(db.session, name, listener):
+                event.listen(db.session, name, listener)
+
+    def publish(self, deltas: list[dict]):
+        """Sends ``deltas`` (see ``status_delta``) when the current
+        ``db.session`` transaction commits."""
+        if not deltas:
+            return
+
+        session = db.session
+        if session.get_bind().dialect.name != "postgresql":
+            session.info.setdefault(_PENDING, []).extend(deltas)
+            return
+
+        if _TXID not in session.info:
+            session.info[_TXID] = session.execute(
+                db.select(db.func.txid_current())
+            ).scalar()
+            session.info[_COUNT] = 0
+
+        for chunk in _chunks(deltas):
+            session.info[_COUNT] += 1
+            payload = json.dumps(
+                {
+                    "id": f"{session.info[_TXID]}-{session.info[_COUNT]}",
+                    "deltas": chunk,
+                },
+                separators=(",", ":"),
+            )
+            session.execute(db.select(db.func.pg_notify(CHANNEL, payload)))
+
+    def publish_current(self, campaign_ids):
+        """Publishes the current status of ``campaign_ids`` as read in the
+        current transaction, for bulk updates that don't return their
+        rows."""
+        if not campaign_ids:
+            return
+
+        rows = db.session.execute(
+            db.select(Campaign.id, Campaign.status, Campaign.google_campaign_id)
+            .where(Campaign.id.in_(list(campaign_ids)))
+        ).all()
+        self.publish([status_delta(*row) for row in rows])
+
+    def subscribe(self, last_event_id: str | None) -> tuple[int, list]:
+        """Position of a new subscriber in the buffer and the entries to send
+        it first: the buffered events after ``last_event_id``, a reset when
+        that id is unknown, or only a time marker for a new client."""
+        self._ensure_listener()
+
+        with self._condition:
+            if not last_event_id:
+                return self._seq, [self._marker_entry(None)]
+
+            for seq, event_id, *_ in self._buffer:
+                if event_id == last_event_id:
+                    return seq + 1, [
+                        entry for entry in self._buffer if entry[0] > seq
+                    ]
+
+            position = self._marker_position(last_event_id)
+            if position is None:
+                return self._seq, [self._marker_entry("reset")]
+            return position, [
+                entry for entry in self._buffer if entry[0] >= position
+            ]
+
+    def wait(self, position: int, timeout: float) -> tuple[int, list]:
+        """Entries from ``position`` on, waiting up to ``timeout`` seconds
+        for the first one. A subscriber that fell behind the ring buffer
+        gets a reset."""
+        with self._condition:
+            if position >= self._seq:
+                self._condition.wait(timeout)
+
+            if self._buffer and position < self._buffer[0][0]:
+                return self._seq, [self._marker_entry("reset")]
+
+            return self._seq, [
+                entry for entry in self._buffer if entry[0] >= position
+            ]
+
+    def stream(self, last_event_id: str | None, heartbeat: float, retry_ms: int):
+        """Subscribes now and returns an endless iterator of the
+        subscriber's ``text/event-stream`` chunks, with a keep-alive comment
+        every ``heartbeat`` seconds without events. A disconnected client
+        reconnects after ``retry_ms``."""
+        position, entries = self.subscribe(last_event_id)
+
+        def chunks(position, entries):
+            yield f"retry: {retry_ms}\n\n"
+
+            while True:
+                if entries:
+                    yield "".join(map(_format, entries))
+                else:
+                    yield ": keep-alive\n\n"
+
+                position, entries = self.wait(position, heartbeat)
+
+        return chunks(position, entries)
+
+    def _append(self, event_id: str, kind: str, data: str):
+        with self._condition:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._evicted_at = self._buffer[0][4]
+            self._buffer.append((self._seq, event_id, kind, data, time.time()))
+            self._seq += 1
+            self._condition.notify_all()
+
+    def _local_id(self) -> str:
+        return f"{self._token}-{next(self._ids)}"
+
+    def _marker_entry(self, kind: str | None) -> tuple:
+        """A ``reset`` event, or with no ``kind`` a bare id, carrying a time
+        marker of now: a client that has it is up to date as of now."""
+        now = time.time()
+        return (self._seq - 1, _marker(now), kind, "{}", now)
+
+    def _marker_position(self, event_id: str) -> int | None:
+        """The position to resume a time marker from: the first event
+        received after it (less ``MARKER_MARGIN_SECONDS``), or None if
+        events since then have left the buffer. A worker that connected
+        its listener after the marker has a reset after it to send."""
+        if not event_id.startswith("@") or not event_id[1:].isdigit():
+            return None
+
+        since = int(event_id[1:]) / 1000 - MARKER_MARGIN_SECONDS
+        if since <= self._evicted_at:
+            return None
+
+        for seq, *_, received_at in self._buffer:
+            if received_at >= since:
+                return seq
+        return self._seq
+
+    def _after_commit(self, session):
+        session.info.pop(_TXID, None)
+        session.info.pop(_COUNT, None)
+        deltas = session.info.pop(_PENDING, None)
+        if deltas:
+            for chunk in _chunks(deltas):
+                self._append(
+                    self._local_id(), "status",
+                    json.dumps(chunk, separators=(",", ":")),
+                )
+
+    def _after_rollback(self, session, previous_transaction):
+        if previous_transaction.parent is None:
+            session.info.pop(_TXID, None)
+            session.info.pop(_COUNT, None)
+            session.info.pop(_PENDING, None)
+
+    def _ensure_listener(self):
+        # Started on demand in each worker (never in a preloading master),
+        # and again in a forked child, where the thread did not survive.
+        if self._listener_pid == os.getpid():
+            return
+
+        with self._condition:
+            if self._listener_pid == os.getpid():
+                return
+            self._listener_pid = os.getpid()
+
+        app = current_app._get_current_object()
+        if db.engine.dialect.name != "postgresql":
+            return
+
+        threading.Thread(
+            target=self._listen, args=(app,), name="campaign-events",
+            daemon=True,
+        ).start()
+
+    def _listen(self, app):
+        with app.app_context():
+            engine = self._engine(app)
+
+        delay = 1
+        while True:
+            try:
+                connection = self._connect(engine)
+            except Exception:
+                app.logger.exception("Campaign events listener could not connect")
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+                continue
+
+            delay = 1
+            # Anything committed while we were not listening was missed,
+            # before the first connection too by clients holding a marker.
+            self._append(_marker(time.time()), "reset", "{}")
+
+            try:
+                self._receive(connection)
+            except Exception:
+                app.logger.exception("Campaign events listener disconnected")
+            finally:
+                try:
+                    connection.close()
+                except Exception:
+                    pass
+
+    def _engine(self, app):
+        """The engine the listener connects through, built once per process.
+        ``EVENTS_DATABASE_URL`` bypasses a transaction-pooling PgBouncer,
+        which can't hold a LISTEN."""
+        url = app.config.get("EVENTS_DATABASE_URL")
+        return create_engine(url, poolclass=NullPool) if url else db.engine
+
+    def _connect(self, engine):
+        """A dedicated autocommit DBAPI connection listening on ``CHANNEL``,
+        outside the engine's pool."""
+        pooled = engine.raw_connection()
+        pooled.detach()
+        connection = pooled.dbapi_connection
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return connection
+
+    def _receive(self, connection):
+        while True:
+            # select() yields to other greenlets in gevent workers.
+            if select.select([connection], [], [], 60) == ([], [], []):
+                # Idle: make sure the connection is still there.
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                continue
+
+            connection.poll()
+            while connection.notifies:
+                notify = connection.notifies.pop(0)
+                message = json.loads(notify.payload)
+                self._append(
+                    message["id"], "status",
+                    json.dumps(message["deltas"], separators=(",", ":")),
+                )
+
+
+campaign_events = CampaignEvents()
+
+
+def _chunks(deltas: list[dict]):
+    """Splits ``deltas`` into lists whose JSON fits in one NOTIFY."""
+    chunk, size = [], 0
+    for delta in deltas:
+        length = len(json.dumps(delta)) + 1
+        if chunk and size + length > MAX_PAYLOAD_BYTES:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(delta)
+        size += length
+    if chunk:
+        yield chunk
+
+
+def _marker(at: float) -> str:
+    return f"@{int(at * 1000)}"
+
+
+def _format(entry: tuple) -> str:
+    _, event_id, kind, data, _ = entry
+    if kind is None:
+        # Sets the client's last event id without dispatching an event.
+        return f"id: {event_id}\n\n"
+    return f"id: {event_id}\nevent: {kind}\ndata: {data}\n\n"
@@ -1,7 +1,9 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
+from app.cache import ResponseCache
 
 db = SQLAlchemy()
 migrate = Migrate()
-cors = CORS()
\ No newline at end of file
+cors = CORS()
+response_cache = ResponseCache()
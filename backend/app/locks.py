@@ -0,0 +1,107 @@
+import hashlib
+from contextlib import contextmanager
+
+from app.extensions import db
+
+
+def advisory_lock_key(name: str) -> int:
+    """Stable signed 64-bit key for ``pg_advisory_lock`` derived from a name."""
+    digest = hashlib.sha1(name.encode()).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+@contextmanager
+def advisory_lock(name: str):
+    """Tries to take a cluster-wide PostgreSQL advisory lock without waiting.
+
+    Yields True when this process holds the lock for the duration of the
+    block and False when another session already has it. The lock lives on
+    a dedicated connection, so it is independent of ``db.session``
+    transactions. On databases without advisory locks (SQLite in local
+    development) it always succeeds.
+    """
+    with db.engine.connect() as conn:
+        if conn.dialect.name != "postgresql":
+            yield True
+            return
+
+        key = advisory_lock_key(name)
+        acquired = conn.execute(
+            db.select(db.func.pg_try_advisory_lock(key))
+        ).scalar()
+        conn.commit()
+
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                conn.execute(db.select(db.func.pg_advisory_unlock(key)))
+                conn.commit()
+
+
+@contextmanager
+def leader_lock(name: str):
+    """Tries to take a cluster-wide advisory lock for a long-running leader.
+
+    Yields None when another session holds it. Otherwise the lock is held
+    until the block exits and the block gets a function that tells whether
+    it still is: if the lock's connection dropped, PostgreSQL released it
+    and another process may lead, so the leader must stop. On databases
+    without advisory locks it always succeeds.
+    """
+    with db.engine.connect() as conn:
+        if conn.dialect.name != "postgresql":
+            yield lambda: True
+            return
+
+        key = advisory_lock_key(name)
+        acquired = conn.execute(
+            db.select(db.func.pg_try_advisory_lock(key))
+        ).scalar()
+        conn.commit()
+
+        if not acquired:
+            yield None
+            return
+
+        def held() -> bool:
+            # A session keeps its advisory locks for as long as it lives.
+            try:
+                conn.execute(db.select(1))
+                conn.commit()
+                return True
+            except Exception:
+                return False
+
+        try:
+            yield held
+        finally:
+            try:
+                conn.execute(db.select(db.func.pg_advisory_unlock(key)))
+                conn.commit()
+            except Exception:
+                # Lost with the connection.
+                pass
+
+
+def try_advisory_xact_lock(name: str) -> bool:
+    """Tries to take a PostgreSQL advisory lock held by ``db.session``'s
+    current transaction and released when it ends. Always succeeds on
+    other databases."""
+    if db.session.get_bind().dialect.name != "postgresql":
+        return True
+
+    return db.session.execute(
+        db.select(db.func.pg_try_advisory_xact_lock(advisory_lock_key(name)))
+    ).scalar()
+
+
+def advisory_xact_lock(name: str):
+    """Waits for a PostgreSQL advisory lock held by ``db.session``'s current
+    transaction and released when it ends. A no-op on other databases."""
+    if db.session.get_bind().dialect.name != "postgresql":
+        return
+
+    db.session.execute(
+        db.select(db.func.pg_advisory_xact_lock(advisory_lock_key(name)))
+    )
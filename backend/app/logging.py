@@ -1,29 +1,176 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from flask import g, has_request_context, request
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_FILE = os.getenv("LOG_FILE", "app.log")
+LOG_SUCCESS_SAMPLE_RATE = float(os.getenv("LOG_SUCCESS_SAMPLE_RATE", "1.0"))
 
-def setup_logging(app):
-    formatter = logging.Formatter(
-        "[%(asctime)s] %(levelname)s in %(module)s: %(message)s"
+# Attributes every LogRecord has; anything else was passed through extra=.
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener = None
+_listener_pid = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc)
+            .isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRS
+        )
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _RequestQueueHandler(QueueHandler):
+    """Hands records to the listener thread with as little work as possible
+    on the request thread: the message is interpolated (so mutable args
+    can't change under it) but JSON encoding and traceback formatting
+    happen in the background."""
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if has_request_context() and "request_id" in g:
+            record.__dict__.setdefault("request_id", g.request_id)
+        return record
+
+
+def start_log_listener():
+    """(Re)starts this process's listener thread. Called again after a fork,
+    since threads don't survive it but the queue and handlers do."""
+    global _listener, _listener_pid
+
+    if _listener is None or _listener_pid == os.getpid():
+        return
+
+    _listener = QueueListener(
+        _listener.queue, *_listener.handlers, respect_handler_level=True
     )
+    _listener.start()
+    _listener_pid = os.getpid()
+
+
+def stop_log_listener():
+    """Stops this process's listener thread, if it started one; a later
+    ``start_log_listener`` in a forked child starts a new one."""
+    global _listener_pid
+
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+        _listener_pid = None
+
+
+def setup_logging(app):
+    global _listener, _listener_pid
+
+    if LOG_FORMAT == "text":
+        formatter = logging.Formatter(
+            "[%(asctime)s] %(levelname)s in %(module)s: %(message)s"
+        )
+    else:
+        formatter = JsonFormatter()
+
+    handlers = []
 
-    app.logger.handlers.clear()
-    
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
+    handlers.append(console_handler)
 
-    file_handler = RotatingFileHandler(
-        "app.log",
-        maxBytes=10 * 1024 * 1024,  # 10 MB
-        backupCount=5,
-    )
-    file_handler.setFormatter(formatter)
+    if LOG_FILE:
+        file_handler = RotatingFileHandler(
+            LOG_FILE,
+            maxBytes=10 * 1024 * 1024,  # 10 MB
+            backupCount=5,
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
 
+    if _listener is not None:
+        _listener.stop()
+
+    # Disk and console I/O happen on the listener thread, never in requests.
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _listener_pid = os.getpid()
+
+    app.logger.handlers.clear()
     app.logger.setLevel(LOG_LEVEL)
-    app.logger.addHandler(console_handler)
-    app.logger.addHandler(file_handler)
+    app.logger.addHandler(_RequestQueueHandler(log_queue))
+    app.logger.propagate = False
 
     logging.getLogger("google.ads.googleads").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
\ No newline at end of file
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+    register_request_logging(app)
+
+
+def register_request_logging(app):
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        g.log_start = time.perf_counter()
+
+    @app.after_request
+    def log_response(response):
+        response.headers["X-Request-ID"] = g.get("request_id", "")
+
+        # Failures are always logged; successes may be sampled.
+        if response.status_code < 400 and (
+            LOG_SUCCESS_SAMPLE_RATE < 1.0
+            and random.random() >= LOG_SUCCESS_SAMPLE_RATE
+        ):
+            return response
+
+        level = logging.WARNING if response.status_code >= 500 else logging.INFO
+        if not app.logger.isEnabledFor(level):
+            return response
+
+        start = g.get("log_start")
+        app.logger.log(
+            level,
+            "%s %s -> %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "remote_addr": request.remote_addr,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2)
+                if start is not None else None,
+                "db_queries": g.get("db_queries"),
+                "db_time_ms": round(g.get("db_time", 0.0) * 1000, 2),
+                "ads_time_ms": round(g.get("ads_time", 0.0) * 1000, 2),
+            },
+        )
+        return response
+
+
+@atexit.register
+def _flush_logs():
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
@@ -0,0 +1,194 @@
+import functools
+import os
+import time
+
+from flask import Response, g, has_request_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route"],
+)
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "HTTP responses by route and status code.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being served, summed over live worker processes.",
+    multiprocess_mode="livesum",
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of individual SQL statements.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed per request.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent in SQL statements per request.",
+    ["route"],
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Connection checkouts that gave up waiting for the pool.",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Pooled connections currently checked out, summed over live workers.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_SATURATION = Gauge(
+    "db_pool_saturation_ratio",
+    "Checked-out connections over pool capacity, worst live worker.",
+    multiprocess_mode="livemax",
+)
+
+ADS_CALL_LATENCY = Histogram(
+    "google_ads_call_duration_seconds",
+    "Google Ads API call latency by service method and outcome.",
+    ["method", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32, 64),
+)
+ADS_CALL_RETRIES = Counter(
+    "google_ads_call_retries_total",
+    "Google Ads API calls retried after a transient failure.",
+    ["method", "reason"],
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open), worst live worker.",
+    ["name"],
+    multiprocess_mode="livemax",
+)
+
+
+def observe_ads_call(method):
+    """Records the latency and outcome of a ``GoogleAdsService`` method and
+    adds its duration to the current request's Ads time."""
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "success"
+        try:
+            return method(*args, **kwargs)
+        except Exception as ex:
+            outcome = _ads_outcome(ex)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            ADS_CALL_LATENCY.labels(method.__name__, outcome).observe(elapsed)
+            if has_request_context():
+                g.ads_time = g.get("ads_time", 0.0) + elapsed
+
+    return wrapper
+
+
+def _ads_outcome(ex: Exception) -> str:
+    cause = ex.__cause__ or ex
+    name = type(cause).__name__
+    if name == "GoogleAdsException":
+        return "api_error"
+    if name == "ServiceUnavailableError":
+        return "circuit_open"
+    if name == "RateLimitedError":
+        return "rate_limited"
+    if name in ("TransportError", "RpcError", "HTTPError") or "Connection" in name:
+        return "network_error"
+    return "error"
+
+
+def _route_label() -> str:
+    return request.url_rule.rule if request.url_rule else "unmatched"
+
+
+def init_metrics(app):
+    @app.before_request
+    def start_request_metrics():
+        g.request_start = time.perf_counter()
+        g.db_queries = 0
+        g.db_time = 0.0
+        g.ads_time = 0.0
+        REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_request_metrics(response):
+        start = g.get("request_start")
+        if start is not None:
+            route = _route_label()
+            REQUEST_LATENCY.labels(request.method, route).observe(
+                time.perf_counter() - start
+            )
+            REQUEST_COUNT.labels(
+                request.method, route, str(response.status_code)
+            ).inc()
+            DB_QUERIES_PER_REQUEST.labels(route).observe(g.db_queries)
+            DB_TIME_PER_REQUEST.labels(route).observe(g.db_time)
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(error=None):
+        if g.pop("request_start", None) is not None:
+            REQUESTS_IN_FLIGHT.dec()
+
+    @app.route("/metrics")
+    def metrics():
+        if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+            # Each gunicorn worker writes its samples to files in this
+            # directory; aggregate them all instead of answering for the one
+            # worker that happened to receive the scrape.
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            data = generate_latest(registry)
+        else:
+            data = generate_latest()
+        return Response(data, mimetype=CONTENT_TYPE_LATEST)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    DB_QUERY_DURATION.observe(elapsed)
+    if has_request_context():
+        g.db_queries = g.get("db_queries", 0) + 1
+        g.db_time = g.get("db_time", 0.0) + elapsed
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
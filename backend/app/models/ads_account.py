@@ -0,0 +1,24 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class AdsAccount(db.Model):
+    """A Google Ads client account campaigns can be published to."""
+
+    __tablename__ = "ads_accounts"
+
+    # Ten digits, without dashes.
+    customer_id = db.Column(db.String(20), primary_key=True)
+    name = db.Column(db.String(255), nullable=True)
+
+    # Manager account the API is called through; GOOGLE_ADS_LOGIN_CUSTOMER_ID
+    # when not set.
+    login_customer_id = db.Column(db.String(20), nullable=True)
+
+    # Status of the account in Google Ads; only ENABLED accounts are used.
+    status = db.Column(db.String(20), nullable=False, default="ENABLED")
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
@@ -0,0 +1,19 @@
+from ..extensions import db
+
+
+class AdsRateBucket(db.Model):
+    """Token bucket shared by every worker process.
+
+    ``tokens`` is the balance at ``refilled_at`` (Unix time); the current
+    balance is computed on read as ``tokens + refill_rate * elapsed``,
+    capped at ``capacity``.
+    """
+
+    __tablename__ = "ads_rate_buckets"
+
+    key = db.Column(db.String(100), primary_key=True)
+
+    capacity = db.Column(db.Float, nullable=False)
+    refill_rate = db.Column(db.Float, nullable=False)
+    tokens = db.Column(db.Float, nullable=False)
+    refilled_at = db.Column(db.Float, nullable=False)
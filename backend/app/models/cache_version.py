@@ -0,0 +1,11 @@
+from ..extensions import db
+
+
+class CacheVersion(db.Model):
+    """Current version of a response cache namespace (see ``app.cache``),
+    shared by every process that reads or writes it."""
+
+    __tablename__ = "cache_versions"
+
+    namespace = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False)
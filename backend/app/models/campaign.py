@@ -19,11 +19,60 @@ class Campaign(db.Model):
 
     status = db.Column(db.String(20), nullable=False, default="DRAFT")
 
+    # Google Ads account the campaign is published to; NULL (campaigns
+    # created before accounts existed) means GOOGLE_ADS_CUSTOMER_ID.
+    customer_id = db.Column(db.String(20), nullable=True)
+
     google_campaign_id = db.Column(db.String(100), nullable=True)
 
+    # Last state read from Google Ads by the status sync.
+    remote_status = db.Column(db.String(20), nullable=True)
+    serving_status = db.Column(db.String(20), nullable=True)
+    google_budget_id = db.Column(db.String(100), nullable=True)
+    synced_at = db.Column(db.DateTime, nullable=True)
+
+    # Set when a publish is started and cleared once its outcome is known;
+    # rows left with it set are checked against Google Ads by the reconciler.
+    publish_started_at = db.Column(db.DateTime, nullable=True)
+
+    # Failed attempts at the pending scheduled launch or end, and when it
+    # is next due: the end of the claim lease while LAUNCHING/ENDING, the
+    # end of the backoff after a failed attempt (ScheduleService.apply).
+    schedule_attempts = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    schedule_retry_at = db.Column(db.DateTime, nullable=True)
+
     ad_group_name = db.Column(db.String(255), nullable=False)
     ad_headline = db.Column(db.String(255), nullable=False)
     ad_description = db.Column(db.Text, nullable=False)
     asset_url = db.Column(db.Text, nullable=True)
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Bumped from campaign_version_seq by every write (ChangeLogService.record);
+    # 0 only until the writing transaction records it.
+    version = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        db.Index("ix_campaigns_created_at_id", "created_at", "id"),
+        db.Index("ix_campaigns_status_created_at_id", "status", "created_at", "id"),
+        db.Index(
+            "ix_campaigns_objective_created_at_id",
+            "objective", "created_at", "id",
+        ),
+        db.Index(
+            "ix_campaigns_campaign_type_created_at_id",
+            "campaign_type", "created_at", "id",
+        ),
+        db.Index(
+            "ix_campaigns_customer_id_created_at_id",
+            "customer_id", "created_at", "id",
+        ),
+        db.Index("ix_campaigns_publish_started_at", "publish_started_at"),
+        # Upcoming launches and ends (ScheduleService.upcoming).
+        db.Index("ix_campaigns_status_start_date", "status", "start_date"),
+        db.Index("ix_campaigns_status_end_date", "status", "end_date"),
+        db.Index("ix_campaigns_google_campaign_id", "google_campaign_id"),
+        db.Index("ix_campaigns_google_budget_id", "google_budget_id"),
+    )
\ No newline at end of file
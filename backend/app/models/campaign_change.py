@@ -0,0 +1,29 @@
+from datetime import datetime
+from ..extensions import db
+
+# Source of campaign versions (PostgreSQL); see ChangeLogService.record.
+campaign_version_seq = db.Sequence("campaign_version_seq", metadata=db.metadata)
+
+
+class CampaignChange(db.Model):
+    """Append-only change log of campaigns: one row per version written.
+
+    Compaction deletes the rows a newer version of the same campaign
+    superseded, and retention the rows older than
+    ``CHANGE_LOG_RETENTION_DAYS``, so the table stays about as large as the
+    set of recently changed campaigns.
+    """
+
+    __tablename__ = "campaign_changes"
+
+    version = db.Column(db.BigInteger, primary_key=True, autoincrement=False)
+    # txid_current() of the writing transaction (0 off PostgreSQL); entries
+    # are read in (txid, version) order, see ChangeLogService.
+    txid = db.Column(db.BigInteger, nullable=False, default=0, server_default="0")
+    campaign_id = db.Column(db.UUID(as_uuid=True), nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index("ix_campaign_changes_campaign_id_version", "campaign_id", "version"),
+        db.Index("ix_campaign_changes_txid_version", "txid", "version"),
+    )
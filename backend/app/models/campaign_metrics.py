@@ -0,0 +1,53 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class CampaignMetricsDaily(db.Model):
+    """Daily Google Ads performance per campaign.
+
+    On PostgreSQL the table is range-partitioned by month on ``date``
+    (partitions are created by ``MetricsService`` before loading), so
+    range queries and retention only touch the months involved.
+    """
+
+    __tablename__ = "campaign_metrics_daily"
+
+    campaign_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("campaigns.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    date = db.Column(db.Date, primary_key=True)
+
+    impressions = db.Column(db.BigInteger, nullable=False, default=0)
+    clicks = db.Column(db.BigInteger, nullable=False, default=0)
+    cost_micros = db.Column(db.BigInteger, nullable=False, default=0)
+    conversions = db.Column(db.Float, nullable=False, default=0)
+
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+
+
+def _rollup_view(name: str) -> db.Table:
+    # Materialized views (see the migration); kept out of db.metadata so
+    # create_all doesn't turn them into tables.
+    return db.Table(
+        name,
+        db.MetaData(),
+        db.Column("campaign_id", db.UUID(as_uuid=True)),
+        db.Column("period_start", db.Date),
+        db.Column("impressions", db.BigInteger),
+        db.Column("clicks", db.BigInteger),
+        db.Column("cost_micros", db.BigInteger),
+        db.Column("conversions", db.Float),
+    )
+
+
+# Granularity -> pre-aggregated rollup of campaign_metrics_daily.
+METRICS_ROLLUPS = {
+    "week": _rollup_view("campaign_metrics_weekly"),
+    "month": _rollup_view("campaign_metrics_monthly"),
+}
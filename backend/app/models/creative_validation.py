@@ -0,0 +1,21 @@
+from ..extensions import db
+
+
+class CreativeValidation(db.Model):
+    """Outcome of validating one creative (see CreativeValidationService),
+    shared by every campaign with the same ad texts and final URL."""
+
+    __tablename__ = "creative_validations"
+
+    # sha256 of the validated fields and the rules' version.
+    hash = db.Column(db.String(64), primary_key=True)
+
+    # Problems found; empty when the creative can be published.
+    errors = db.Column(db.JSON, nullable=False)
+
+    checked_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_creative_validations_expires_at", "expires_at"),
+    )
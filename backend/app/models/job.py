@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime
+from ..extensions import db
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+
+    id = db.Column(db.UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    kind = db.Column(db.String(50), nullable=False)
+    campaign_id = db.Column(
+        db.UUID(as_uuid=True),
+        db.ForeignKey("campaigns.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+
+    # Google Ads account the job calls; workers run at most
+    # JOB_MAX_RUNNING_PER_CUSTOMER jobs of one account at a time.
+    customer_id = db.Column(db.String(20), nullable=True)
+
+    status = db.Column(db.String(20), nullable=False, default="QUEUED")
+    priority = db.Column(db.Integer, nullable=False, default=0)
+
+    # Client-supplied key; repeating a request with it returns this job.
+    idempotency_key = db.Column(db.String(255), nullable=True)
+
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (
+        db.Index(
+            "ix_jobs_status_priority_run_after",
+            "status",
+            db.desc("priority"),
+            "run_after",
+        ),
+        db.Index("ix_jobs_idempotency_key", "idempotency_key", unique=True),
+        db.Index("ix_jobs_customer_id_status", "customer_id", "status"),
+    )
@@ -0,0 +1,16 @@
+from datetime import datetime
+from ..extensions import db
+
+
+class SyncCursor(db.Model):
+    """Position of an incremental sync, e.g. the last ``change_status``
+    timestamp read for a customer account."""
+
+    __tablename__ = "sync_cursors"
+
+    key = db.Column(db.String(100), primary_key=True)
+    value = db.Column(db.String(100), nullable=False)
+
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
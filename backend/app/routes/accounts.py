@@ -0,0 +1,29 @@
+from flask import Blueprint, jsonify, request
+from app.schemas.account import AccountSchema
+from app.services.account_service import AccountService
+from app.errors.exceptions import ValidationError
+
+accounts_bp = Blueprint("accounts", __name__, url_prefix="/api/accounts")
+
+
+@accounts_bp.route("", methods=["GET"])
+def list_accounts():
+    accounts = AccountService.list_accounts()
+
+    return jsonify({"data": AccountSchema.dump_many(accounts)}), 200
+
+
+@accounts_bp.route("", methods=["POST"])
+def add_account():
+    data = request.get_json()
+
+    if not data or not data.get("customer_id"):
+        raise ValidationError("customer_id is required")
+
+    account = AccountService.add_account(
+        data["customer_id"],
+        name=data.get("name"),
+        login_customer_id=data.get("login_customer_id"),
+    )
+
+    return jsonify(AccountSchema.dump(account)), 201
@@ -1,9 +1,34 @@
-from flask import Blueprint, request, jsonify
-from app.services.campaign_service import CampaignService
-from app.errors.exceptions import ValidationError
+import csv
+import io
+import json
+import uuid
+import zlib
+from datetime import date, datetime, timedelta
+from flask import (
+    Blueprint,
+    Response,
+    current_app,
+    jsonify,
+    request,
+    stream_with_context,
+)
+from app.config import Config
+from app.cooperative import gevent_active
+from app.events import campaign_events
+from app.extensions import response_cache
+from app.schemas.campaign import CampaignSchema
+from app.schemas.metrics import CampaignMetricsSchema
+from app.services.campaign_service import CAMPAIGNS_CACHE, CampaignService
+from app.services.change_log_service import ChangeLogService
+from app.services.metrics_service import METRICS_CACHE, MetricsService
+from app.errors.exceptions import UnsupportedError, ValidationError
 
 campaigns_bp = Blueprint("campaigns", __name__, url_prefix="/api/campaigns")
 
+# Collection-level custom methods (``/api/campaigns:bulk``) can't live under
+# the ``/api/campaigns`` prefix, which always joins rules with a slash.
+campaign_collection_bp = Blueprint("campaign_collection", __name__, url_prefix="/api")
+
 
 @campaigns_bp.route("", methods=["POST"])
 def create_campaign():
@@ -14,47 +39,357 @@ def create_campaign():
 
     campaign = CampaignService.create_campaign(data)
 
+    return jsonify(CampaignSchema.dump(campaign, ("id", "status"))), 201
+
+
+@campaign_collection_bp.route("/campaigns:bulk", methods=["POST"])
+def create_campaigns_bulk():
+    rows = _bulk_rows()
+
+    if not rows:
+        raise ValidationError("No rows to create")
+
+    results = CampaignService.create_campaigns_bulk(rows)
+    created = sum(1 for r in results if r["id"])
+
     return jsonify({
-        "id": str(campaign.id),
-        "status": campaign.status
-    }), 201
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }), 201 if created else 422
 
 
 @campaigns_bp.route("", methods=["GET"])
 def list_campaigns():
-    campaigns = CampaignService.list_campaigns()
-
-    return jsonify([
-        {
-            "id": str(c.id),
-            "name": c.name,
-            "objective": c.objective,
-            "campaign_type": c.campaign_type,
-            "daily_budget": c.daily_budget,
-            "status": c.status,
-            "google_campaign_id": c.google_campaign_id,
-            "created_at": c.created_at.isoformat()
+    fields = request.args.get("fields")
+    fields = tuple(f.strip() for f in fields.split(",") if f.strip()) \
+        if fields else CampaignSchema.list_fields
+
+    limit = request.args.get("limit")
+    if limit is not None:
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValidationError("limit must be a positive integer")
+        limit = int(limit)
+
+    def build():
+        campaigns, next_cursor = CampaignService.list_campaigns(
+            filters=_list_filters(),
+            cursor=request.args.get("cursor"),
+            limit=limit,
+            fields=fields,
+        )
+        return {
+            "data": CampaignSchema.dump_many(campaigns, fields),
+            "next_cursor": next_cursor
         }
-        for c in campaigns
-    ]), 200
+
+    return response_cache.cached_json(CAMPAIGNS_CACHE, build)
+
+
+@campaigns_bp.route("/changes", methods=["GET"])
+def campaign_changes():
+    since = request.args.get("since")
+
+    limit = request.args.get("limit")
+    if limit is not None:
+        if not limit.isdigit() or int(limit) < 1:
+            raise ValidationError("limit must be a positive integer")
+        limit = int(limit)
+
+    fields = request.args.get("fields")
+    fields = tuple(f.strip() for f in fields.split(",") if f.strip()) \
+        if fields else None
+
+    return jsonify(ChangeLogService.changes(since, limit, fields))
+
+
+@campaigns_bp.route("/export", methods=["GET"])
+def export_campaigns():
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in ("ndjson", "csv"):
+        raise ValidationError("format must be ndjson or csv")
+
+    fields = request.args.get("fields")
+    fields = tuple(f.strip() for f in fields.split(",") if f.strip()) \
+        if fields else CampaignSchema.fields
+
+    rows = CampaignService.stream_campaigns(filters=_list_filters(), fields=fields)
+
+    if export_format == "csv":
+        body = _csv_chunks(fields, rows)
+        mimetype = "text/csv"
+    else:
+        body = _ndjson_chunks(fields, rows)
+        mimetype = "application/x-ndjson"
+
+    headers = {
+        "Content-Disposition": f"attachment; filename=campaigns.{export_format}",
+        "Vary": "Accept-Encoding",
+    }
+
+    # Parsed with q-values, so "gzip;q=0" refuses gzip.
+    if request.accept_encodings["gzip"]:
+        body = _gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(stream_with_context(body), mimetype=mimetype, headers=headers)
+
+
+@campaigns_bp.route("/events", methods=["GET"])
+def campaign_events_stream():
+    """Server-Sent Events of campaign status changes.
+
+    Streams stay open, sending keep-alive comments between events, so they
+    need gevent workers, where an idle client holds a greenlet rather than
+    a worker process. Sync workers refuse the stream (the threaded
+    development server, in debug mode, serves it too).
+    """
+    if not (gevent_active() or current_app.debug):
+        raise UnsupportedError(
+            "Campaign events need GUNICORN_WORKER_CLASS=gevent"
+        )
+
+    # EventSource only sends the header when it reconnects.
+    last_event_id = (
+        request.headers.get("Last-Event-ID")
+        or request.args.get("last_event_id")
+    )
+
+    # No stream_with_context: the stream must not keep the app context (and
+    # a database session) alive while the client is connected.
+    body = campaign_events.stream(
+        last_event_id,
+        heartbeat=Config.EVENTS_HEARTBEAT_SECONDS,
+        retry_ms=Config.EVENTS_RETRY_MS,
+    )
+
+    return Response(
+        body,
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@campaigns_bp.route("/publish:batch", methods=["POST"])
+def publish_campaigns_batch():
+    campaign_ids, filters = _batch_selection()
+
+    job = CampaignService.enqueue_publish_batch(
+        campaign_ids=campaign_ids, filters=filters
+    )
+
+    return jsonify({
+        "status": job.status,
+        "job_id": job.id
+    }), 202, {"Location": f"/api/jobs/{job.id}"}
+
+
+@campaigns_bp.route("/validate:batch", methods=["POST"])
+def validate_campaigns_batch():
+    campaign_ids, filters = _batch_selection()
+
+    results = CampaignService.validate_campaigns(
+        campaign_ids=campaign_ids, filters=filters
+    )
+
+    return jsonify({
+        "valid": sum(1 for r in results if r["valid"]),
+        "invalid": sum(1 for r in results if not r["valid"]),
+        "results": results,
+    }), 200
 
 
 @campaigns_bp.route("/<uuid:campaign_id>/publish", methods=["POST"])
 def publish_campaign(campaign_id):
-    campaign = CampaignService.publish_campaign(campaign_id)
+    job = CampaignService.enqueue_publish(
+        campaign_id, request.headers.get("Idempotency-Key")
+    )
 
     return jsonify({
-        "id": str(campaign.id),
-        "status": campaign.status,
-        "google_campaign_id": campaign.google_campaign_id
-    }), 200
+        "id": campaign_id,
+        "status": "PUBLISHING",
+        "job_id": job.id
+    }), 202, {"Location": f"/api/jobs/{job.id}"}
 
 
 @campaigns_bp.route("/<uuid:campaign_id>/pause", methods=["POST"])
 def pause_campaign(campaign_id):
-    campaign = CampaignService.pause_campaign(campaign_id)
+    job = CampaignService.enqueue_pause(campaign_id)
 
     return jsonify({
-        "id": str(campaign.id),
-        "status": campaign.status
-    }), 200
\ No newline at end of file
+        "id": campaign_id,
+        "status": "PAUSING",
+        "job_id": job.id
+    }), 202, {"Location": f"/api/jobs/{job.id}"}
+
+
+@campaigns_bp.route("/<uuid:campaign_id>/metrics", methods=["GET"])
+def campaign_metrics(campaign_id):
+    end = _query_date("to") or date.today()
+    start = _query_date("from") or end - timedelta(days=29)
+    granularity = request.args.get("granularity", "day")
+
+    if start > end:
+        raise ValidationError("from must not be after to")
+    if (end - start).days >= Config.METRICS_MAX_RANGE_DAYS:
+        raise ValidationError(
+            f"Date range must be at most {Config.METRICS_MAX_RANGE_DAYS} days"
+        )
+
+    def build():
+        rows = MetricsService.campaign_metrics(
+            campaign_id, start, end, granularity
+        )
+        data = CampaignMetricsSchema.dump_many(rows)
+        return {
+            "campaign_id": campaign_id,
+            "granularity": granularity,
+            "from": start,
+            "to": end,
+            "totals": {
+                name: sum(row[name] for row in data)
+                for name in CampaignMetricsSchema.fields[1:]
+            },
+            "data": data,
+        }
+
+    return response_cache.cached_json(METRICS_CACHE, build)
+
+
+def _query_date(name: str) -> date | None:
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError(f"{name} must be a date (YYYY-MM-DD)")
+
+
+def _list_filters() -> dict:
+    return {
+        key: request.args[key]
+        for key in (
+            "status",
+            "customer_id",
+            "objective",
+            "campaign_type",
+            "created_from",
+            "created_to",
+        )
+        if request.args.get(key)
+    }
+
+
+def _csv_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_chunks(fields, rows):
+    lines = []
+    for row in rows:
+        lines.append(current_app.json.dumps(dict(zip(fields, row))))
+        if len(lines) == Config.EXPORT_BATCH_SIZE:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _csv_chunks(fields, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    count = 0
+    for row in rows:
+        writer.writerow(map(_csv_value, row))
+        count += 1
+        if count == Config.EXPORT_BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    yield buffer.getvalue()
+
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _bulk_rows() -> list:
+    """Parses a bulk upload: a JSON array, NDJSON or CSV, sent as the
+    request body or as a multipart ``file``."""
+    upload = request.files.get("file")
+
+    if upload:
+        filename = (upload.filename or "").lower()
+        text = upload.read().decode("utf-8-sig")
+        if filename.endswith(".csv"):
+            kind = "csv"
+        elif filename.endswith((".ndjson", ".jsonl")):
+            kind = "ndjson"
+        else:
+            kind = "json"
+    else:
+        text = request.get_data(as_text=True)
+        kind = {
+            "text/csv": "csv",
+            "application/x-ndjson": "ndjson",
+            "application/jsonl": "ndjson",
+        }.get(request.mimetype, "json")
+
+    if kind == "csv":
+        return list(csv.DictReader(io.StringIO(text)))
+
+    if kind == "ndjson":
+        rows = []
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                rows.append(ValidationError(f"Invalid JSON on line {number}"))
+        return rows
+
+    try:
+        rows = json.loads(text)
+    except ValueError:
+        raise ValidationError("Invalid JSON body")
+
+    if not isinstance(rows, list):
+        raise ValidationError("Expected a JSON array of campaigns")
+
+    return rows
+
+
+def _batch_selection() -> tuple[list | None, dict | None]:
+    """``campaign_ids`` (as UUIDs) and ``filter`` of a batch request body."""
+    data = request.get_json(silent=True)
+
+    if not isinstance(data, dict):
+        raise ValidationError("Invalid JSON body")
+
+    campaign_ids = data.get("campaign_ids")
+    filters = data.get("filter")
+
+    if campaign_ids is None and filters is None:
+        raise ValidationError("Provide campaign_ids or filter")
+
+    if campaign_ids is not None:
+        try:
+            campaign_ids = [uuid.UUID(str(value)) for value in campaign_ids]
+        except (TypeError, ValueError):
+            raise ValidationError("campaign_ids must be a list of UUIDs")
+
+    if filters is not None and not isinstance(filters, dict):
+        raise ValidationError("filter must be an object")
+
+    return campaign_ids, filters
@@ -0,0 +1,12 @@
+from flask import Blueprint, jsonify
+from app.schemas.job import JobSchema
+from app.services.job_service import JobService
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/api/jobs")
+
+
+@jobs_bp.route("/<uuid:job_id>", methods=["GET"])
+def get_job(job_id):
+    job = JobService.get_job(job_id)
+
+    return jsonify(JobSchema.dump(job)), 200
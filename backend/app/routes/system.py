@@ -0,0 +1,26 @@
+from flask import Blueprint, jsonify
+from app.db_pool import pool_status
+from app.extensions import db
+from app.services.google_ads import ads_circuit_breaker
+from app.services.google_ads_client import client_registry
+from app.services.quota_service import QuotaService
+
+system_bp = Blueprint("system", __name__, url_prefix="/api/system")
+
+
+@system_bp.route("/ads-client", methods=["GET"])
+def ads_client_stats():
+    return jsonify({
+        **client_registry.stats(),
+        "circuit_breaker": ads_circuit_breaker.stats(),
+    }), 200
+
+
+@system_bp.route("/db-pool", methods=["GET"])
+def db_pool_stats():
+    return jsonify(pool_status(db.engine)), 200
+
+
+@system_bp.route("/ads-quota", methods=["GET"])
+def ads_quota():
+    return jsonify({"buckets": QuotaService.status()}), 200
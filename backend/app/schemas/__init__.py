@@ -0,0 +1,29 @@
+from operator import attrgetter
+
+
+class Schema:
+    """Declares which attributes of a resource are serialized.
+
+    ``dump`` returns plain values (UUIDs, dates...) and leaves encoding to
+    the app's JSON provider.
+    """
+
+    fields: tuple[str, ...] = ()
+
+    @classmethod
+    def dump(cls, obj, fields=None) -> dict:
+        fields = tuple(fields or cls.fields)
+        return dict(zip(fields, _getter(fields)(obj)))
+
+    @classmethod
+    def dump_many(cls, objs, fields=None) -> list[dict]:
+        fields = tuple(fields or cls.fields)
+        getter = _getter(fields)
+        return [dict(zip(fields, getter(obj))) for obj in objs]
+
+
+def _getter(fields):
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda obj: (getter(obj),)
+    return getter
@@ -0,0 +1,12 @@
+from app.schemas import Schema
+
+
+class AccountSchema(Schema):
+    fields = (
+        "customer_id",
+        "name",
+        "login_customer_id",
+        "status",
+        "created_at",
+        "updated_at",
+    )
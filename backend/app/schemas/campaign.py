@@ -0,0 +1,40 @@
+from app.schemas import Schema
+
+
+class CampaignSchema(Schema):
+    fields = (
+        "id",
+        "name",
+        "objective",
+        "campaign_type",
+        "daily_budget",
+        "customer_id",
+        "start_date",
+        "end_date",
+        "status",
+        "google_campaign_id",
+        "remote_status",
+        "serving_status",
+        "synced_at",
+        "ad_group_name",
+        "ad_headline",
+        "ad_description",
+        "asset_url",
+        "created_at",
+        "version",
+    )
+
+    # Served by the listing unless ``fields=`` asks otherwise; leaves out
+    # the large creative TEXT columns.
+    list_fields = (
+        "id",
+        "name",
+        "objective",
+        "campaign_type",
+        "daily_budget",
+        "customer_id",
+        "status",
+        "google_campaign_id",
+        "serving_status",
+        "created_at",
+    )
@@ -0,0 +1,19 @@
+from app.schemas import Schema
+
+
+class JobSchema(Schema):
+    fields = (
+        "id",
+        "kind",
+        "campaign_id",
+        "customer_id",
+        "status",
+        "priority",
+        "attempts",
+        "max_attempts",
+        "error",
+        "result",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
@@ -0,0 +1,11 @@
+from app.schemas import Schema
+
+
+class CampaignMetricsSchema(Schema):
+    fields = (
+        "date",
+        "impressions",
+        "clicks",
+        "cost_micros",
+        "conversions",
+    )
@@ -0,0 +1,180 @@
+import os
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import Config
+from app.errors.exceptions import AppError, ValidationError
+from app.extensions import db
+from app.locks import advisory_lock
+from app.models.ads_account import AdsAccount
+from app.models.sync_cursor import SyncCursor
+from app.services.google_ads import GoogleAdsService
+from app.services.quota_service import INTERACTIVE
+
+
+def normalize_customer_id(value) -> str:
+    """``123-456-7890`` -> ``1234567890``."""
+    customer_id = str(value).strip().replace("-", "")
+    if len(customer_id) != 10 or not customer_id.isdigit():
+        raise ValidationError("customer_id must be a 10 digit Google Ads customer id")
+    return customer_id
+
+
+class AccountService:
+    @staticmethod
+    def list_accounts() -> list[AdsAccount]:
+        return AdsAccount.query.order_by(AdsAccount.customer_id).all()
+
+    @staticmethod
+    def customer_ids() -> list[str]:
+        """Accounts campaigns can be published to and that periodic work
+        covers: every ENABLED account plus GOOGLE_ADS_CUSTOMER_ID."""
+        customer_ids = set(
+            db.session.execute(
+                db.select(AdsAccount.customer_id).where(
+                    AdsAccount.status == "ENABLED"
+                )
+            ).scalars()
+        )
+        if Config.GOOGLE_ADS_CUSTOMER_ID:
+            customer_ids.add(Config.GOOGLE_ADS_CUSTOMER_ID)
+        return sorted(customer_ids)
+
+    @staticmethod
+    def google_ads(
+        customer_id: str | None = None, priority: str = INTERACTIVE
+    ) -> GoogleAdsService:
+        """Google Ads service for ``customer_id`` (GOOGLE_ADS_CUSTOMER_ID
+        when None), called through the account's manager. Services of the
+        same manager share one cached client and its channels."""
+        customer_id = customer_id or Config.GOOGLE_ADS_CUSTOMER_ID
+        account = db.session.get(AdsAccount, customer_id) if customer_id else None
+
+        return GoogleAdsService(
+            customer_id,
+            priority=priority,
+            login_customer_id=account.login_customer_id if account else None,
+        )
+
+    @staticmethod
+    def add_account(
+        customer_id: str,
+        name: str | None = None,
+        login_customer_id: str | None = None,
+    ) -> AdsAccount:
+        """Registers an account, or updates the name and manager of an
+        existing one."""
+        customer_id = normalize_customer_id(customer_id)
+        if login_customer_id:
+            login_customer_id = normalize_customer_id(login_customer_id)
+
+        try:
+            account = db.session.get(AdsAccount, customer_id)
+            if account is None:
+                account = AdsAccount(customer_id=customer_id, status="ENABLED")
+                db.session.add(account)
+            account.name = name or account.name
+            account.login_customer_id = login_customer_id or account.login_customer_id
+            db.session.commit()
+            return account
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def discover() -> dict:
+        """Registers every client account under GOOGLE_ADS_LOGIN_CUSTOMER_ID
+        and refreshes the name and status of known ones, with one GAQL
+        query and one upsert."""
+        accounts = GoogleAdsService(
+            Config.GOOGLE_ADS_LOGIN_CUSTOMER_ID
+        ).client_accounts()
+        if not accounts:
+            return {"found": 0}
+
+        dialect = (
+            postgresql
+            if db.session.get_bind().dialect.name == "postgresql"
+            else sqlite
+        )
+        now = datetime.utcnow()
+        statement = dialect.insert(AdsAccount.__table__).values([
+            {**account, "created_at": now, "updated_at": now}
+            for account in accounts
+        ])
+        statement = statement.on_conflict_do_update(
+            index_elements=["customer_id"],
+            set_={
+                "name": statement.excluded.name,
+                "status": statement.excluded.status,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+
+        try:
+            db.session.execute(statement)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {"found": len(accounts)}
+
+    @staticmethod
+    def for_each_account(task: str, fn, min_interval: float = 0) -> list[dict]:
+        """Runs ``fn(google_ads)`` for every account, each under its own
+        advisory lock ``<task>:<customer_id>``, and returns their summaries.
+
+        Accounts another process is working on, or whose last ``task`` run
+        started less than ``min_interval`` seconds ago, are skipped, so
+        workers running the same periodic task share the accounts out
+        instead of waiting on each other; each process starts at a
+        different account. One failing account is logged and reported in
+        its summary without stopping the rest.
+        """
+        customer_ids = AccountService.customer_ids()
+        db.session.rollback()
+        if not customer_ids:
+            return []
+
+        offset = os.getpid() % len(customer_ids)
+        customer_ids = customer_ids[offset:] + customer_ids[:offset]
+
+        summaries = []
+        for customer_id in customer_ids:
+            with advisory_lock(f"{task}:{customer_id}") as acquired:
+                if not acquired:
+                    continue
+
+                key = f"last_run:{task}:{customer_id}"
+                started = datetime.utcnow()
+                last_run = db.session.execute(
+                    db.select(SyncCursor.value).where(SyncCursor.key == key)
+                ).scalar()
+                db.session.rollback()
+                if (
+                    min_interval
+                    and last_run
+                    and (started - datetime.fromisoformat(last_run)).total_seconds()
+                    < min_interval
+                ):
+                    continue
+
+                try:
+                    summary = fn(AccountService.google_ads(customer_id))
+                    db.session.merge(SyncCursor(key=key, value=started.isoformat()))
+                    db.session.commit()
+                except Exception as ex:
+                    db.session.rollback()
+                    current_app.logger.exception(
+                        "%s failed for customer %s", task, customer_id
+                    )
+                    message = ex.message if isinstance(ex, AppError) else str(ex)
+                    summary = {"customer_id": customer_id, "error": message}
+
+                summaries.append(summary)
+
+        return summaries
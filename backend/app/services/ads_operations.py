@@ -0,0 +1,305 @@
+import threading
+from collections import namedtuple
+
+from app.services.creative_templates import CreativeTemplate, template_for
+
+# A creative template compiled into an AdGroupAd create operation: the
+# prototype operation has the fixed assets set; ``headlines`` and
+# ``descriptions`` are the (position, text) of the ones filled per campaign.
+_CompiledTemplate = namedtuple(
+    "_CompiledTemplate", ("operation", "headlines", "descriptions")
+)
+
+# Builders per API version; types and enums don't depend on anything else.
+_builders = {}
+_builders_lock = threading.Lock()
+
+
+def operation_builder(client) -> "OperationBuilder":
+    """The process' ``OperationBuilder`` for ``client``'s API version."""
+    builder = _builders.get(client.version)
+    if builder is None:
+        with _builders_lock:
+            builder = _builders.get(client.version)
+            if builder is None:
+                builder = _builders[client.version] = OperationBuilder(client)
+    return builder
+
+
+class OperationBuilder:
+    """Builds the messages that create paused search campaigns.
+
+    Message types and enum values are resolved once per process, and every
+    message is copied from a prototype that already has its constant fields
+    (paused statuses, channel and ad group type, delivery method, the
+    template's fixed headlines and descriptions), so only the campaign's own
+    values are written per campaign. Copies and writes happen on the raw
+    protobuf messages, which are wrapped back into proto-plus types for the
+    client. Creative templates are compiled on first use and kept.
+    """
+
+    # Budget, campaign, ad group and ad: see _write_search_campaign.
+    OPERATIONS_PER_CAMPAIGN = 4
+
+    def __init__(self, client):
+        enums = client.enums
+        self._types = {
+            name: type(client.get_type(name))
+            for name in (
+                "MutateOperation",
+                "CampaignBudget",
+                "Campaign",
+                "AdGroup",
+                "AdGroupAd",
+                "CampaignOperation",
+            )
+        }
+
+        budget = client.get_type("CampaignBudget")
+        budget.delivery_method = enums.BudgetDeliveryMethodEnum.STANDARD
+
+        campaign = client.get_type("Campaign")
+        campaign.status = enums.CampaignStatusEnum.PAUSED
+        campaign.advertising_channel_type = (
+            enums.AdvertisingChannelTypeEnum.SEARCH
+        )
+
+        ad_group = client.get_type("AdGroup")
+        ad_group.status = enums.AdGroupStatusEnum.PAUSED
+        ad_group.type_ = enums.AdGroupTypeEnum.SEARCH_STANDARD
+
+        ad_group_ad = client.get_type("AdGroupAd")
+        ad_group_ad.status = enums.AdGroupAdStatusEnum.PAUSED
+
+        pause = client.get_type("CampaignOperation")
+        pause.update.status = enums.CampaignStatusEnum.PAUSED
+        pause.update_mask.paths.append("status")
+
+        enable = client.get_type("CampaignOperation")
+        enable.update.status = enums.CampaignStatusEnum.ENABLED
+        enable.update_mask.paths.append("status")
+
+        self._budget = self._pb("CampaignBudget", budget)
+        self._campaign = self._pb("Campaign", campaign)
+        self._ad_group = self._pb("AdGroup", ad_group)
+        self._ad_group_ad = self._pb("AdGroupAd", ad_group_ad)
+        self._pause = self._pb("CampaignOperation", pause)
+        self._enable = self._pb("CampaignOperation", enable)
+
+        operation_pb = self._types["MutateOperation"].pb()
+        self._budget_op = operation_pb()
+        self._budget_op.campaign_budget_operation.create.CopyFrom(self._budget)
+        self._campaign_op = operation_pb()
+        self._campaign_op.campaign_operation.create.CopyFrom(self._campaign)
+        self._ad_group_op = operation_pb()
+        self._ad_group_op.ad_group_operation.create.CopyFrom(self._ad_group)
+
+        self._templates = {}
+
+    def search_campaign(self, index: int, customer_id: str, **spec) -> list:
+        """The ``MutateOperation``s that create one paused search campaign
+        (see ``_write_search_campaign`` for ``spec``)."""
+        operation_pb = self._types["MutateOperation"].pb()
+        operations = []
+
+        def add():
+            operations.append(operation_pb())
+            return operations[-1]
+
+        self._write_search_campaign(add, index, customer_id, **spec)
+
+        wrap = self._types["MutateOperation"].wrap
+        return [wrap(operation) for operation in operations]
+
+    def search_campaigns_request(self, request, customer_id: str, specs):
+        """Appends the operations of every campaign in ``specs`` to a
+        ``MutateGoogleAdsRequest``, written in place on its protobuf."""
+        add = type(request).pb(request).mutate_operations.add
+        for index, spec in enumerate(specs):
+            self._write_search_campaign(add, index, customer_id, **spec)
+
+    def _write_search_campaign(
+            self,
+            add,
+            index: int,
+            customer_id: str,
+            *,
+            campaign_name: str,
+            daily_budget_micros: int,
+            ad_group_name: str,
+            headline: str,
+            description: str,
+            final_url: str,
+            objective: str | None = None,
+            campaign_type: str | None = None,
+        ):
+        """Writes the four operations of one campaign into the raw
+        ``MutateOperation``s returned by ``add()``.
+
+        ``index`` is the campaign's position in the mutate request and is
+        used to give its budget, campaign and ad group temp IDs that are
+        unique within the request (-1/-2/-3 for index 0, -4/-5/-6 for 1...).
+        The ad's headlines and descriptions come from the creative template
+        of ``objective`` and ``campaign_type``.
+        """
+        customer = f"customers/{customer_id}"
+        temp_id = -3 * index
+
+        budget_temp = f"{customer}/campaignBudgets/{temp_id - 1}"
+        campaign_temp = f"{customer}/campaigns/{temp_id - 2}"
+        ad_group_temp = f"{customer}/adGroups/{temp_id - 3}"
+
+        budget_op = add()
+        budget_op.CopyFrom(self._budget_op)
+        budget = budget_op.campaign_budget_operation.create
+        budget.resource_name = budget_temp
+        budget.name = f"{campaign_name} Budget"
+        budget.amount_micros = daily_budget_micros
+
+        campaign_op = add()
+        campaign_op.CopyFrom(self._campaign_op)
+        campaign = campaign_op.campaign_operation.create
+        campaign.resource_name = campaign_temp
+        campaign.name = campaign_name
+        campaign.campaign_budget = budget_temp
+
+        ad_group_op = add()
+        ad_group_op.CopyFrom(self._ad_group_op)
+        ad_group = ad_group_op.ad_group_operation.create
+        ad_group.resource_name = ad_group_temp
+        ad_group.name = ad_group_name
+        ad_group.campaign = campaign_temp
+
+        compiled = self._compiled(template_for(objective, campaign_type))
+        ad_op = add()
+        ad_op.CopyFrom(compiled.operation)
+        self._fill_ad(
+            ad_op.ad_group_ad_operation.create,
+            compiled,
+            ad_group_temp,
+            headline,
+            description,
+            final_url,
+        )
+
+    def budget(self, name: str, amount_micros: int):
+        budget = _copy(self._budget)
+        budget.name = name
+        budget.amount_micros = amount_micros
+        return self._types["CampaignBudget"].wrap(budget)
+
+    def campaign(self, name: str, budget_resource_name: str):
+        campaign = _copy(self._campaign)
+        campaign.name = name
+        campaign.campaign_budget = budget_resource_name
+        return self._types["Campaign"].wrap(campaign)
+
+    def ad_group(self, name: str, campaign_resource_name: str):
+        ad_group = _copy(self._ad_group)
+        ad_group.name = name
+        ad_group.campaign = campaign_resource_name
+        return self._types["AdGroup"].wrap(ad_group)
+
+    def ad_group_ad(
+        self,
+        ad_group_resource_name: str,
+        headline: str,
+        description: str,
+        final_url: str,
+        objective: str | None = None,
+        campaign_type: str | None = None,
+    ):
+        compiled = self._compiled(template_for(objective, campaign_type))
+        ad_group_ad = _copy(compiled.operation.ad_group_ad_operation.create)
+        self._fill_ad(
+            ad_group_ad,
+            compiled,
+            ad_group_resource_name,
+            headline,
+            description,
+            final_url,
+        )
+        return self._types["AdGroupAd"].wrap(ad_group_ad)
+
+    def pause_campaign(self, campaign_resource_name: str):
+        """A ``CampaignOperation`` setting the campaign's status to PAUSED."""
+        operation = _copy(self._pause)
+        operation.update.resource_name = campaign_resource_name
+        return self._types["CampaignOperation"].wrap(operation)
+
+    def enable_campaign(self, campaign_resource_name: str):
+        """A ``CampaignOperation`` setting the campaign's status to ENABLED."""
+        operation = _copy(self._enable)
+        operation.update.resource_name = campaign_resource_name
+        return self._types["CampaignOperation"].wrap(operation)
+
+    def remove_request(self, request, resource_names):
+        """Appends an operation removing each of ``resource_names``
+        (campaigns and campaign budgets) to a ``MutateGoogleAdsRequest``."""
+        add = type(request).pb(request).mutate_operations.add
+        for resource_name in resource_names:
+            operation = add()
+            if "/campaignBudgets/" in resource_name:
+                operation.campaign_budget_operation.remove = resource_name
+            else:
+                operation.campaign_operation.remove = resource_name
+
+    def _compiled(self, template: CreativeTemplate) -> _CompiledTemplate:
+        compiled = self._templates.get(template)
+        if compiled is None:
+            compiled = self._templates[template] = self._compile(template)
+        return compiled
+
+    def _compile(self, template: CreativeTemplate) -> _CompiledTemplate:
+        operation = self._types["MutateOperation"].pb()()
+        ad_group_ad = operation.ad_group_ad_operation.create
+        ad_group_ad.CopyFrom(self._ad_group_ad)
+        rsa = ad_group_ad.ad.responsive_search_ad
+
+        slots = {}
+        for field, texts in (
+            ("headlines", template.headlines),
+            ("descriptions", template.descriptions),
+        ):
+            assets = getattr(rsa, field)
+            slots[field] = []
+            for position, text in enumerate(texts):
+                asset = assets.add()
+                if "{" in text:
+                    slots[field].append((position, text))
+                else:
+                    asset.text = text
+
+        return _CompiledTemplate(
+            operation, tuple(slots["headlines"]), tuple(slots["descriptions"])
+        )
+
+    def _fill_ad(
+        self,
+        ad_group_ad,
+        compiled: _CompiledTemplate,
+        ad_group_resource_name: str,
+        headline: str,
+        description: str,
+        final_url: str,
+    ):
+        values = {"headline": headline, "description": description}
+
+        ad_group_ad.ad_group = ad_group_resource_name
+        ad = ad_group_ad.ad
+        ad.final_urls.append(final_url)
+
+        rsa = ad.responsive_search_ad
+        for position, text in compiled.headlines:
+            rsa.headlines[position].text = text.format_map(values)
+        for position, text in compiled.descriptions:
+            rsa.descriptions[position].text = text.format_map(values)
+
+    def _pb(self, name: str, message):
+        return self._types[name].pb(message)
+
+
+def _copy(message):
+    copy = type(message)()
+    copy.CopyFrom(message)
+    return copy
@@ -1,81 +1,372 @@
+import base64
+import csv
+import io
+import json
+import uuid
 from datetime import datetime
-from app.extensions import db
+from decimal import Decimal
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
+from app.config import Config
+from app.cooperative import gevent_active
+from app.events import campaign_events, status_delta
+from app.extensions import db, response_cache
 from app.models.campaign import Campaign
+from app.models.job import Job
+from app.schemas.campaign import CampaignSchema
+from app.services.account_service import AccountService, normalize_customer_id
+from app.services.change_log_service import ChangeLogService
+from app.services.creative_validation_service import CreativeValidationService
 from app.services.google_ads import GoogleAdsService
-from app.errors.exceptions import ValidationError, NotFoundError
+from app.services.quota_service import BULK
+from app.services.job_service import JobService
+from app.errors.exceptions import (
+    ConflictError,
+    ExternalServiceError,
+    NotFoundError,
+    ServiceUnavailableError,
+    ValidationError,
+)
 
 
+# Response cache namespace of campaign reads; bumped after every write.
+CAMPAIGNS_CACHE = "campaigns"
+
+# Columns CreativeValidationService reads.
+VALIDATED_FIELDS = (
+    "id",
+    "objective",
+    "campaign_type",
+    "ad_headline",
+    "ad_description",
+    "asset_url",
+)
+
+# Longest campaign name Google Ads accepts.
+REMOTE_NAME_MAX_LENGTH = 255
+
+
+def remote_campaign_name(name: str, campaign_id) -> str:
+    """Name of the campaign in Google Ads: the local name tagged with the
+    campaign id. It is deterministic, so an interrupted publish can be
+    matched to its remote campaign, and unique, so a repeated create fails
+    with a duplicate name instead of creating a second campaign."""
+    tag = f" [{campaign_id}]"
+    return name[:REMOTE_NAME_MAX_LENGTH - len(tag)] + tag
+
 class CampaignService:
     @staticmethod
     def create_campaign(data: dict) -> Campaign:
-        required_fields = [
-            "name",
-            "objective",
-            "campaign_type",
-            "daily_budget",
-            "start_date",
-            "ad_group_name",
-            "ad_headline",
-            "ad_description",
-        ]
+        values, errors = _campaign_values(data, AccountService.customer_ids())
 
-        for field in required_fields:
-            if field not in data:
-                raise ValidationError(f"Missing field: {field}")
+        if errors:
+            raise ValidationError("; ".join(errors))
 
         try:
-            campaign = Campaign(
-                name=data["name"],
-                objective=data["objective"],
-                campaign_type=data["campaign_type"],
-                daily_budget=data["daily_budget"],
-                start_date=datetime.fromisoformat(data["start_date"]).date(),
-                end_date=datetime.fromisoformat(data["end_date"]).date()
-                if data.get("end_date") else None,
-                ad_group_name=data["ad_group_name"],
-                ad_headline=data["ad_headline"],
-                ad_description=data["ad_description"],
-                asset_url=data.get("asset_url"),
-                status="DRAFT"
-            )
+            campaign = Campaign(**values, status="DRAFT")
             db.session.add(campaign)
+            db.session.flush()
+            ChangeLogService.record([campaign.id])
             db.session.commit()
+            response_cache.bump(CAMPAIGNS_CACHE)
             return campaign
 
         except Exception:
             db.session.rollback()
             raise
-    
+
     @staticmethod
-    def list_campaigns():
-        return Campaign.query.order_by(Campaign.created_at.desc()).all()
+    def create_campaigns_bulk(rows: list) -> list[dict]:
+        """Validates every row, then inserts all valid rows in one
+        transaction.
+
+        A row that failed to parse upstream may be passed as a
+        ``ValidationError``. Returns one result per row, in order, with
+        either the new campaign ``id`` or the row's ``errors``. Large
+        uploads on PostgreSQL are loaded with COPY, except in gevent
+        workers, whose green psycopg2 connections can't COPY; otherwise
+        rows are inserted as batched multi-row INSERTs.
+        """
+        if len(rows) > Config.BULK_CREATE_MAX_ROWS:
+            raise ValidationError(
+                f"At most {Config.BULK_CREATE_MAX_ROWS} rows can be "
+                "created per request"
+            )
+
+        now = datetime.utcnow()
+        customer_ids = AccountService.customer_ids()
+        results = []
+        records = []
+
+        for index, data in enumerate(rows):
+            if isinstance(data, ValidationError):
+                values, errors = None, [data.message]
+            else:
+                values, errors = _campaign_values(data, customer_ids)
+
+            if errors:
+                results.append({"row": index, "id": None, "errors": errors})
+                continue
+
+            values.update(id=uuid.uuid4(), status="DRAFT", created_at=now)
+            records.append(values)
+            results.append({"row": index, "id": str(values["id"]), "errors": []})
+
+        if not records:
+            return results
+
+        try:
+            use_copy = (
+                len(records) >= Config.BULK_COPY_THRESHOLD
+                and db.session.get_bind().dialect.name == "postgresql"
+                and not gevent_active()
+            )
+            if use_copy:
+                _copy_campaigns(records)
+            else:
+                batch_size = Config.BULK_INSERT_BATCH_SIZE
+                for start in range(0, len(records), batch_size):
+                    db.session.execute(
+                        db.insert(Campaign),
+                        records[start:start + batch_size],
+                    )
+            ChangeLogService.record([record["id"] for record in records])
+            db.session.commit()
+            response_cache.bump(CAMPAIGNS_CACHE)
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return results
 
     @staticmethod
-    def publish_campaign(campaign_id):
-        campaign = Campaign.query.get(campaign_id)
+    def list_campaigns(
+        filters: dict | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+        fields=None,
+    ) -> tuple[list[Campaign], str | None]:
+        """Returns one page of campaigns, newest first, and the cursor of the
+        next page (None on the last page).
+
+        Pages are keyset-paginated on (created_at, id) so every page costs
+        the same index range scan however deep it is. Only ``fields`` (plus
+        the cursor columns) are loaded from the database.
+        """
+        fields = tuple(fields or CampaignSchema.list_fields)
+        unknown = set(fields) - set(CampaignSchema.fields)
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        limit = limit or Config.CAMPAIGN_PAGE_SIZE
+        if not 1 <= limit <= Config.CAMPAIGN_MAX_PAGE_SIZE:
+            raise ValidationError(
+                f"limit must be between 1 and {Config.CAMPAIGN_MAX_PAGE_SIZE}"
+            )
+
+        columns = {*fields, "id", "created_at"}
+        query = Campaign.query.options(
+            load_only(*(getattr(Campaign, name) for name in columns), raiseload=True)
+        )
+        query = CampaignService.apply_filters(query, filters or {})
+
+        if cursor:
+            created_at, campaign_id = _decode_cursor(cursor)
+            query = query.filter(
+                db.tuple_(Campaign.created_at, Campaign.id)
+                < db.tuple_(created_at, campaign_id)
+            )
+
+        campaigns = (
+            query
+            .order_by(Campaign.created_at.desc(), Campaign.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(campaigns) > limit:
+            campaigns = campaigns[:limit]
+            next_cursor = _encode_cursor(campaigns[-1])
+
+        return campaigns, next_cursor
+
+    @staticmethod
+    def enqueue_publish(campaign_id, idempotency_key: str | None = None) -> Job:
+        """Moves a DRAFT campaign to PUBLISHING and queues its publish job.
+
+        A request repeated with the same ``idempotency_key`` returns the
+        job created by the first one instead of failing or publishing twice.
+        """
+        if idempotency_key is not None and len(idempotency_key) > 255:
+            raise ValidationError("Idempotency-Key must be at most 255 characters")
+
+        # Only the local checks run here; the final URL is fetched by the
+        # job, so the request never waits on a remote server.
+        draft = db.session.get(Campaign, campaign_id)
+        if draft is not None and draft.status == "DRAFT":
+            errors = CreativeValidationService.validate(
+                [draft], check_urls=False
+            )[draft.id]
+            if errors:
+                raise ValidationError("; ".join(errors))
+
+        campaign = db.session.get(Campaign, campaign_id, with_for_update=True)
 
         if not campaign:
             raise NotFoundError("Campaign not found")
 
+        # Checked under the row lock, so a concurrent duplicate request sees
+        # the job committed by the first one.
+        if idempotency_key:
+            job = JobService.find_by_idempotency_key(idempotency_key)
+            if job:
+                db.session.rollback()
+                if job.kind != "publish_campaign" or job.campaign_id != campaign.id:
+                    raise ConflictError(
+                        "Idempotency-Key was already used for another request"
+                    )
+                return job
+
         if campaign.status != "DRAFT":
+            db.session.rollback()
             raise ValidationError("Only DRAFT campaigns can be published")
 
         try:
-            google_ads = GoogleAdsService()
+            campaign.status = "PUBLISHING"
+            campaign.publish_started_at = datetime.utcnow()
+            job = JobService.enqueue(
+                "publish_campaign",
+                campaign_id=campaign.id,
+                idempotency_key=idempotency_key,
+                customer_id=_customer_id(campaign),
+            )
+            _record_changes([campaign])
+            db.session.commit()
+            response_cache.bump(CAMPAIGNS_CACHE)
+            return job
 
-            google_campaign_resource = google_ads.publish_search_campaign_atomic(
-                campaign_name=campaign.name,
-                daily_budget_micros=campaign.daily_budget * 1_000_000,
-                ad_group_name=campaign.ad_group_name,
-                headline=campaign.ad_headline,
-                description=campaign.ad_description,
-                final_url=campaign.asset_url or "https://example.com",
+        except IntegrityError:
+            db.session.rollback()
+            raise ConflictError(
+                "Idempotency-Key was already used for another request"
             )
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def enqueue_pause(campaign_id) -> Job:
+        campaign = db.session.get(Campaign, campaign_id, with_for_update=True)
+
+        if not campaign:
+            raise NotFoundError("Campaign not found")
+
+        if not campaign.google_campaign_id:
+            db.session.rollback()
+            raise ValidationError("Campaign not published to Google Ads")
+
+        if campaign.status in ("PAUSING", "PAUSED"):
+            db.session.rollback()
+            raise ValidationError("Campaign is already paused")
+
+        if campaign.status == "REMOVED":
+            db.session.rollback()
+            raise ValidationError("Campaign was removed in Google Ads")
+
+        if campaign.status in ("LAUNCHING", "ENDING"):
+            db.session.rollback()
+            raise ConflictError(
+                "Campaign is being switched by the scheduler, retry shortly"
+            )
+
+        try:
+            job = JobService.enqueue(
+                "pause_campaign",
+                campaign_id=campaign.id,
+                payload={"previous_status": campaign.status},
+                priority=JobService.PRIORITY_HIGH,
+                customer_id=_customer_id(campaign),
+            )
+            campaign.status = "PAUSING"
+            _record_changes([campaign])
+            db.session.commit()
+            response_cache.bump(CAMPAIGNS_CACHE)
+            return job
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def stream_campaigns(filters: dict | None = None, fields=None):
+        """Returns an iterator of campaign row tuples of ``fields`` (newest
+        first).
+
+        Columns are selected directly instead of ORM entities and fetched
+        through a server-side cursor, so memory stays flat however many
+        rows are exported and nothing is added to the identity map.
+        """
+        fields = tuple(fields or CampaignSchema.fields)
+        unknown = set(fields) - set(CampaignSchema.fields)
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        statement = db.select(*(getattr(Campaign, name) for name in fields))
+        statement = CampaignService.apply_filters(statement, filters or {})
+        statement = (
+            statement
+            .order_by(Campaign.created_at.desc(), Campaign.id.desc())
+            .execution_options(
+                stream_results=True,
+                yield_per=Config.EXPORT_BATCH_SIZE,
+            )
+        )
+
+        return db.session.execute(statement)
+
+    @staticmethod
+    def publish_campaign(campaign_id, check_remote: bool = False):
+        """Creates the campaign in Google Ads. With ``check_remote`` (a
+        retry) it first looks for a campaign an earlier attempt created
+        but failed to record, and adopts it instead of creating another."""
+        campaign = Campaign.query.get(campaign_id)
+
+        if not campaign:
+            raise NotFoundError("Campaign not found")
+
+        if campaign.status != "PUBLISHING":
+            raise ValidationError("Campaign is not queued for publishing")
+
+        # Reuses a result stored by validate:batch or an earlier attempt.
+        errors = CreativeValidationService.validate([campaign])[campaign.id]
+        if errors:
+            raise ValidationError("; ".join(errors))
+
+        try:
+            google_ads = AccountService.google_ads(campaign.customer_id)
+            spec = CampaignService._publish_spec(campaign)
+
+            google_campaign_resource = None
+            if check_remote:
+                google_campaign_resource = google_ads.find_campaigns_by_name(
+                    [spec["campaign_name"]]
+                ).get(spec["campaign_name"])
+
+            if google_campaign_resource is None:
+                google_campaign_resource = (
+                    google_ads.publish_search_campaign_atomic(**spec)
+                )
 
             campaign.google_campaign_id = google_campaign_resource
             campaign.status = "PUBLISHED"
+            campaign.remote_status = "PAUSED"
+            campaign.publish_started_at = None
+            _record_changes([campaign])
 
             db.session.commit()
+            response_cache.bump(CAMPAIGNS_CACHE)
 
             return campaign
 
@@ -83,6 +374,288 @@ class CampaignService:
             db.session.rollback()
             raise
     
+    @staticmethod
+    def enqueue_publish_batch(campaign_ids=None, filters=None) -> Job:
+        """Queues a ``publish_campaigns_batch`` of the selected campaigns.
+
+        The selection is checked now, so a bad one fails the request
+        rather than the job; which campaigns are published is decided when
+        the job runs.
+        """
+        _select_drafts(campaign_ids, filters)
+
+        try:
+            job = JobService.enqueue(
+                "publish_campaigns_batch",
+                payload={
+                    "campaign_ids": (
+                        None if campaign_ids is None
+                        else [str(campaign_id) for campaign_id in campaign_ids]
+                    ),
+                    "filter": filters,
+                },
+            )
+            db.session.commit()
+            return job
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @staticmethod
+    def publish_campaigns_batch(campaign_ids=None, filters=None) -> list[dict]:
+        """Publishes many DRAFT campaigns with batched mutate requests.
+
+        Campaigns are selected by ``campaign_ids`` or, if not given, by
+        ``filters``, and their creatives validated; invalid ones are
+        reported without being sent. The rest are claimed (moved to
+        PUBLISHING) up front so a concurrent publish cannot pick them up
+        too. Each chunk of campaigns is sent as one partial-failure mutate
+        to the campaigns' Google Ads account and its results are written
+        back in a single transaction. Returns one result per campaign.
+        """
+        drafts = _select_drafts(campaign_ids, filters).all()
+        validated = CreativeValidationService.validate(drafts)
+        invalid = {
+            campaign_id: errors
+            for campaign_id, errors in validated.items()
+            if errors
+        }
+
+        campaigns = (
+            Campaign.query
+            .filter(
+                Campaign.id.in_(
+                    [campaign_id for campaign_id in validated
+                     if campaign_id not in invalid]
+                ),
+                Campaign.status == "DRAFT",
+            )
+            .order_by(Campaign.created_at, Campaign.id)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        # Built before anything is claimed, so a misconfigured account
+        # fails the request without leaving campaigns in PUBLISHING.
+        try:
+            services = {
+                customer_id: AccountService.google_ads(customer_id, BULK)
+                for customer_id in {_customer_id(c) for c in campaigns}
+            }
+        except Exception:
+            db.session.rollback()
+            raise
+
+        claimed = [
+            (
+                campaign.id,
+                _customer_id(campaign),
+                CampaignService._publish_spec(campaign),
+            )
+            for campaign in campaigns
+        ]
+
+        try:
+            started_at = datetime.utcnow()
+            for campaign in campaigns:
+                campaign.status = "PUBLISHING"
+                campaign.publish_started_at = started_at
+            _record_changes(campaigns)
+            db.session.commit()
+            response_cache.bump(CAMPAIGNS_CACHE)
+        except Exception:
+            db.session.rollback()
+            raise
+
+        results = [
+            {
+                "id": str(campaign_id),
+                "status": "DRAFT",
+                "google_campaign_id": None,
+                "errors": errors,
+            }
+            for campaign_id, errors in invalid.items()
+        ]
+
+        if campaign_ids is not None:
+            claimed_ids = {campaign_id for campaign_id, _, _ in claimed}
+            results.extend(
+                {
+                    "id": str(campaign_id),
+                    "status": None,
+                    "google_campaign_id": None,
+                    "errors": ["Campaign not found or not a DRAFT"],
+                }
+                for campaign_id in campaign_ids
+                if campaign_id not in claimed_ids
+                and campaign_id not in invalid
+            )
+
+        chunk_size = max(
+            1,
+            Config.GOOGLE_ADS_MAX_OPERATIONS_PER_REQUEST
+            // GoogleAdsService.OPERATIONS_PER_CAMPAIGN,
+        )
+
+        by_customer = {}
+        for campaign_id, customer_id, spec in claimed:
+            by_customer.setdefault(customer_id, []).append((campaign_id, spec))
+
+        chunks = [
+            (services[customer_id], specs[start:start + chunk_size])
+            for customer_id, specs in by_customer.items()
+            for start in range(0, len(specs), chunk_size)
+        ]
+
+        for google_ads, chunk in chunks:
+            # Whether the outcome of each campaign is known; if the request
+            # failed in flight the reconciler checks the campaigns later.
+            settled = True
+            try:
+                outcomes = google_ads.publish_search_campaigns(
+                    [spec for _, spec in chunk]
+                )
+            except ExternalServiceError as ex:
+                settled = isinstance(ex, ServiceUnavailableError)
+                outcomes = [
+                    {"resource_name": None, "errors": [ex.message]}
+                    for _ in chunk
+                ]
+
+            _remove_incomplete(google_ads, outcomes)
+
+            updates = []
+            for (campaign_id, _), outcome in zip(chunk, outcomes):
+                published = outcome["resource_name"] is not None
+                updates.append({
+                    "id": campaign_id,
+                    "status": "PUBLISHED" if published else "DRAFT",
+                    "google_campaign_id": outcome["resource_name"],
+                    "remote_status": "PAUSED" if published else None,
+                    "publish_started_at": None if settled else started_at,
+                })
+                results.append({
+                    "id": str(campaign_id),
+                    "status": updates[-1]["status"],
+                    "google_campaign_id": outcome["resource_name"],
+                    "errors": outcome["errors"],
+                })
+
+            try:
+                db.session.execute(db.update(Campaign), updates)
+                ChangeLogService.record([u["id"] for u in updates])
+                campaign_events.publish([
+                    status_delta(u["id"], u["status"], u["google_campaign_id"])
+                    for u in updates
+                ])
+                db.session.commit()
+                response_cache.bump(CAMPAIGNS_CACHE)
+            except Exception:
+                db.session.rollback()
+                raise
+
+        return results
+
+    @staticmethod
+    def validate_campaigns(campaign_ids=None, filters=None) -> list[dict]:
+        """Validates the creatives of DRAFT campaigns selected like
+        ``publish_campaigns_batch`` without publishing them. The results are
+        stored, so publishing the valid ones afterwards doesn't redo the
+        checks."""
+        drafts = _select_drafts(campaign_ids, filters).all()
+        errors = CreativeValidationService.validate(drafts)
+
+        results = [
+            {"id": str(campaign_id), "valid": not problems, "errors": problems}
+            for campaign_id, problems in errors.items()
+        ]
+        if campaign_ids is not None:
+            results.extend(
+                {
+                    "id": str(campaign_id),
+                    "valid": False,
+                    "errors": ["Campaign not found or not a DRAFT"],
+                }
+                for campaign_id in campaign_ids
+                if campaign_id not in errors
+            )
+        return results
+
+    @staticmethod
+    def validate_drafts() -> dict:
+        """Validates every DRAFT campaign, ``BATCH_PUBLISH_MAX_CAMPAIGNS`` at
+        a time, then drops expired stored results."""
+        checked = invalid = 0
+        after = None
+
+        while True:
+            statement = (
+                db.select(Campaign)
+                .options(load_only(*(
+                    getattr(Campaign, name) for name in VALIDATED_FIELDS
+                )))
+                .where(Campaign.status == "DRAFT")
+                .order_by(Campaign.id)
+                .limit(Config.BATCH_PUBLISH_MAX_CAMPAIGNS)
+            )
+            if after is not None:
+                statement = statement.where(Campaign.id > after)
+
+            drafts = db.session.execute(statement).scalars().all()
+            if not drafts:
+                break
+
+            after = drafts[-1].id
+            errors = CreativeValidationService.validate(drafts)
+            checked += len(errors)
+            invalid += sum(1 for problems in errors.values() if problems)
+
+        db.session.rollback()
+        return {
+            "checked": checked,
+            "invalid": invalid,
+            "pruned": CreativeValidationService.prune(),
+        }
+
+    @staticmethod
+    def apply_filters(query, filters: dict):
+        if filters.get("status"):
+            query = query.filter(Campaign.status == filters["status"])
+        if filters.get("customer_id"):
+            query = query.filter(
+                Campaign.customer_id
+                == normalize_customer_id(filters["customer_id"])
+            )
+        if filters.get("objective"):
+            query = query.filter(Campaign.objective == filters["objective"])
+        if filters.get("campaign_type"):
+            query = query.filter(
+                Campaign.campaign_type == filters["campaign_type"]
+            )
+        if filters.get("created_from"):
+            query = query.filter(
+                Campaign.created_at >= _parse_datetime(filters["created_from"])
+            )
+        if filters.get("created_to"):
+            query = query.filter(
+                Campaign.created_at < _parse_datetime(filters["created_to"])
+            )
+        return query
+
+    @staticmethod
+    def _publish_spec(campaign: Campaign) -> dict:
+        return {
+            "campaign_name": remote_campaign_name(campaign.name, campaign.id),
+            "daily_budget_micros": campaign.daily_budget * 1_000_000,
+            "ad_group_name": campaign.ad_group_name,
+            "headline": campaign.ad_headline,
+            "description": campaign.ad_description,
+            "final_url": campaign.asset_url,
+            "objective": campaign.objective,
+            "campaign_type": campaign.campaign_type,
+        }
+
     @staticmethod
     def pause_campaign(campaign_id):
         campaign = Campaign.query.get(campaign_id)
@@ -94,14 +667,236 @@ class CampaignService:
             raise ValidationError("Campaign not published to Google Ads")
 
         try:
-            google_ads = GoogleAdsService()
+            google_ads = AccountService.google_ads(campaign.customer_id)
             google_ads.pause_campaign(campaign.google_campaign_id)
 
             campaign.status = "PAUSED"
+            campaign.remote_status = "PAUSED"
+            _record_changes([campaign])
             db.session.commit()
+            response_cache.bump(CAMPAIGNS_CACHE)
 
             return campaign
 
         except Exception:
             db.session.rollback()
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def restore_status(campaign_id, status: str):
+        """Rolls a campaign back out of an intermediate state once its job
+        has failed for good."""
+        campaign = Campaign.query.get(campaign_id)
+
+        if not campaign:
+            return
+
+        campaign.status = status
+        _record_changes([campaign])
+        db.session.commit()
+        response_cache.bump(CAMPAIGNS_CACHE)
+
+
+def _record_changes(campaigns: list[Campaign]):
+    """Versions the written campaigns and queues their status deltas, in
+    the current transaction."""
+    ChangeLogService.record([c.id for c in campaigns])
+    campaign_events.publish([
+        status_delta(c.id, c.status, c.google_campaign_id) for c in campaigns
+    ])
+
+
+def _remove_incomplete(google_ads, outcomes: list[dict]):
+    """Removes what a partial-failure publish created of each campaign
+    with errors (a campaign without its ad group or ad, or a lone budget),
+    so Google Ads holds no half-built campaign and the draft can be
+    published again once fixed. The campaign's ``resource_name`` is
+    cleared; a failed removal is added to its errors."""
+    incomplete = [
+        outcome for outcome in outcomes
+        if outcome["errors"]
+        and (outcome["resource_name"] or outcome.get("budget_resource_name"))
+    ]
+    if not incomplete:
+        return
+
+    try:
+        removal_errors = google_ads.remove_campaigns([
+            (outcome["resource_name"], outcome["budget_resource_name"])
+            for outcome in incomplete
+        ])
+    except ExternalServiceError as ex:
+        removal_errors = [[ex.message] for _ in incomplete]
+
+    for outcome, errors in zip(incomplete, removal_errors):
+        if errors:
+            leftover = (
+                outcome["resource_name"] or outcome["budget_resource_name"]
+            )
+            outcome["errors"].append(
+                f"Partly created {leftover} could not be removed; remove it "
+                "in Google Ads before publishing again: " + " | ".join(errors)
+            )
+        outcome["resource_name"] = None
+
+
+def _select_drafts(campaign_ids, filters):
+    """Query of the DRAFT campaigns a batch request selects, oldest first:
+    ``campaign_ids`` or, if not given, those matching ``filters``."""
+    if (
+        campaign_ids is not None
+        and len(campaign_ids) > Config.BATCH_PUBLISH_MAX_CAMPAIGNS
+    ):
+        raise ValidationError(
+            f"At most {Config.BATCH_PUBLISH_MAX_CAMPAIGNS} campaigns "
+            "can be selected per request"
+        )
+
+    query = Campaign.query.filter(Campaign.status == "DRAFT")
+    if campaign_ids is not None:
+        query = query.filter(Campaign.id.in_(campaign_ids))
+    else:
+        query = CampaignService.apply_filters(query, filters or {})
+
+    return (
+        query
+        .order_by(Campaign.created_at, Campaign.id)
+        .limit(Config.BATCH_PUBLISH_MAX_CAMPAIGNS)
+    )
+
+
+def _customer_id(campaign: Campaign) -> str | None:
+    return campaign.customer_id or Config.GOOGLE_ADS_CUSTOMER_ID
+
+
+def _parse_datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Invalid date: {value}")
+
+
+def _encode_cursor(campaign: Campaign) -> str:
+    raw = json.dumps([campaign.created_at.isoformat(), str(campaign.id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, campaign_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(campaign_id)
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid cursor")
+
+
+REQUIRED_FIELDS = (
+    "name",
+    "objective",
+    "campaign_type",
+    "daily_budget",
+    "start_date",
+    "ad_group_name",
+    "ad_headline",
+    "ad_description",
+)
+
+
+def _campaign_values(data, customer_ids) -> tuple[dict | None, list[str]]:
+    """Validates one campaign payload against the accounts campaigns can be
+    published to. Returns the column values and every problem found (not
+    just the first one)."""
+    if not isinstance(data, dict):
+        return None, ["Row must be a JSON object"]
+
+    errors = [
+        f"Missing field: {field}"
+        for field in REQUIRED_FIELDS
+        if data.get(field) in (None, "")
+    ]
+    if errors:
+        return None, errors
+
+    values = {
+        field: data[field]
+        for field in (
+            "name",
+            "objective",
+            "campaign_type",
+            "ad_group_name",
+            "ad_headline",
+            "ad_description",
+        )
+    }
+    values["asset_url"] = data.get("asset_url") or None
+
+    values["customer_id"] = Config.GOOGLE_ADS_CUSTOMER_ID
+    if data.get("customer_id") not in (None, ""):
+        try:
+            values["customer_id"] = normalize_customer_id(data["customer_id"])
+        except ValidationError as ex:
+            errors.append(ex.message)
+        else:
+            if values["customer_id"] not in customer_ids:
+                errors.append(
+                    "customer_id is not a registered Google Ads account"
+                )
+
+    for field, value in values.items():
+        if value is not None and not isinstance(value, str):
+            errors.append(f"{field} must be a string")
+            continue
+        max_length = getattr(Campaign.__table__.c[field].type, "length", None)
+        if value and max_length and len(value) > max_length:
+            errors.append(f"{field} must be at most {max_length} characters")
+
+    # Parsed as a Decimal so 12.9 (or "12.9" from a CSV) is rejected
+    # rather than truncated; 12.0 and "12" are accepted.
+    try:
+        budget = Decimal(str(data["daily_budget"]).strip())
+        if not budget.is_finite() or budget != budget.to_integral_value():
+            raise ValueError
+        values["daily_budget"] = int(budget)
+        if values["daily_budget"] <= 0:
+            errors.append("daily_budget must be positive")
+    except (ArithmeticError, ValueError):
+        errors.append("daily_budget must be an integer")
+
+    for field in ("start_date", "end_date"):
+        raw = data.get(field)
+        if field == "end_date" and raw in (None, ""):
+            values[field] = None
+            continue
+        try:
+            values[field] = datetime.fromisoformat(raw).date()
+        except (TypeError, ValueError):
+            errors.append(f"{field} must be an ISO date")
+
+    if (
+        not errors
+        and values["end_date"]
+        and values["end_date"] < values["start_date"]
+    ):
+        errors.append("end_date must not be before start_date")
+
+    return (None if errors else values), errors
+
+
+def _copy_campaigns(records: list[dict]):
+    """Loads rows with PostgreSQL COPY on the session's own connection, so
+    they commit or roll back with the rest of the transaction."""
+    columns = list(records[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow(record[column] for column in columns)
+    buffer.seek(0)
+
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY campaigns ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
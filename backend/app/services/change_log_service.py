@@ -0,0 +1,300 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import aliased
+
+from app.config import Config
+from app.errors.exceptions import GoneError, ValidationError
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.models.campaign_change import CampaignChange, campaign_version_seq
+from app.models.sync_cursor import SyncCursor
+from app.schemas.campaign import CampaignSchema
+
+# sync_cursors keys: every position at or below the horizon was dropped by
+# retention; every version at or below the compacted mark was compacted.
+HORIZON_KEY = "campaign_changes:horizon"
+COMPACTED_KEY = "campaign_changes:compacted"
+
+# Campaigns versioned per statement.
+RECORD_BATCH_SIZE = 1000
+
+
+class ChangeLogService:
+    """Campaign versions and the change log read by ``GET
+    /api/campaigns/changes``.
+
+    A log entry's position is ``(txid, version)``: the id of the
+    transaction that wrote it, then its version. Writers take versions
+    without coordinating, so a transaction may commit a smaller version
+    after a larger one became visible. Readers therefore only see entries
+    of transactions older than their snapshot's xmin (the oldest one still
+    in progress), in position order: every entry that commits later has a
+    transaction id at or above that xmin, so it sorts after all of them
+    and a client's ``since`` never skips a change.
+    """
+
+    @staticmethod
+    def record(campaign_ids):
+        """Gives the campaigns a new version and appends it to the change
+        log, in the current transaction. Call after writing the rows and
+        before committing.
+
+        On PostgreSQL the rows are locked in id order first, so concurrent
+        writers of overlapping campaigns wait for each other instead of
+        deadlocking; writers of other campaigns don't wait at all.
+        """
+        campaign_ids = sorted(set(campaign_ids))
+        if not campaign_ids:
+            return
+
+        db.session.flush()
+        now = datetime.utcnow()
+        table = Campaign.__table__
+
+        if db.session.get_bind().dialect.name != "postgresql":
+            # SQLite runs one writer at a time, so versions commit in order
+            # and the transaction id is left at 0.
+            latest = db.session.execute(
+                db.select(db.func.coalesce(db.func.max(table.c.version), 0))
+            ).scalar()
+            versions = [
+                {"b_id": campaign_id, "b_version": latest + number}
+                for number, campaign_id in enumerate(campaign_ids, start=1)
+            ]
+            db.session.execute(
+                db.update(table)
+                .where(table.c.id == db.bindparam("b_id"))
+                .values(version=db.bindparam("b_version")),
+                versions,
+            )
+            db.session.execute(
+                db.insert(CampaignChange.__table__),
+                [
+                    {
+                        "txid": 0,
+                        "version": row["b_version"],
+                        "campaign_id": row["b_id"],
+                        "changed_at": now,
+                    }
+                    for row in versions
+                ],
+            )
+            return
+
+        chunks = [
+            campaign_ids[start:start + RECORD_BATCH_SIZE]
+            for start in range(0, len(campaign_ids), RECORD_BATCH_SIZE)
+        ]
+
+        for chunk in chunks:
+            db.session.execute(
+                db.select(table.c.id)
+                .where(table.c.id.in_(chunk))
+                .order_by(table.c.id)
+                .with_for_update()
+            )
+
+        for chunk in chunks:
+            changed = (
+                db.update(table)
+                .where(table.c.id.in_(chunk))
+                .values(version=campaign_version_seq.next_value())
+                .returning(table.c.id, table.c.version)
+                .cte("changed")
+            )
+            db.session.execute(
+                db.insert(CampaignChange.__table__).from_select(
+                    ["txid", "version", "campaign_id", "changed_at"],
+                    db.select(
+                        db.func.txid_current(),
+                        changed.c.version,
+                        changed.c.id,
+                        db.literal(now),
+                    ),
+                )
+            )
+
+    @staticmethod
+    def changes(
+        since: str | None, limit: int | None = None, fields=None
+    ) -> dict:
+        """Campaigns changed after the position ``since`` (an opaque
+        ``next_since`` of an earlier call), oldest change first, with their
+        current ``fields`` and ``version``, and the ``since`` of the next
+        call.
+
+        Only each campaign's latest log entry joins its row, so a campaign
+        changed several times is returned once. Without ``since`` no rows
+        are returned, only the position to read from after a full read of
+        the campaigns. A ``since`` older than the retention horizon raises
+        ``GoneError``: changes were dropped and the client must re-read
+        everything.
+        """
+        fields = tuple(fields or CampaignSchema.fields)
+        if "version" not in fields:
+            fields += ("version",)
+        unknown = set(fields) - set(CampaignSchema.fields)
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        limit = limit or Config.CHANGES_PAGE_SIZE
+        if not 1 <= limit <= Config.CHANGES_MAX_PAGE_SIZE:
+            raise ValidationError(
+                f"limit must be between 1 and {Config.CHANGES_MAX_PAGE_SIZE}"
+            )
+
+        horizon = _position(_cursor_value(HORIZON_KEY))
+        xmin = _snapshot_xmin()
+
+        if since is None:
+            if xmin is not None:
+                # Everything older is in a full read started after this.
+                current = (xmin, 0)
+            else:
+                latest = db.session.execute(
+                    db.select(db.func.max(CampaignChange.version))
+                ).scalar()
+                current = (0, latest or 0)
+            return {
+                "data": [],
+                "next_since": _encode_position(max(current, horizon)),
+                "has_more": False,
+            }
+
+        since = _position(since)
+        if since < horizon:
+            raise GoneError(
+                "Changes up to "
+                f"{_encode_position(horizon)} were dropped by retention; "
+                "re-read the campaigns and continue from the returned since"
+            )
+
+        position = db.tuple_(CampaignChange.txid, CampaignChange.version)
+        statement = (
+            db.select(
+                CampaignChange.txid,
+                *(getattr(Campaign, name) for name in fields),
+            )
+            .join(
+                CampaignChange,
+                db.and_(
+                    CampaignChange.campaign_id == Campaign.id,
+                    CampaignChange.version == Campaign.version,
+                ),
+            )
+            .where(position > db.tuple_(*since))
+            .order_by(CampaignChange.txid, CampaignChange.version)
+            .limit(limit + 1)
+        )
+        if xmin is not None:
+            statement = statement.where(CampaignChange.txid < xmin)
+
+        rows = db.session.execute(statement).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        return {
+            "data": CampaignSchema.dump_many(rows, fields),
+            "next_since": _encode_position(
+                (rows[-1].txid, rows[-1].version) if rows else since
+            ),
+            "has_more": has_more,
+        }
+
+    @staticmethod
+    def compact() -> dict:
+        """Deletes log entries superseded by an entry written since the last
+        run, then entries older than ``CHANGE_LOG_RETENTION_DAYS``, and
+        moves the retention horizon past them."""
+        latest = db.session.execute(
+            db.select(db.func.max(CampaignChange.version))
+        ).scalar()
+        if latest is None:
+            db.session.rollback()
+            return {"compacted": 0, "expired": 0}
+
+        # A campaign's versions follow its row lock, so a larger version of
+        # the same campaign is always the newer change.
+        newer = aliased(CampaignChange)
+        compacted = db.session.execute(
+            db.delete(CampaignChange).where(
+                db.select(newer.version)
+                .where(
+                    newer.campaign_id == CampaignChange.campaign_id,
+                    newer.version > CampaignChange.version,
+                    newer.version > int(_cursor_value(COMPACTED_KEY)),
+                    newer.version <= latest,
+                )
+                .exists()
+            )
+        ).rowcount
+        _set_cursor(COMPACTED_KEY, latest)
+
+        cutoff = datetime.utcnow() - timedelta(
+            days=Config.CHANGE_LOG_RETENTION_DAYS
+        )
+        expired_up_to = db.session.execute(
+            db.select(CampaignChange.txid, CampaignChange.version)
+            .where(CampaignChange.changed_at < cutoff)
+            .order_by(CampaignChange.txid.desc(), CampaignChange.version.desc())
+            .limit(1)
+        ).first()
+
+        expired = 0
+        if expired_up_to is not None:
+            expired_up_to = tuple(expired_up_to)
+            expired = db.session.execute(
+                db.delete(CampaignChange).where(
+                    db.tuple_(CampaignChange.txid, CampaignChange.version)
+                    <= db.tuple_(*expired_up_to)
+                )
+            ).rowcount
+            horizon = max(expired_up_to, _position(_cursor_value(HORIZON_KEY)))
+            _set_cursor(HORIZON_KEY, _encode_position(horizon))
+
+        try:
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {"compacted": max(compacted, 0), "expired": max(expired, 0)}
+
+
+def _cursor_value(key: str) -> str:
+    cursor = db.session.get(SyncCursor, key)
+    return cursor.value if cursor else "0"
+
+
+def _set_cursor(key: str, value):
+    cursor = db.session.get(SyncCursor, key)
+    if cursor is None:
+        db.session.add(SyncCursor(key=key, value=str(value)))
+    else:
+        cursor.value = str(value)
+
+
+def _snapshot_xmin() -> int | None:
+    """The oldest transaction id still in progress when this transaction's
+    snapshot was taken; None off PostgreSQL, whose writers commit in
+    order."""
+    if db.session.get_bind().dialect.name != "postgresql":
+        return None
+    return db.session.execute(
+        db.select(db.func.txid_snapshot_xmin(db.func.txid_current_snapshot()))
+    ).scalar()
+
+
+def _encode_position(position: tuple[int, int]) -> str:
+    txid, version = position
+    return f"{txid}.{version}"
+
+
+def _position(value: str) -> tuple[int, int]:
+    """Parses a position, ``<txid>.<version>``; a bare number is a version
+    of transaction 0."""
+    txid, _, version = value.rpartition(".")
+    if not version.isdigit() or not (txid == "" or txid.isdigit()):
+        raise ValidationError("since must be a next_since returned by this endpoint")
+    return int(txid or 0), int(version)
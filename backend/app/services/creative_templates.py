@@ -0,0 +1,52 @@
+from collections import namedtuple
+
+# Headlines and descriptions of a responsive search ad. ``{headline}`` and
+# ``{description}`` stand for the campaign's own ad_headline and
+# ad_description; everything else is fixed filler.
+CreativeTemplate = namedtuple("CreativeTemplate", ("headlines", "descriptions"))
+
+DEFAULT_TEMPLATE = CreativeTemplate(
+    headlines=("{headline}", "{headline} Official", "Get Started Today"),
+    descriptions=("{description}", "Simple. Fast. Reliable."),
+)
+
+# (objective, campaign_type) -> template; None matches any value.
+CREATIVE_TEMPLATES = {
+    (None, None): DEFAULT_TEMPLATE,
+    ("Traffic", None): DEFAULT_TEMPLATE,
+    ("Leads", None): CreativeTemplate(
+        headlines=("{headline}", "{headline} Official", "Request a Free Quote"),
+        descriptions=("{description}", "Talk to an expert today."),
+    ),
+    ("Sales", None): CreativeTemplate(
+        headlines=("{headline}", "{headline} Official", "Shop Now"),
+        descriptions=("{description}", "Fast delivery. Easy returns."),
+    ),
+}
+
+
+def template_for(objective: str | None, campaign_type: str | None) -> CreativeTemplate:
+    """Most specific template for the pair: exact match first, then the
+    objective's, the campaign type's and the default one."""
+    for key in (
+        (objective, campaign_type),
+        (objective, None),
+        (None, campaign_type),
+    ):
+        template = CREATIVE_TEMPLATES.get(key)
+        if template is not None:
+            return template
+    return CREATIVE_TEMPLATES[(None, None)]
+
+
+def render(
+    template: CreativeTemplate, headline: str, description: str
+) -> CreativeTemplate:
+    """The headlines and descriptions sent to Google Ads for a campaign."""
+    values = {"headline": headline, "description": description}
+    return CreativeTemplate(
+        headlines=tuple(text.format_map(values) for text in template.headlines),
+        descriptions=tuple(
+            text.format_map(values) for text in template.descriptions
+        ),
+    )
@@ -0,0 +1,470 @@
+import hashlib
+import ipaddress
+import json
+import os
+import re
+import socket
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from sqlalchemy.dialects import postgresql, sqlite
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+from app.config import Config
+from app.extensions import db
+from app.models.creative_validation import CreativeValidation
+from app.services.creative_templates import render, template_for
+
+# Bumped whenever the checks change, so stored results are redone.
+RULES_VERSION = 1
+
+# Responsive search ad limits; full-width (CJK) characters count double.
+HEADLINE_MAX_LENGTH = 30
+DESCRIPTION_MAX_LENGTH = 90
+FINAL_URL_MAX_LENGTH = 2048
+
+# Characters Google Ads' editorial policy rejects in ad text, anywhere and
+# in headlines only, and the Unicode categories it rejects (control and
+# format characters, private use, and symbols such as emoji and stars).
+DISALLOWED_CHARACTERS = frozenset("^~*|\\<>{}[]")
+HEADLINE_DISALLOWED_CHARACTERS = frozenset("!")
+DISALLOWED_CATEGORIES = frozenset({"Cc", "Cf", "Co", "Cs", "So"})
+REPEATED_PUNCTUATION = re.compile(r"[!?]{2,}")
+
+# Stored results written per statement.
+STORE_BATCH_SIZE = 1000
+
+USER_AGENT = "Pathik-LinkCheck/1.0"
+
+# Redirects followed from a final URL, each checked like the URL itself.
+MAX_REDIRECTS = 10
+
+
+class CreativeValidationService:
+    @staticmethod
+    def validate(campaigns, check_urls: bool = True) -> dict:
+        """Problems with each campaign's creative, by campaign id; an empty
+        list means Google Ads should accept it.
+
+        Checks the headlines and descriptions actually sent (the campaign's
+        texts rendered into its creative template) for length, disallowed
+        characters and duplicates, and the final URL for syntax and, with
+        ``check_urls`` and ``URL_CHECK_ENABLED``, for an answer without an
+        HTTP error (see ``UrlChecker``). Results of full checks are stored
+        by a hash of the checked fields, so campaigns sharing a creative
+        are checked once and an unchanged draft reuses its result until it
+        expires. Without ``check_urls`` nothing is fetched or stored, for
+        request paths that can't wait on remote servers.
+
+        ``campaigns`` are ``Campaign`` objects or rows with the same
+        attributes. Results are written through a connection of their own,
+        so the caller's session and transaction are left as they were.
+        """
+        hashes = {campaign.id: _creative_hash(campaign) for campaign in campaigns}
+        if not hashes:
+            return {}
+
+        now = datetime.utcnow()
+        results = dict(
+            db.session.execute(
+                db.select(CreativeValidation.hash, CreativeValidation.errors)
+                .where(
+                    CreativeValidation.hash.in_(set(hashes.values())),
+                    CreativeValidation.expires_at > now,
+                )
+            ).all()
+        )
+
+        pending = {}
+        for campaign in campaigns:
+            key = hashes[campaign.id]
+            if key not in results and key not in pending:
+                url_error = _url_error(campaign.asset_url)
+                pending[key] = (
+                    _text_errors(campaign) + ([url_error] if url_error else []),
+                    campaign.asset_url
+                    if Config.URL_CHECK_ENABLED and not url_error else None,
+                )
+
+        if not check_urls:
+            results.update((key, errors) for key, (errors, _) in pending.items())
+            pending = {}
+
+        if pending:
+            answers = url_checker.check(
+                url for _, url in pending.values() if url
+            )
+
+            rows = []
+            for key, (errors, url) in pending.items():
+                if answers.get(url):
+                    errors = errors + [answers[url]]
+                results[key] = errors
+                max_age = (
+                    Config.URL_CHECK_CACHE_TTL if answers.get(url)
+                    else Config.CREATIVE_VALIDATION_MAX_AGE
+                )
+                rows.append({
+                    "hash": key,
+                    "errors": errors,
+                    "checked_at": now,
+                    "expires_at": now + timedelta(seconds=max_age),
+                })
+
+            with db.engine.begin() as connection:
+                _store(connection, rows)
+
+        return {
+            campaign_id: results[key] for campaign_id, key in hashes.items()
+        }
+
+    @staticmethod
+    def prune() -> int:
+        """Deletes expired results; creatives since edited leave theirs
+        behind."""
+        try:
+            deleted = db.session.execute(
+                db.delete(CreativeValidation).where(
+                    CreativeValidation.expires_at <= datetime.utcnow()
+                )
+            ).rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return max(deleted, 0)
+
+
+class UrlChecker:
+    """Checks that final URLs answer without an HTTP error.
+
+    URLs are fetched ``URL_CHECK_CONCURRENCY`` at a time by a thread pool
+    (greenlets under gevent) sharing one keep-alive connection pool, with a
+    HEAD request (a GET when HEAD is refused) that follows redirects. Only
+    public addresses are ever contacted (see ``_fetch``). Each outcome is
+    cached for ``URL_CHECK_CACHE_TTL`` seconds in the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pid = None
+        self._cache = None
+        self._session = None
+
+    def check(self, urls) -> dict:
+        """``{url: error message, or None if it answered}``."""
+        urls = set(urls)
+        with self._lock:
+            cache, session = self._state()
+            results = {url: cache[url] for url in urls if url in cache}
+
+        missing = sorted(urls - set(results))
+        if missing:
+            workers = min(Config.URL_CHECK_CONCURRENCY, len(missing))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                fetched = dict(
+                    zip(missing, pool.map(lambda url: _fetch(session, url), missing))
+                )
+            with self._lock:
+                cache.update(fetched)
+            results.update(fetched)
+
+        return results
+
+    def _state(self):
+        # Created per process: a forked child must not share the parent's
+        # sockets.
+        if self._pid != os.getpid():
+            adapter = _PublicOnlyAdapter(
+                pool_connections=Config.URL_CHECK_CONCURRENCY,
+                pool_maxsize=Config.URL_CHECK_CONCURRENCY,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            # Direct connections only: through a proxy the address actually
+            # contacted can't be checked.
+            session.trust_env = False
+
+            self._session = session
+            self._cache = TTLCache(
+                maxsize=Config.URL_CHECK_CACHE_SIZE, ttl=Config.URL_CHECK_CACHE_TTL
+            )
+            self._pid = os.getpid()
+        return self._cache, self._session
+
+
+url_checker = UrlChecker()
+
+
+def _creative_hash(campaign) -> str:
+    fields = [
+        RULES_VERSION,
+        Config.URL_CHECK_ENABLED,
+        campaign.objective,
+        campaign.campaign_type,
+        campaign.ad_headline,
+        campaign.ad_description,
+        campaign.asset_url,
+    ]
+    return hashlib.sha256(json.dumps(fields).encode()).hexdigest()
+
+
+def _text_errors(campaign) -> list[str]:
+    creative = render(
+        template_for(campaign.objective, campaign.campaign_type),
+        campaign.ad_headline,
+        campaign.ad_description,
+    )
+
+    errors = []
+    for kind, texts, max_length, disallowed in (
+        (
+            "Headline", creative.headlines, HEADLINE_MAX_LENGTH,
+            DISALLOWED_CHARACTERS | HEADLINE_DISALLOWED_CHARACTERS,
+        ),
+        (
+            "Description", creative.descriptions, DESCRIPTION_MAX_LENGTH,
+            DISALLOWED_CHARACTERS,
+        ),
+    ):
+        seen = set()
+        for text in texts:
+            if not text.strip():
+                errors.append(f"{kind} must not be empty")
+                continue
+
+            length = _display_length(text)
+            if length > max_length:
+                errors.append(
+                    f'{kind} "{text}" is {length} characters long; '
+                    f"at most {max_length} are allowed"
+                )
+
+            rejected = sorted({
+                char for char in text
+                if char in disallowed
+                or unicodedata.category(char) in DISALLOWED_CATEGORIES
+            })
+            if rejected:
+                errors.append(
+                    f'{kind} "{text}" contains disallowed characters: '
+                    + " ".join(repr(char) for char in rejected)
+                )
+
+            if REPEATED_PUNCTUATION.search(text):
+                errors.append(f'{kind} "{text}" repeats punctuation')
+
+            normalized = " ".join(text.casefold().split())
+            if normalized in seen:
+                errors.append(f'{kind} "{text}" is repeated')
+            seen.add(normalized)
+
+    return errors
+
+
+def _display_length(text: str) -> int:
+    return sum(
+        2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+        for char in text
+    )
+
+
+def _url_error(url: str | None) -> str | None:
+    if not url:
+        return "asset_url (the ad's final URL) is required"
+    if len(url) > FINAL_URL_MAX_LENGTH:
+        return f"Final URL must be at most {FINAL_URL_MAX_LENGTH} characters"
+
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        # Unbalanced IPv6 brackets.
+        return f"Final URL {url} is not a valid http(s) URL"
+    host = parts.hostname
+    if (
+        parts.scheme not in ("http", "https")
+        or not host
+        or any(char.isspace() for char in url)
+    ):
+        return f"Final URL {url} is not a valid http(s) URL"
+    if not _valid_port(parts):
+        return f"Final URL {url} has an invalid port"
+
+    # Ads must point at the public web. Addresses written as such (numeric
+    # forms like 2130706433 included) and names that can't be public are
+    # caught here; the URL check also resolves names (see _fetch).
+    address = _literal_address(host)
+    if (
+        (address is not None and not _public(address))
+        or (address is None and "." not in host.strip("."))
+        or host.rstrip(".").endswith((".localhost", ".internal", ".local"))
+    ):
+        return f"Final URL {url} is not a public address"
+
+    return None
+
+
+def _valid_port(parts) -> bool:
+    """Whether the URL's port, if it has one, is a number from 1 to 65535."""
+    try:
+        # Raises for ports that aren't numbers or are out of range.
+        port = parts.port
+    except ValueError:
+        return False
+    return port != 0
+
+
+def _literal_address(host: str):
+    try:
+        return ipaddress.ip_address(host)
+    except ValueError:
+        pass
+    try:
+        # The shorthand forms inet_aton accepts (2130706433, 0x7f000001,
+        # 127.1), which HTTP clients resolve the same way.
+        return ipaddress.ip_address(socket.inet_aton(host))
+    except OSError:
+        return None
+
+
+def _public(address) -> bool:
+    return ipaddress.ip_address(address).is_global
+
+
+class _Unfetchable(Exception):
+    """A final URL (or a redirect from it) that is not fetched."""
+
+
+def _resolve(url: str):
+    """Fails unless the URL passes ``_url_error`` and its host resolves to
+    public addresses only."""
+    parts = urlsplit(url)
+    if _url_error(url):
+        raise _Unfetchable("is not a public address")
+
+    try:
+        infos = socket.getaddrinfo(
+            parts.hostname,
+            parts.port or (443 if parts.scheme == "https" else 80),
+            type=socket.SOCK_STREAM,
+        )
+    except (OSError, UnicodeError):
+        raise _Unfetchable("has a host name that does not resolve") from None
+
+    if not all(_public(info[4][0].split("%")[0]) for info in infos):
+        raise _Unfetchable("is not a public address")
+
+
+def _follow(session, method: str, url: str):
+    """The final response to ``method`` on ``url``, following redirects
+    itself so that every hop is checked before it is requested."""
+    for hop in range(MAX_REDIRECTS + 1):
+        try:
+            _resolve(url)
+        except _Unfetchable:
+            if hop:
+                raise _Unfetchable("redirects to a URL that is not allowed")
+            raise
+        try:
+            response = session.request(
+                method, url, allow_redirects=False,
+                timeout=Config.URL_CHECK_TIMEOUT, stream=True,
+            )
+            response.close()
+        except requests.RequestException:
+            raise _Unfetchable("could not be reached") from None
+
+        if not response.is_redirect:
+            return response
+        url = urljoin(url, response.headers["Location"])
+
+    raise _Unfetchable("redirects too many times")
+
+
+class _PublicOnlyConnectionMixin:
+    """Refuses a connection whose peer is not a public address, whatever
+    the host name resolved to by the time it was connected."""
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        address = sock.getpeername()[0].split("%")[0]
+        if not _public(address):
+            sock.close()
+            raise NewConnectionError(self, "Refused a non-public address")
+        return sock
+
+
+class _PublicOnlyHTTPConnection(_PublicOnlyConnectionMixin, HTTPConnection):
+    pass
+
+
+class _PublicOnlyHTTPSConnection(_PublicOnlyConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _PublicOnlyHTTPPool(HTTPConnectionPool):
+    ConnectionCls = _PublicOnlyHTTPConnection
+
+
+class _PublicOnlyHTTPSPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicOnlyHTTPSConnection
+
+
+class _PublicOnlyAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _PublicOnlyHTTPPool,
+            "https": _PublicOnlyHTTPSPool,
+        }
+
+
+def _fetch(session, url: str) -> str | None:
+    """Requests ``url`` and the redirects it leads to from public addresses
+    only: each hop's host is resolved and checked before it is requested,
+    and the session's adapter refuses connections to anything else. Only
+    public servers' status codes are reported, and failures to connect
+    aren't told apart, so the check can't be used to probe internal
+    hosts."""
+    try:
+        response = _follow(session, "HEAD", url)
+        if response.status_code in (403, 405, 501):
+            # Some servers refuse HEAD but serve the page.
+            response = _follow(session, "GET", url)
+    except _Unfetchable as ex:
+        return f"Final URL {url} {ex}"
+
+    if response.status_code >= 400:
+        return f"Final URL {url} answered HTTP {response.status_code}"
+    return None
+
+
+def _store(connection, rows: list[dict]):
+    if not rows:
+        return
+
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    for start in range(0, len(rows), STORE_BATCH_SIZE):
+        statement = dialect.insert(CreativeValidation.__table__).values(
+            rows[start:start + STORE_BATCH_SIZE]
+        )
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=["hash"],
+                set_={
+                    "errors": statement.excluded.errors,
+                    "checked_at": statement.excluded.checked_at,
+                    "expires_at": statement.excluded.expires_at,
+                },
+            )
+        )
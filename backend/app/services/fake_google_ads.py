@@ -0,0 +1,568 @@
+"""In-process stand-in for the Google Ads API (``GOOGLE_ADS_BACKEND=fake``).
+
+``client_registry`` hands out ``FakeService`` objects instead of gRPC stubs,
+so every ``GoogleAdsService`` path (publish, batch publish, pause,
+reconciliation, status sync, metrics, account discovery) runs without
+credentials or network. Requests and responses are the client library's
+own message types; the fake keeps campaigns, budgets, ad groups and ads in
+memory, resolves temp IDs within a request, honours ``partial_failure`` and
+answers the GAQL queries the app sends.
+
+Latency, transient errors and quota errors are injected per call:
+``FAKE_ADS_LATENCY_MS`` (+ up to ``FAKE_ADS_JITTER_MS``) is slept before
+answering, ``FAKE_ADS_ERROR_RATE`` of the calls fail with gRPC
+``UNAVAILABLE``, and with ``FAKE_ADS_OPS_PER_SECOND`` each customer gets a
+token bucket of mutate operations that answers ``quota_error`` with a retry
+delay when drained.
+
+State lives in the process: a job worker doesn't see campaigns another
+process created, so updates of unknown campaigns are accepted as they are.
+"""
+import itertools
+import os
+import random
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import grpc
+from google.ads.googleads.errors import GoogleAdsException
+
+from app.config import Config
+
+# Operation field of MutateOperation -> (result field, resource collection).
+_KINDS = {
+    "campaign_budget_operation": ("campaign_budget_result", "campaignBudgets"),
+    "campaign_operation": ("campaign_result", "campaigns"),
+    "ad_group_operation": ("ad_group_result", "adGroups"),
+    "ad_group_ad_operation": ("ad_group_ad_result", "adGroupAds"),
+}
+
+# Service method -> operation field of MutateOperation it takes.
+_SERVICE_METHODS = {
+    "mutate_campaign_budgets": "campaign_budget_operation",
+    "mutate_campaigns": "campaign_operation",
+    "mutate_ad_groups": "ad_group_operation",
+    "mutate_ad_group_ads": "ad_group_ad_operation",
+}
+
+HEADLINE_MAX_LENGTH = 30
+DESCRIPTION_MAX_LENGTH = 90
+
+STREAM_BATCH_SIZE = 10000
+
+# Resource IDs each process can hand out, from pid * ID_BLOCK_SIZE.
+ID_BLOCK_SIZE = 1_000_000_000
+
+CHANGE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+_FROM = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+_STRING = r"'(?:\\.|[^'\\])*'"
+_IN = re.compile(rf"([\w.]+)\s+IN\s+\(((?:{_STRING}|[^)'])*)\)", re.IGNORECASE)
+_BETWEEN = re.compile(r"segments\.date\s+BETWEEN\s+'([\d-]+)'\s+AND\s+'([\d-]+)'")
+_CHANGED = re.compile(
+    rf"last_change_date_time\s*>=\s*({_STRING})\s+AND\s+"
+    rf"change_status\.last_change_date_time\s*<=\s*({_STRING})"
+)
+_LIMIT = re.compile(r"\bLIMIT\s+(\d+)", re.IGNORECASE)
+
+
+class FakeRpcError(grpc.RpcError, grpc.Call):
+    """A failed RPC with a status code, as raised by a real stub."""
+
+    def __init__(self, code: grpc.StatusCode, details: str):
+        super().__init__(details)
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+    def initial_metadata(self):
+        return ()
+
+    def trailing_metadata(self):
+        return ()
+
+    def is_active(self):
+        return False
+
+    def time_remaining(self):
+        return None
+
+    def cancel(self):
+        return False
+
+    def add_callback(self, callback):
+        return False
+
+
+class _OperationError(Exception):
+    """One operation's failure: an ``ErrorCode`` oneof field and value."""
+
+    def __init__(self, field: str, code: str, message: str):
+        super().__init__(message)
+        self.field = field
+        self.code = code
+        self.message = message
+
+
+class FakeAdsState:
+    """Accounts of the fake, shared by every ``FakeService`` in the
+    process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._pid = None
+        self._ids = None
+        # customer_id -> {"campaignBudgets": {...}, "campaigns": {...}, ...}
+        self.accounts = {}
+        # customer_id -> [(time, resource type, campaign, budget)]
+        self.changes = {}
+        # customer_id -> (tokens, updated at)
+        self._buckets = {}
+
+    def account(self, customer_id: str) -> dict:
+        account = self.accounts.get(customer_id)
+        if account is None:
+            account = self.accounts[customer_id] = {
+                collection: {} for _, collection in _KINDS.values()
+            }
+            self.changes[customer_id] = []
+        return account
+
+    def next_id(self) -> int:
+        # Seeded per process (and again after a fork from a preloading
+        # master), so campaigns created by different workers never share
+        # a resource name.
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._ids = itertools.count(self._pid * ID_BLOCK_SIZE + 1)
+        return next(self._ids)
+
+    def take_operations(self, customer_id: str, operations: int) -> float:
+        """Takes ``operations`` from the customer's bucket, returning 0 or
+        the seconds until there would be enough."""
+        rate = Config.FAKE_ADS_OPS_PER_SECOND
+        if rate <= 0:
+            return 0
+
+        now = time.monotonic()
+        capacity = max(rate, operations)
+        tokens, updated = self._buckets.get(customer_id, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+        if tokens < operations:
+            self._buckets[customer_id] = (tokens, now)
+            return (operations - tokens) / rate
+        self._buckets[customer_id] = (tokens - operations, now)
+        return 0
+
+
+state = FakeAdsState()
+
+
+def fake_service(name: str, client) -> "FakeService":
+    return FakeService(name, client)
+
+
+class FakeService:
+    """Stands in for any Google Ads service stub; each takes the same
+    arguments as the real method it replaces."""
+
+    channel_state = "FAKE"
+
+    def __init__(self, name: str, client):
+        self.name = name
+        self.client = client
+
+    def mutate(self, request=None, *, customer_id=None, mutate_operations=None,
+               partial_failure=False, **call_options):
+        if request is not None:
+            customer_id = request.customer_id
+            mutate_operations = request.mutate_operations
+            partial_failure = request.partial_failure
+
+        operations = []
+        for operation in mutate_operations:
+            kind = type(operation).pb(operation).WhichOneof("operation")
+            operations.append((kind, getattr(operation, kind)))
+
+        results, failure = self._apply(customer_id, operations, partial_failure)
+
+        response = self.client.get_type("MutateGoogleAdsResponse")
+        for (kind, _), resource_name in zip(operations, results):
+            entry = self.client.get_type("MutateOperationResponse")
+            if resource_name:
+                getattr(entry, _KINDS[kind][0]).resource_name = resource_name
+            response.mutate_operation_responses.append(entry)
+        if failure is not None:
+            self._attach_failure(response, failure)
+        return response
+
+    def search_stream(self, request=None, *, customer_id=None, query=None,
+                      **call_options):
+        if request is not None:
+            customer_id, query = request.customer_id, request.query
+
+        self._inject(customer_id, 0)
+        with state.lock:
+            rows = list(self._query(customer_id, query))
+
+        batches = []
+        for start in range(0, len(rows), STREAM_BATCH_SIZE):
+            batch = self.client.get_type("SearchGoogleAdsStreamResponse")
+            batch.results.extend(rows[start:start + STREAM_BATCH_SIZE])
+            batches.append(batch)
+        return iter(batches)
+
+    def __getattr__(self, method):
+        kind = _SERVICE_METHODS.get(method)
+        if kind is None:
+            raise AttributeError(method)
+
+        def mutate(request=None, *, customer_id=None, operations=None,
+                   partial_failure=False, **call_options):
+            if request is not None:
+                customer_id, operations = request.customer_id, request.operations
+                partial_failure = request.partial_failure
+            results, failure = self._apply(
+                customer_id,
+                [(kind, operation) for operation in operations],
+                partial_failure,
+            )
+            response = self.client.get_type(
+                f"Mutate{_response_name(method)}Response"
+            )
+            for resource_name in results:
+                response.results.append({"resource_name": resource_name or ""})
+            if failure is not None:
+                self._attach_failure(response, failure)
+            return response
+
+        return mutate
+
+    def _attach_failure(self, response, failure):
+        detail = response.partial_failure_error.details.add()
+        detail.type_url = (
+            "type.googleapis.com/" + type(failure).pb().DESCRIPTOR.full_name
+        )
+        detail.value = type(failure).serialize(failure)
+
+    def _inject(self, customer_id: str, operations: int):
+        """Latency, then a transient error or a quota error when
+        configured."""
+        delay = Config.FAKE_ADS_LATENCY_MS + random.uniform(
+            0, Config.FAKE_ADS_JITTER_MS
+        )
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+        if random.random() < Config.FAKE_ADS_ERROR_RATE:
+            raise FakeRpcError(
+                grpc.StatusCode.UNAVAILABLE, "fake: service unavailable"
+            )
+
+        if operations:
+            with state.lock:
+                retry_after = state.take_operations(customer_id, operations)
+            if retry_after:
+                raise self._quota_exception(retry_after)
+
+    def _quota_exception(self, retry_after: float) -> GoogleAdsException:
+        failure = self.client.get_type("GoogleAdsFailure")
+        error = self.client.get_type("GoogleAdsError")
+        error.error_code.quota_error = "RESOURCE_EXHAUSTED"
+        error.message = "fake: too many mutate operations for this customer"
+        error.details.quota_error_details.retry_delay = timedelta(
+            seconds=retry_after
+        )
+        failure.errors.append(error)
+
+        return GoogleAdsException(
+            FakeRpcError(grpc.StatusCode.RESOURCE_EXHAUSTED, error.message),
+            None,
+            failure,
+            "fake",
+        )
+
+    def _apply(self, customer_id, operations, partial_failure=False):
+        """Applies ``(kind, operation)`` pairs in order. Returns the
+        resource name of each (None for failed ones) and the
+        ``GoogleAdsFailure`` of a partial failure; without
+        ``partial_failure`` any error raises ``GoogleAdsException`` and
+        nothing is applied."""
+        self._inject(customer_id, len(operations))
+
+        with state.lock:
+            account = state.account(customer_id)
+            customer = f"customers/{customer_id}"
+            temp_ids = {}
+            pending = []
+            created_names = set()
+            results = []
+            errors = []
+
+            for index, (kind, operation) in enumerate(operations):
+                try:
+                    resource_name, apply = self._operation(
+                        account, customer, kind, operation, temp_ids,
+                        created_names,
+                    )
+                except _OperationError as ex:
+                    errors.append((index, ex))
+                    results.append(None)
+                    continue
+                pending.append(apply)
+                results.append(resource_name)
+
+            failure = self._failure(errors) if errors else None
+            if failure is not None and not partial_failure:
+                raise GoogleAdsException(
+                    FakeRpcError(grpc.StatusCode.INVALID_ARGUMENT, "fake"),
+                    None,
+                    failure,
+                    "fake",
+                )
+
+            now = datetime.utcnow().strftime(CHANGE_TIME_FORMAT)
+            for apply in pending:
+                change = apply()
+                if change:
+                    state.changes[customer_id].append((now, *change))
+
+        return results, failure
+
+    def _operation(self, account, customer, kind, operation, temp_ids,
+                   created_names):
+        """Validates one operation and returns its resource name and a
+        function applying it (and returning the change_status entry)."""
+        result_field, collection = _KINDS[kind]
+        action = type(operation).pb(operation).WhichOneof("operation")
+        resources = account[collection]
+
+        def resolve(resource_name):
+            if resource_name in temp_ids:
+                return temp_ids[resource_name]
+            if resource_name.rsplit("/", 1)[-1].startswith("-"):
+                raise _OperationError(
+                    "mutate_error",
+                    "RESOURCE_NOT_FOUND",
+                    f"Temp ID {resource_name} was not created earlier in the request.",
+                )
+            return resource_name
+
+        if action == "update":
+            resource = operation.update
+            resource_name = resource.resource_name
+            values = {
+                path: _field(resource, path)
+                for path in operation.update_mask.paths
+            }
+
+            def apply():
+                record = resources.setdefault(resource_name, {})
+                record.update(values)
+                if kind == "campaign_operation":
+                    return "CAMPAIGN", resource_name, record.get("campaign_budget", "")
+                if kind == "campaign_budget_operation":
+                    return "CAMPAIGN_BUDGET", "", resource_name
+                return None
+
+            return resource_name, apply
+
+        if action == "remove":
+            resource_name = operation.remove
+
+            def apply():
+                resources.setdefault(resource_name, {})["status"] = "REMOVED"
+                if kind == "campaign_operation":
+                    return "CAMPAIGN", resource_name, ""
+                return None
+
+            return resource_name, apply
+
+        resource = operation.create
+        resource_id = state.next_id()
+
+        if kind == "campaign_budget_operation":
+            record = {
+                "name": resource.name,
+                "amount_micros": resource.amount_micros,
+            }
+        elif kind == "campaign_operation":
+            taken = resource.name in created_names or any(
+                campaign.get("name") == resource.name
+                and campaign.get("status") != "REMOVED"
+                for campaign in resources.values()
+            )
+            if taken:
+                raise _OperationError(
+                    "campaign_error",
+                    "DUPLICATE_CAMPAIGN_NAME",
+                    "A campaign with this name already exists.",
+                )
+            created_names.add(resource.name)
+            record = {
+                "name": resource.name,
+                "status": resource.status.name,
+                "campaign_budget": resolve(resource.campaign_budget),
+            }
+        elif kind == "ad_group_operation":
+            record = {
+                "name": resource.name,
+                "status": resource.status.name,
+                "campaign": resolve(resource.campaign),
+            }
+        else:
+            ad = resource.ad
+            _check_texts(ad.responsive_search_ad.headlines, HEADLINE_MAX_LENGTH)
+            _check_texts(
+                ad.responsive_search_ad.descriptions, DESCRIPTION_MAX_LENGTH
+            )
+            if not ad.final_urls:
+                raise _OperationError(
+                    "ad_error", "FINAL_URL_REQUIRED", "A final URL is required."
+                )
+            ad_group = resolve(resource.ad_group)
+            resource_id = f"{ad_group.rsplit('/', 1)[-1]}~{resource_id}"
+            record = {"ad_group": ad_group, "status": resource.status.name}
+
+        resource_name = f"{customer}/{collection}/{resource_id}"
+        if resource.resource_name:
+            temp_ids[resource.resource_name] = resource_name
+
+        def apply():
+            resources[resource_name] = record
+            if kind == "campaign_operation":
+                return "CAMPAIGN", resource_name, record["campaign_budget"]
+            return None
+
+        return resource_name, apply
+
+    def _failure(self, errors):
+        failure = self.client.get_type("GoogleAdsFailure")
+        for index, error in errors:
+            entry = self.client.get_type("GoogleAdsError")
+            setattr(entry.error_code, error.field, error.code)
+            entry.message = error.message
+            element = self.client.get_type("ErrorLocation").FieldPathElement()
+            element.field_name = "mutate_operations"
+            element.index = index
+            entry.location.field_path_elements.append(element)
+            failure.errors.append(entry)
+        return failure
+
+    def _query(self, customer_id, query):
+        """Rows of the GAQL queries ``GoogleAdsService`` sends."""
+        resource = _FROM.search(query).group(1).lower()
+        filters = {
+            field.lower(): {_unquote(value) for value in re.findall(_STRING, values)}
+            for field, values in _IN.findall(query)
+        }
+        account = state.account(customer_id)
+
+        if resource == "customer_client":
+            for client_id in sorted(
+                set(state.accounts) | {Config.GOOGLE_ADS_CUSTOMER_ID} - {None}
+            ):
+                row = self.client.get_type("GoogleAdsRow")
+                row.customer_client.id = int(client_id)
+                row.customer_client.descriptive_name = f"Fake account {client_id}"
+                row.customer_client.status = "ENABLED"
+                yield row
+            return
+
+        if resource == "change_status":
+            since, until = (_unquote(value) for value in _CHANGED.search(query).groups())
+            limit = int(_LIMIT.search(query).group(1))
+            # Bounds are to the second; change times have microseconds.
+            changes = [
+                change for change in state.changes[customer_id]
+                if since <= change[0][:19] <= until
+            ]
+            for changed_at, resource_type, campaign, budget in changes[:limit]:
+                row = self.client.get_type("GoogleAdsRow")
+                row.change_status.resource_type = resource_type
+                row.change_status.campaign = campaign
+                row.change_status.campaign_budget = budget
+                row.change_status.last_change_date_time = changed_at
+                yield row
+            return
+
+        campaigns = account["campaigns"]
+        names = filters.get("campaign.name")
+        resource_names = filters.get("campaign.resource_name")
+        dates = _BETWEEN.search(query)
+
+        for resource_name, campaign in list(campaigns.items()):
+            if resource_names is not None and resource_name not in resource_names:
+                continue
+            if names is not None and (
+                campaign.get("name") not in names
+                or campaign.get("status") == "REMOVED"
+            ):
+                continue
+
+            if dates:
+                yield from self._metrics_rows(resource_name, *dates.groups())
+                continue
+
+            budget_name = campaign.get("campaign_budget", "")
+            budget = account["campaignBudgets"].get(budget_name, {})
+            status = campaign.get("status", "PAUSED")
+
+            row = self.client.get_type("GoogleAdsRow")
+            row.campaign.resource_name = resource_name
+            row.campaign.name = campaign.get("name", "")
+            row.campaign.status = status
+            row.campaign.serving_status = "ENDED" if status == "REMOVED" else "SERVING"
+            row.campaign_budget.resource_name = budget_name
+            row.campaign_budget.amount_micros = budget.get("amount_micros", 0)
+            yield row
+
+    def _metrics_rows(self, resource_name, start, end):
+        day = date.fromisoformat(start)
+        while day <= date.fromisoformat(end):
+            rng = random.Random(f"{resource_name}/{day}")
+            impressions = rng.randint(0, 5000)
+            clicks = rng.randint(0, impressions // 10)
+
+            row = self.client.get_type("GoogleAdsRow")
+            row.campaign.resource_name = resource_name
+            row.segments.date = day.isoformat()
+            row.metrics.impressions = impressions
+            row.metrics.clicks = clicks
+            row.metrics.cost_micros = clicks * rng.randint(100_000, 2_000_000)
+            row.metrics.conversions = round(clicks * rng.random() * 0.1, 2)
+            yield row
+            day += timedelta(days=1)
+
+
+def _check_texts(assets, max_length: int):
+    for asset in assets:
+        if len(asset.text) > max_length:
+            raise _OperationError(
+                "string_length_error",
+                "TOO_LONG",
+                f"'{asset.text}' is longer than {max_length} characters.",
+            )
+
+
+def _field(resource, path: str):
+    value = resource
+    for name in path.split("."):
+        value = getattr(value, name)
+    return getattr(value, "name", value)
+
+
+def _unquote(value: str) -> str:
+    return re.sub(r"\\(.)", r"\1", value[1:-1])
+
+
+def _response_name(method: str) -> str:
+    # mutate_ad_group_ads -> AdGroupAds
+    return "".join(part.title() for part in method.split("_")[1:])
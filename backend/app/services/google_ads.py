@@ -1,39 +1,219 @@
-from google.ads.googleads.client import GoogleAdsClient
-from google.ads.googleads.errors import GoogleAdsException
-from app.config import Config
-from google.auth.exceptions import TransportError
-import requests
-import urllib3
+import functools
+import time
+from typing import TYPE_CHECKING
 
-from app.errors.exceptions import ExternalServiceError
+from app.config import Config
+from app.metrics import ADS_CALL_RETRIES, observe_ads_call
+from app.services.ads_operations import OperationBuilder, operation_builder
+from app.services.google_ads_client import client_registry
+from app.services.quota_service import INTERACTIVE, QuotaService
+from app.services.resilience import CircuitBreaker, RetryPolicy
+
+from app.errors.exceptions import ExternalServiceError, ServiceUnavailableError
+
+if TYPE_CHECKING:
+    from google.ads.googleads.errors import GoogleAdsException
+
+# GoogleAdsError.error_code oneof fields worth retrying. Anything else
+# (field, request, policy, authorization errors...) fails the same way again.
+RETRYABLE_ADS_ERRORS = {"quota_error", "internal_error"}
+
+# grpc.StatusCode names, so that grpc is only imported with the client.
+RETRYABLE_GRPC_CODES = {"UNAVAILABLE", "RESOURCE_EXHAUSTED", "INTERNAL"}
+
+# Status codes of a broken or stuck channel, worth reopening the process'
+# channels for; other codes are answers to the request itself.
+RECONNECT_GRPC_CODES = {"UNAVAILABLE", "DEADLINE_EXCEEDED"}
+
+
+@functools.cache
+def _ads_errors() -> tuple:
+    """``GoogleAdsException`` followed by the network errors of the gRPC,
+    OAuth and HTTP layers. Imported on the first failed call: the client
+    library takes longer to import than the rest of the app."""
+    import grpc
+    import requests
+    import urllib3
+    from google.ads.googleads.errors import GoogleAdsException
+    from google.auth.exceptions import TransportError
+
+    return (
+        GoogleAdsException,
+        grpc.RpcError,
+        TransportError,
+        requests.exceptions.RequestException,
+        urllib3.exceptions.HTTPError,
+    )
+
+
+ads_retry_policy = RetryPolicy(
+    max_attempts=Config.GOOGLE_ADS_RETRY_ATTEMPTS,
+    base_delay=Config.GOOGLE_ADS_RETRY_BASE_DELAY,
+    max_delay=Config.GOOGLE_ADS_RETRY_MAX_DELAY,
+    deadline=Config.GOOGLE_ADS_RETRY_DEADLINE,
+)
+
+ads_circuit_breaker = CircuitBreaker(
+    "google_ads",
+    failure_threshold=Config.GOOGLE_ADS_BREAKER_THRESHOLD,
+    reset_timeout=Config.GOOGLE_ADS_BREAKER_RESET_SECONDS,
+)
+
+
+def classify_ads_error(ex: Exception, idempotent: bool):
+    """Returns ``(reason, retry_after)`` for a transient failure, where
+    ``retry_after`` is the server's requested delay in seconds (or None),
+    and None for a failure that would recur on retry."""
+    google_ads_exception, rpc_error, *_ = _ads_errors()
+
+    if isinstance(ex, google_ads_exception):
+        codes = {
+            error.error_code._pb.WhichOneof("error_code")
+            for error in ex.failure.errors
+        }
+        if not codes or not codes <= RETRYABLE_ADS_ERRORS:
+            return None
+        retry_after = max(
+            error.details.quota_error_details.retry_delay.total_seconds()
+            for error in ex.failure.errors
+        )
+        return "/".join(sorted(codes)), retry_after or None
+
+    if isinstance(ex, rpc_error):
+        code = ex.code().name if hasattr(ex, "code") else None
+        if code in RETRYABLE_GRPC_CODES:
+            return code.lower(), None
+        # A timed-out create may still have been applied; only calls that
+        # are safe to repeat are retried.
+        if code == "DEADLINE_EXCEEDED" and idempotent:
+            return "deadline_exceeded", None
+        return None
+
+    if isinstance(ex, _ads_errors()):
+        return "network_error", None
+
+    return None
+
+
+def _grpc_code(ex: Exception) -> str | None:
+    """The gRPC status code name of a failed RPC, None for errors below
+    gRPC (OAuth and HTTP transport)."""
+    if isinstance(ex, _ads_errors()[1]) and hasattr(ex, "code"):
+        return ex.code().name
+    return None
+
+
+def _gaql_string(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def resilient_ads_call(idempotent: bool):
+    """Runs a ``GoogleAdsService`` method under the shared retry policy and
+    circuit breaker, translating whatever it finally raises into an
+    ``AppError``.
+
+    Transient failures (quota and internal API errors, unavailable or
+    exhausted gRPC channels, network errors) are retried with jittered
+    backoff and count against the breaker. ``idempotent`` methods are also
+    retried after a deadline. While the breaker is open calls fail at once
+    with ``ServiceUnavailableError`` (503).
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            started = time.monotonic()
+            attempt = 0
+
+            while True:
+                if not ads_circuit_breaker.allow():
+                    raise ServiceUnavailableError(
+                        "Google Ads API is unavailable, retry later",
+                        retry_after=ads_circuit_breaker.retry_after(),
+                    )
+
+                attempt += 1
+                try:
+                    result = method(self, *args, **kwargs)
+                except _ads_errors() as ex:
+                    transient = classify_ads_error(ex, idempotent)
+                    if transient is None:
+                        # The API answered; the request itself is wrong.
+                        ads_circuit_breaker.record_success()
+                        self._raise_ads_error(ex)
+
+                    ads_circuit_breaker.record_failure()
+                    reason, retry_after = transient
+                    delay = ads_retry_policy.backoff(attempt, retry_after)
+                    if not ads_retry_policy.should_retry(attempt, started, delay):
+                        self._raise_ads_error(ex)
+
+                    ADS_CALL_RETRIES.labels(method.__name__, reason).inc()
+                    time.sleep(delay)
+                except BaseException:
+                    ads_circuit_breaker.release()
+                    raise
+                else:
+                    ads_circuit_breaker.record_success()
+                    return result
+
+        return wrapper
+
+    return decorator
 
 
 class GoogleAdsService:
-    def __init__(self):
-        if not all([
+    def __init__(
+        self,
+        customer_id: str | None = None,
+        priority: str = INTERACTIVE,
+        login_customer_id: str | None = None,
+    ):
+        """Calls the API for ``customer_id`` through ``login_customer_id``
+        (GOOGLE_ADS_CUSTOMER_ID and GOOGLE_ADS_LOGIN_CUSTOMER_ID by
+        default). Use ``AccountService.google_ads`` to get the service of a
+        registered account."""
+        fake = Config.GOOGLE_ADS_BACKEND == "fake"
+        self.customer_id = customer_id or Config.GOOGLE_ADS_CUSTOMER_ID
+        self.login_customer_id = (
+            login_customer_id
+            or Config.GOOGLE_ADS_LOGIN_CUSTOMER_ID
+            or (self.customer_id if fake else None)
+        )
+
+        # The fake backend (GOOGLE_ADS_BACKEND=fake) needs no credentials.
+        credentials = [] if fake else [
             Config.GOOGLE_ADS_DEVELOPER_TOKEN,
             Config.GOOGLE_ADS_CLIENT_ID,
             Config.GOOGLE_ADS_CLIENT_SECRET,
             Config.GOOGLE_ADS_REFRESH_TOKEN,
-            Config.GOOGLE_ADS_LOGIN_CUSTOMER_ID,
-            Config.GOOGLE_ADS_CUSTOMER_ID,
+        ]
+        if not all([
+            *credentials,
+            self.login_customer_id,
+            self.customer_id,
         ]):
             raise ExternalServiceError(
                 "Google Ads credentials are not fully configured"
             )
 
-        self.customer_id = Config.GOOGLE_ADS_CUSTOMER_ID
+        self.priority = priority
 
-        self.client = GoogleAdsClient.load_from_dict({
-            "developer_token": Config.GOOGLE_ADS_DEVELOPER_TOKEN,
-            "client_id": Config.GOOGLE_ADS_CLIENT_ID,
-            "client_secret": Config.GOOGLE_ADS_CLIENT_SECRET,
-            "refresh_token": Config.GOOGLE_ADS_REFRESH_TOKEN,
-            "login_customer_id": Config.GOOGLE_ADS_LOGIN_CUSTOMER_ID,
-            "use_proto_plus": True,
-        })
+        self.client = client_registry.get_client(self.login_customer_id)
+        self.operations = operation_builder(self.client)
 
-    def handle_google_exception(self, ex: GoogleAdsException):
+        # The client library's own retry (up to hours on UNAVAILABLE) is
+        # replaced by resilient_ads_call; each attempt gets its own deadline.
+        self.call_options = {
+            "retry": None,
+            "timeout": Config.GOOGLE_ADS_CALL_TIMEOUT,
+        }
+
+    def get_service(self, name: str):
+        return client_registry.get_service(name, self.login_customer_id)
+
+    def handle_google_exception(self, ex: "GoogleAdsException"):
         messages = [
             f"{error.error_code}: {error.message}"
             for error in ex.failure.errors
@@ -41,14 +221,35 @@ class GoogleAdsService:
         raise ExternalServiceError(" | ".join(messages)) from ex
 
     def handle_network_exception(self, ex: Exception):
+        code = _grpc_code(ex)
+        if code is not None and code not in RECONNECT_GRPC_CODES:
+            raise ExternalServiceError(
+                f"Google Ads request failed: {code}"
+            ) from ex
+
+        client_registry.reconnect()
         raise ExternalServiceError("Google Ads service unavailable") from ex
 
-    def raise_google_error(self, ex: GoogleAdsException):
+    def raise_google_error(self, ex: "GoogleAdsException"):
         return self.handle_google_exception(ex)
 
     def raise_network_error(self, ex: Exception):
         return self.handle_network_exception(ex)
 
+    def charge_quota(self, operations: int):
+        """Takes ``operations`` mutate operations from the shared quota
+        buckets before a request is sent (and again on each retry)."""
+        QuotaService.acquire(self.customer_id, operations, self.priority)
+
+    def _raise_ads_error(self, ex: Exception):
+        if isinstance(ex, _ads_errors()[0]):
+            self.handle_google_exception(ex)
+        self.handle_network_exception(ex)
+
+    OPERATIONS_PER_CAMPAIGN = OperationBuilder.OPERATIONS_PER_CAMPAIGN
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=False)
     def publish_search_campaign_atomic(
             self,
             *,
@@ -58,246 +259,445 @@ class GoogleAdsService:
             headline: str,
             description: str,
             final_url: str,
+            objective: str | None = None,
+            campaign_type: str | None = None,
         ):
-        try:
-            google_ads_service = self.client.get_service("GoogleAdsService")
-
-            operations = []
-            customer = f"customers/{self.customer_id}"
-
-            budget_temp = f"{customer}/campaignBudgets/-1"
-            campaign_temp = f"{customer}/campaigns/-2"
-            ad_group_temp = f"{customer}/adGroups/-3"
-
-            budget = self.client.get_type("CampaignBudget")
-            budget.resource_name = budget_temp
-            budget.name = f"{campaign_name} Budget"
-            budget.amount_micros = daily_budget_micros
-            budget.delivery_method = (
-                self.client.enums.BudgetDeliveryMethodEnum.STANDARD
-            )
-
-            budget_op = self.client.get_type("MutateOperation")
-            budget_op.campaign_budget_operation.create = budget
-            operations.append(budget_op)
-
-            campaign = self.client.get_type("Campaign")
-            campaign.resource_name = campaign_temp
-            campaign.name = campaign_name
-            campaign.campaign_budget = budget_temp
-            campaign.status = self.client.enums.CampaignStatusEnum.PAUSED
-            campaign.advertising_channel_type = (
-                self.client.enums.AdvertisingChannelTypeEnum.SEARCH
-            )
-
-            campaign_op = self.client.get_type("MutateOperation")
-            campaign_op.campaign_operation.create = campaign
-            operations.append(campaign_op)
-
-            ad_group = self.client.get_type("AdGroup")
-            ad_group.resource_name = ad_group_temp
-            ad_group.name = ad_group_name
-            ad_group.campaign = campaign_temp
-            ad_group.status = self.client.enums.AdGroupStatusEnum.PAUSED
-            ad_group.type_ = self.client.enums.AdGroupTypeEnum.SEARCH_STANDARD
-
-            ad_group_op = self.client.get_type("MutateOperation")
-            ad_group_op.ad_group_operation.create = ad_group
-            operations.append(ad_group_op)
-
-            ad_group_ad = self.client.get_type("AdGroupAd")
-            ad_group_ad.ad_group = ad_group_temp
-            ad_group_ad.status = self.client.enums.AdGroupAdStatusEnum.PAUSED
-
-            ad = ad_group_ad.ad
-            ad.final_urls.append(final_url)
-
-            rsa = ad.responsive_search_ad
-
-            h1 = self.client.get_type("AdTextAsset")
-            h1.text = headline
-
-            h2 = self.client.get_type("AdTextAsset")
-            h2.text = f"{headline} Official"
-
-            h3 = self.client.get_type("AdTextAsset")
-            h3.text = "Get Started Today"
-
-            rsa.headlines.append(h1)
-            rsa.headlines.append(h2)
-            rsa.headlines.append(h3)
-
-            d1 = self.client.get_type("AdTextAsset")
-            d1.text = description
-
-            d2 = self.client.get_type("AdTextAsset")
-            d2.text = "Simple. Fast. Reliable."
+        google_ads_service = self.get_service("GoogleAdsService")
+
+        operations = self.operations.search_campaign(
+            0,
+            self.customer_id,
+            campaign_name=campaign_name,
+            daily_budget_micros=daily_budget_micros,
+            ad_group_name=ad_group_name,
+            headline=headline,
+            description=description,
+            final_url=final_url,
+            objective=objective,
+            campaign_type=campaign_type,
+        )
+
+        self.charge_quota(len(operations))
+        response = google_ads_service.mutate(
+            customer_id=self.customer_id,
+            mutate_operations=operations,
+            **self.call_options,
+        )
+
+        for res in response.mutate_operation_responses:
+            if res.campaign_result.resource_name:
+                return res.campaign_result.resource_name
+
+        raise ExternalServiceError("Campaign created but resource not returned")
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=False)
+    def publish_search_campaigns(self, campaigns: list[dict]) -> list[dict]:
+        """Creates many paused search campaigns in one partial-failure mutate.
+
+        Each item takes the keyword arguments of
+        ``publish_search_campaign_atomic``. Returns one dict per item, in
+        order, with the created campaign ``resource_name`` and
+        ``budget_resource_name`` (None for an operation that failed) and the
+        ``errors`` reported for any of that campaign's operations. Each
+        operation succeeds or fails on its own, so a campaign with errors
+        may exist without its ad group or ad (see ``remove_campaigns``).
+        The caller must keep the request within the API's per-request
+        operation limit.
+        """
+        google_ads_service = self.get_service("GoogleAdsService")
+
+        request = self.client.get_type("MutateGoogleAdsRequest")
+        request.customer_id = self.customer_id
+        request.partial_failure = True
+        self.operations.search_campaigns_request(
+            request, self.customer_id, campaigns
+        )
+
+        self.charge_quota(len(request.mutate_operations))
+        response = google_ads_service.mutate(
+            request=request, **self.call_options
+        )
+
+        results = [
+            {"resource_name": None, "budget_resource_name": None, "errors": []}
+            for _ in campaigns
+        ]
 
-            rsa.descriptions.append(d1)
-            rsa.descriptions.append(d2)
+        for op_index, res in enumerate(response.mutate_operation_responses):
+            index = op_index // self.OPERATIONS_PER_CAMPAIGN
+            if res.campaign_result.resource_name:
+                results[index]["resource_name"] = (
+                    res.campaign_result.resource_name
+                )
+            if res.campaign_budget_result.resource_name:
+                results[index]["budget_resource_name"] = (
+                    res.campaign_budget_result.resource_name
+                )
+
+        for op_index, message in self._partial_failures(response):
+            index = op_index // self.OPERATIONS_PER_CAMPAIGN
+            results[index]["errors"].append(message)
+
+        return results
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=False)
+    def remove_campaigns(self, resources: list[tuple]) -> list[list[str]]:
+        """Removes campaigns and their budgets in one partial-failure
+        mutate; removing a campaign removes its ad groups and ads.
+        ``resources`` are ``(campaign resource name, budget resource
+        name)`` pairs, either of which may be None. Returns the errors of
+        each pair, in order; an empty list means it was removed.
+        """
+        google_ads_service = self.get_service("GoogleAdsService")
+
+        owners = []
+        names = []
+        for index, pair in enumerate(resources):
+            for name in pair:
+                if name:
+                    owners.append(index)
+                    names.append(name)
+
+        request = self.client.get_type("MutateGoogleAdsRequest")
+        request.customer_id = self.customer_id
+        request.partial_failure = True
+        self.operations.remove_request(request, names)
+
+        self.charge_quota(len(names))
+        response = google_ads_service.mutate(
+            request=request, **self.call_options
+        )
+
+        errors = [[] for _ in resources]
+        for op_index, message in self._partial_failures(response):
+            errors[owners[op_index]].append(message)
+        return errors
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=True)
+    def set_campaign_statuses(
+        self, resource_names: list[str], enabled: bool
+    ) -> list[list[str]]:
+        """Enables (or pauses) many campaigns in one partial-failure
+        ``mutate_campaigns`` request. Returns the errors of each campaign,
+        in order; an empty list means it was updated. The caller must keep
+        the request within the API's per-request operation limit.
+        """
+        campaign_service = self.get_service("CampaignService")
+        build = (
+            self.operations.enable_campaign if enabled
+            else self.operations.pause_campaign
+        )
+
+        request = self.client.get_type("MutateCampaignsRequest")
+        request.customer_id = self.customer_id
+        request.partial_failure = True
+        request.operations.extend(build(name) for name in resource_names)
+
+        self.charge_quota(len(resource_names))
+        response = campaign_service.mutate_campaigns(
+            request=request, **self.call_options
+        )
+
+        errors = [[] for _ in resource_names]
+        for op_index, message in self._partial_failures(response):
+            errors[op_index].append(message)
+        return errors
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=True)
+    def find_campaigns_by_name(self, names: list[str]) -> dict:
+        """Returns ``{name: resource_name}`` for the campaigns (other than
+        removed ones) whose name is in ``names``, using a single streamed
+        GAQL query."""
+        if not names:
+            return {}
+
+        google_ads_service = self.get_service("GoogleAdsService")
+
+        quoted = ", ".join(_gaql_string(name) for name in names)
+        query = (
+            "SELECT campaign.resource_name, campaign.name "
+            "FROM campaign "
+            f"WHERE campaign.name IN ({quoted}) "
+            "AND campaign.status != 'REMOVED'"
+        )
+
+        stream = google_ads_service.search_stream(
+            customer_id=self.customer_id,
+            query=query,
+            **self.call_options,
+        )
+
+        return {
+            row.campaign.name: row.campaign.resource_name
+            for batch in stream
+            for row in batch.results
+        }
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=True)
+    def client_accounts(self) -> list[dict]:
+        """Client (non-manager) accounts under the login customer, at any
+        depth, read with one streamed GAQL query."""
+        google_ads_service = self.get_service("GoogleAdsService")
+
+        query = (
+            "SELECT customer_client.id, customer_client.descriptive_name, "
+            "customer_client.status "
+            "FROM customer_client "
+            "WHERE customer_client.manager = FALSE"
+        )
+
+        stream = google_ads_service.search_stream(
+            customer_id=self.login_customer_id,
+            query=query,
+            **self.call_options,
+        )
+
+        return [
+            {
+                "customer_id": str(row.customer_client.id),
+                "name": row.customer_client.descriptive_name,
+                "status": row.customer_client.status.name,
+            }
+            for batch in stream
+            for row in batch.results
+        ]
 
-            ad_op = self.client.get_type("MutateOperation")
-            ad_op.ad_group_ad_operation.create = ad_group_ad
-            operations.append(ad_op)
+    @observe_ads_call
+    @resilient_ads_call(idempotent=True)
+    def changed_campaigns(self, since: str, until: str, limit: int) -> dict:
+        """Reads ``change_status`` rows for campaigns and budgets changed
+        between ``since`` and ``until`` (``YYYY-MM-DD HH:MM:SS`` in the
+        account's time zone, at most 90 days back).
+
+        Returns the changed ``campaigns`` and ``budgets`` resource names,
+        the ``latest`` change time read and whether ``limit`` ``truncated``
+        the result.
+        """
+        google_ads_service = self.get_service("GoogleAdsService")
+
+        query = (
+            "SELECT change_status.resource_type, change_status.campaign, "
+            "change_status.campaign_budget, "
+            "change_status.last_change_date_time "
+            "FROM change_status "
+            f"WHERE change_status.last_change_date_time >= {_gaql_string(since)} "
+            f"AND change_status.last_change_date_time <= {_gaql_string(until)} "
+            "AND change_status.resource_type IN ('CAMPAIGN', 'CAMPAIGN_BUDGET') "
+            "ORDER BY change_status.last_change_date_time "
+            f"LIMIT {int(limit)}"
+        )
+
+        stream = google_ads_service.search_stream(
+            customer_id=self.customer_id,
+            query=query,
+            **self.call_options,
+        )
+
+        campaigns, budgets = set(), set()
+        latest = None
+        rows = 0
+        for batch in stream:
+            for row in batch.results:
+                rows += 1
+                change = row.change_status
+                if change.resource_type.name == "CAMPAIGN":
+                    campaigns.add(change.campaign)
+                else:
+                    budgets.add(change.campaign_budget)
+                latest = change.last_change_date_time
+
+        return {
+            "campaigns": campaigns,
+            "budgets": budgets,
+            "latest": latest,
+            "truncated": rows >= limit,
+        }
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=True)
+    def campaign_states(self, resource_names: list[str] | None = None) -> list[dict]:
+        """Status, serving status and budget of the given campaigns (every
+        campaign in the account, removed ones included, when
+        ``resource_names`` is None), read with one streamed GAQL query."""
+        if resource_names is not None and not resource_names:
+            return []
+
+        google_ads_service = self.get_service("GoogleAdsService")
+
+        query = (
+            "SELECT campaign.resource_name, campaign.status, "
+            "campaign.serving_status, campaign_budget.resource_name, "
+            "campaign_budget.amount_micros "
+            "FROM campaign"
+        )
+        if resource_names is not None:
+            quoted = ", ".join(_gaql_string(name) for name in resource_names)
+            query += f" WHERE campaign.resource_name IN ({quoted})"
+
+        stream = google_ads_service.search_stream(
+            customer_id=self.customer_id,
+            query=query,
+            **self.call_options,
+        )
+
+        return [
+            {
+                "resource_name": row.campaign.resource_name,
+                "status": row.campaign.status.name,
+                "serving_status": row.campaign.serving_status.name,
+                "budget_resource_name": row.campaign_budget.resource_name,
+                "budget_micros": row.campaign_budget.amount_micros,
+            }
+            for batch in stream
+            for row in batch.results
+        ]
 
-            response = google_ads_service.mutate(
-                customer_id=self.customer_id,
-                mutate_operations=operations,
+    @observe_ads_call
+    @resilient_ads_call(idempotent=True)
+    def campaign_metrics(self, start, end) -> list[tuple]:
+        """Daily ``(resource_name, date, impressions, clicks, cost_micros,
+        conversions)`` rows for every campaign with activity between the
+        ``start`` and ``end`` dates (inclusive), read with one streamed
+        GAQL query."""
+        google_ads_service = self.get_service("GoogleAdsService")
+
+        query = (
+            "SELECT campaign.resource_name, segments.date, "
+            "metrics.impressions, metrics.clicks, metrics.cost_micros, "
+            "metrics.conversions "
+            "FROM campaign "
+            f"WHERE segments.date BETWEEN '{start.isoformat()}' "
+            f"AND '{end.isoformat()}'"
+        )
+
+        stream = google_ads_service.search_stream(
+            customer_id=self.customer_id,
+            query=query,
+            **self.call_options,
+        )
+
+        return [
+            (
+                row.campaign.resource_name,
+                row.segments.date,
+                row.metrics.impressions,
+                row.metrics.clicks,
+                row.metrics.cost_micros,
+                row.metrics.conversions,
             )
+            for batch in stream
+            for row in batch.results
+        ]
 
-            for res in response.mutate_operation_responses:
-                if res.campaign_result.resource_name:
-                    return res.campaign_result.resource_name
+    def _partial_failures(self, response):
+        """Yields (operation index, message) for each partial-failure error."""
+        if not response.partial_failure_error.details:
+            return
 
-            raise ExternalServiceError("Campaign created but resource not returned")
+        failure_type = type(self.client.get_type("GoogleAdsFailure"))
 
-        except GoogleAdsException as ex:
-            self.handle_google_exception(ex)
-        except (TransportError, requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as ex:
-            self.handle_network_exception(ex)
+        for detail in response.partial_failure_error.details:
+            failure = failure_type.deserialize(detail.value)
+            for error in failure.errors:
+                elements = error.location.field_path_elements
+                op_index = elements[0].index if elements else 0
+                yield op_index, f"{error.error_code}: {error.message}"
 
+    @observe_ads_call
+    @resilient_ads_call(idempotent=False)
     def create_campaign_budget(self, daily_budget_micros: int, name: str):
-        try:
-            budget_service = self.client.get_service("CampaignBudgetService")
-            operation = self.client.get_type("CampaignBudgetOperation")
-
-            budget = operation.create
-            budget.name = name
-            budget.amount_micros = daily_budget_micros
-            budget.delivery_method = (
-                self.client.enums.BudgetDeliveryMethodEnum.STANDARD
-            )
+        budget_service = self.get_service("CampaignBudgetService")
+        operation = self.client.get_type("CampaignBudgetOperation")
+        operation.create = self.operations.budget(name, daily_budget_micros)
 
-            response = budget_service.mutate_campaign_budgets(
-                customer_id=self.customer_id,
-                operations=[operation],
-            )
-
-            return response.results[0].resource_name
-
-        except GoogleAdsException as ex:
-            self.handle_google_exception(ex)
-        except (TransportError, requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as ex:
-            self.handle_network_exception(ex)
+        self.charge_quota(1)
+        response = budget_service.mutate_campaign_budgets(
+            customer_id=self.customer_id,
+            operations=[operation],
+            **self.call_options,
+        )
 
+        return response.results[0].resource_name
 
+    @observe_ads_call
+    @resilient_ads_call(idempotent=False)
     def create_paused_campaign(self, name: str, budget_resource_name: str):
-        try:
-            campaign_service = self.client.get_service("CampaignService")
-            operation = self.client.get_type("CampaignOperation")
-
-            campaign = operation.create
-            campaign.name = name
-            campaign.campaign_budget = budget_resource_name
-            campaign.status = self.client.enums.CampaignStatusEnum.PAUSED
-            campaign.advertising_channel_type = (
-                self.client.enums.AdvertisingChannelTypeEnum.SEARCH
-            )
+        campaign_service = self.get_service("CampaignService")
+        operation = self.client.get_type("CampaignOperation")
+        operation.create = self.operations.campaign(name, budget_resource_name)
 
-            response = campaign_service.mutate_campaigns(
-                customer_id=self.customer_id,
-                operations=[operation],
-            )
-
-            return response.results[0].resource_name
-        except GoogleAdsException as ex:
-            self.handle_google_exception(ex)
-        except (TransportError, requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as ex:
-            self.handle_network_exception(ex)
-        
-    def create_ad_group(self, campaign_resource_name: str, ad_group_name: str):
-        try:
-            ad_group_service = self.client.get_service("AdGroupService")
-            operation = self.client.get_type("AdGroupOperation")
-
-            ad_group = operation.create
-            ad_group.name = ad_group_name
-            ad_group.campaign = campaign_resource_name
-            ad_group.status = self.client.enums.AdGroupStatusEnum.PAUSED
-            ad_group.type_ = self.client.enums.AdGroupTypeEnum.SEARCH_STANDARD
-
-            response = ad_group_service.mutate_ad_groups(
-                customer_id=self.customer_id,
-                operations=[operation],
-            )
-
-            return response.results[0].resource_name
+        self.charge_quota(1)
+        response = campaign_service.mutate_campaigns(
+            customer_id=self.customer_id,
+            operations=[operation],
+            **self.call_options,
+        )
 
-        except GoogleAdsException as ex:
-            self.handle_google_exception(ex)
-        except (TransportError, requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as ex:
-            self.handle_network_exception(ex)
+        return response.results[0].resource_name
 
+    @observe_ads_call
+    @resilient_ads_call(idempotent=False)
+    def create_ad_group(self, campaign_resource_name: str, ad_group_name: str):
+        ad_group_service = self.get_service("AdGroupService")
+        operation = self.client.get_type("AdGroupOperation")
+        operation.create = self.operations.ad_group(
+            ad_group_name, campaign_resource_name
+        )
+
+        self.charge_quota(1)
+        response = ad_group_service.mutate_ad_groups(
+            customer_id=self.customer_id,
+            operations=[operation],
+            **self.call_options,
+        )
+
+        return response.results[0].resource_name
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=False)
     def create_responsive_search_ad(
         self,
         ad_group_resource_name: str,
         headline: str,
         description: str,
         final_url: str,
+        objective: str | None = None,
+        campaign_type: str | None = None,
     ):
-        try:
-            ad_group_ad_service = self.client.get_service("AdGroupAdService")
-            operation = self.client.get_type("AdGroupAdOperation")
-
-            ad_group_ad = operation.create
-            ad_group_ad.ad_group = ad_group_resource_name
-            ad_group_ad.status = self.client.enums.AdGroupAdStatusEnum.PAUSED
-
-            ad = ad_group_ad.ad
-            ad.final_urls.append(final_url)
-
-            rsa = ad.responsive_search_ad
-
-            h1 = self.client.get_type("AdTextAsset")
-            h1.text = headline
-
-            h2 = self.client.get_type("AdTextAsset")
-            h2.text = f"{headline} – Official"
-
-            h3 = self.client.get_type("AdTextAsset")
-            h3.text = "Get Started Today"
-
-            rsa.headlines.append(h1)
-            rsa.headlines.append(h2)
-            rsa.headlines.append(h3)
-
-            d1 = self.client.get_type("AdTextAsset")
-            d1.text = description
-
-            d2 = self.client.get_type("AdTextAsset")
-            d2.text = "Simple. Fast. Reliable."
-
-            rsa.descriptions.append(d1)
-            rsa.descriptions.append(d2)
-
-            response = ad_group_ad_service.mutate_ad_group_ads(
-                customer_id=self.customer_id,
-                operations=[operation],
-            )
-
-            return response.results[0].resource_name
-
-        except GoogleAdsException as ex:
-            self.handle_google_exception(ex)
-        except (TransportError, requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as ex:
-            self.handle_network_exception(ex)
-        
+        ad_group_ad_service = self.get_service("AdGroupAdService")
+        operation = self.client.get_type("AdGroupAdOperation")
+        operation.create = self.operations.ad_group_ad(
+            ad_group_resource_name,
+            headline,
+            description,
+            final_url,
+            objective,
+            campaign_type,
+        )
+
+        self.charge_quota(1)
+        response = ad_group_ad_service.mutate_ad_group_ads(
+            customer_id=self.customer_id,
+            operations=[operation],
+            **self.call_options,
+        )
+
+        return response.results[0].resource_name
+
+    @observe_ads_call
+    @resilient_ads_call(idempotent=True)
     def pause_campaign(self, campaign_resource_name: str):
-        try:
-            campaign_service = self.client.get_service("CampaignService")
-            operation = self.client.get_type("CampaignOperation")
-
-            campaign = operation.update
-            campaign.resource_name = campaign_resource_name
-            campaign.status = self.client.enums.CampaignStatusEnum.PAUSED
-            operation.update_mask.paths.append("status")
-            
-            campaign_service.mutate_campaigns(
-                customer_id=self.customer_id,
-                operations=[operation],
-            )
-
-        except GoogleAdsException as ex:
-            self.raise_google_error(ex)
-        except (TransportError, requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as ex:
-            self.raise_network_error(ex)
\ No newline at end of file
+        campaign_service = self.get_service("CampaignService")
+        operation = self.operations.pause_campaign(campaign_resource_name)
+
+        self.charge_quota(1)
+        campaign_service.mutate_campaigns(
+            customer_id=self.customer_id,
+            operations=[operation],
+            **self.call_options,
+        )
\ No newline at end of file
@@ -0,0 +1,220 @@
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from app.config import Config
+
+if TYPE_CHECKING:
+    from google.ads.googleads.client import GoogleAdsClient
+
+# Services the app calls, imported by preload_sdk.
+SERVICES = (
+    "GoogleAdsService",
+    "CampaignBudgetService",
+    "CampaignService",
+    "AdGroupService",
+    "AdGroupAdService",
+)
+
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+
+class GoogleAdsClientRegistry:
+    """Process-wide cache of Google Ads clients, their credentials and
+    service stubs.
+
+    There is one client per login (manager) customer id, since the login
+    customer is bound to the client and sent with every request; all of
+    them share one set of OAuth credentials. Clients are built once per
+    worker process (they are rebuilt after a fork so gRPC channels are
+    never shared between processes), the access token is refreshed only
+    when it is about to expire, and each service stub returned by
+    ``client.get_service`` is kept so its channel is reused. The client
+    library itself is imported when the first client is built.
+    """
+
+    def __init__(self, token_refresh_margin: int = 300):
+        self.token_refresh_margin = timedelta(seconds=token_refresh_margin)
+        self._lock = threading.RLock()
+        self._pid = None
+        self._clients = {}
+        self._credentials = None
+        self._services = {}
+        self._channel_states = {}
+        self._watchers = {}
+        self._stats = {
+            "clients_built": 0,
+            "token_refreshes": 0,
+            "services_built": 0,
+            "reconnects": 0,
+        }
+
+    def get_client(self, login_customer_id: str | None = None) -> "GoogleAdsClient":
+        login_customer_id = login_customer_id or Config.GOOGLE_ADS_LOGIN_CUSTOMER_ID
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            client = self._clients.get(login_customer_id)
+            if client is None:
+                client = self._build_client(login_customer_id)
+            if not _fake():
+                self._ensure_token()
+            return client
+
+    def get_service(self, name: str, login_customer_id: str | None = None):
+        login_customer_id = login_customer_id or Config.GOOGLE_ADS_LOGIN_CUSTOMER_ID
+
+        with self._lock:
+            client = self.get_client(login_customer_id)
+            service = self._services.get((login_customer_id, name))
+            if service is None:
+                if _fake():
+                    from app.services.fake_google_ads import fake_service
+
+                    service = fake_service(name, client)
+                else:
+                    service = client.get_service(name)
+                    self._watch_channel((login_customer_id, name), service)
+                self._services[(login_customer_id, name)] = service
+                self._stats["services_built"] += 1
+            return service
+
+    def reconnect(self):
+        """Drop every cached stub so the next call opens fresh channels."""
+        with self._lock:
+            self._close_channels()
+            self._stats["reconnects"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            expiry = self._credentials.expiry if self._credentials else None
+            return {
+                "backend": Config.GOOGLE_ADS_BACKEND,
+                "pid": self._pid,
+                "client_ready": bool(self._clients),
+                "login_customer_ids": sorted(self._clients),
+                "token_expiry": expiry.isoformat() if expiry else None,
+                "channels": {
+                    f"{login_customer_id}/{name}": (
+                        getattr(service, "channel_state", None)
+                        or self._channel_states.get(
+                            (login_customer_id, name), "UNKNOWN"
+                        )
+                    )
+                    for (login_customer_id, name), service
+                    in self._services.items()
+                },
+                **self._stats,
+            }
+
+    def _reset(self):
+        from google.oauth2.credentials import Credentials
+
+        # A fork inherits the parent's channels; they must not be reused.
+        self._clients = {}
+        self._services = {}
+        self._channel_states = {}
+        self._watchers = {}
+        self._credentials = Credentials(
+            token=None,
+            refresh_token=Config.GOOGLE_ADS_REFRESH_TOKEN,
+            client_id=Config.GOOGLE_ADS_CLIENT_ID,
+            client_secret=Config.GOOGLE_ADS_CLIENT_SECRET,
+            token_uri=TOKEN_URI,
+        )
+        self._pid = os.getpid()
+
+    def _build_client(self, login_customer_id: str) -> "GoogleAdsClient":
+        from google.ads.googleads.client import GoogleAdsClient
+
+        client = GoogleAdsClient(
+            credentials=self._credentials,
+            developer_token=Config.GOOGLE_ADS_DEVELOPER_TOKEN,
+            login_customer_id=login_customer_id,
+            use_proto_plus=True,
+        )
+        self._clients[login_customer_id] = client
+        self._stats["clients_built"] += 1
+        return client
+
+    def _ensure_token(self):
+        creds = self._credentials
+        if creds.token and creds.expiry:
+            # google-auth stores expiry as a naive UTC datetime.
+            now = datetime.now(timezone.utc).replace(tzinfo=None)
+            if creds.expiry - now > self.token_refresh_margin:
+                return
+
+        from google.auth.transport.requests import Request
+
+        creds.refresh(Request())
+        self._stats["token_refreshes"] += 1
+
+    def _watch_channel(self, key: tuple[str, str], service):
+        """Tracks the connectivity of a stub's channel for ``stats``.
+
+        The callback runs on grpc's polling thread whenever the state
+        changes; ``try_to_connect=False`` leaves an idle channel idle.
+        """
+        def on_change(state):
+            self._channel_states[key] = state.name
+
+        channel = service.transport.grpc_channel
+        channel.subscribe(on_change, try_to_connect=False)
+        self._watchers[key] = (channel, on_change)
+
+    def _close_channels(self):
+        for channel, on_change in self._watchers.values():
+            channel.unsubscribe(on_change)
+        for service in self._services.values():
+            try:
+                service.transport.close()
+            except Exception:
+                pass
+        self._services = {}
+        self._channel_states = {}
+        self._watchers = {}
+
+
+def preload_sdk():
+    """Imports the client library, the message types of the API version,
+    the services in ``SERVICES`` and the operation prototypes, without
+    opening a channel or fetching a token.
+
+    Building the first client and its messages takes over a second, which
+    otherwise lands on the first Google Ads call of every worker. Called in
+    the Gunicorn master with ``GUNICORN_PRELOAD``, so workers inherit the
+    loaded modules copy-on-write.
+    """
+    from google.ads.googleads import util
+    from google.ads.googleads.client import GoogleAdsClient
+    from google.oauth2.credentials import Credentials
+
+    from app.services.ads_operations import operation_builder
+
+    client = GoogleAdsClient(
+        credentials=Credentials(token=None),
+        developer_token=Config.GOOGLE_ADS_DEVELOPER_TOKEN or "unused",
+        use_proto_plus=True,
+    )
+    operation_builder(client)
+    client.get_type("GoogleAdsFailure")
+
+    # google.ads.googleads.<version>.services.types.google_ads_service
+    request = client.get_type("MutateGoogleAdsRequest")
+    version = type(request).__module__.split(".")[3]
+    for name in SERVICES:
+        import_module(
+            f"google.ads.googleads.{version}.services.services."
+            f"{util.convert_upper_case_to_snake_case(name)}"
+        )
+
+
+def _fake() -> bool:
+    return Config.GOOGLE_ADS_BACKEND == "fake"
+
+
+client_registry = GoogleAdsClientRegistry()
@@ -0,0 +1,202 @@
+from datetime import datetime, timedelta
+from app.config import Config
+from app.extensions import db
+from app.locks import try_advisory_xact_lock
+from app.models.job import Job
+from app.errors.exceptions import (
+    AppError,
+    ExternalServiceError,
+    NotFoundError,
+    ServiceUnavailableError,
+)
+
+
+class JobService:
+    PRIORITY_NORMAL = 0
+    # Interactive actions (pausing a campaign) jump ahead of queued publishes.
+    PRIORITY_HIGH = 10
+
+    # Jobs looked at per claim before giving up when their accounts are busy.
+    CLAIM_CANDIDATES = 5
+
+    @staticmethod
+    def enqueue(
+        kind: str,
+        campaign_id=None,
+        payload: dict | None = None,
+        priority: int = PRIORITY_NORMAL,
+        idempotency_key: str | None = None,
+        customer_id: str | None = None,
+    ) -> Job:
+        """Adds a job to the session; the caller owns the commit so the job
+        is written in the same transaction as the state change it tracks."""
+        job = Job(
+            kind=kind,
+            campaign_id=campaign_id,
+            customer_id=customer_id,
+            payload=payload or {},
+            status="QUEUED",
+            priority=priority,
+            idempotency_key=idempotency_key,
+            max_attempts=Config.JOB_MAX_ATTEMPTS,
+            run_after=datetime.utcnow(),
+        )
+        db.session.add(job)
+        return job
+
+    @staticmethod
+    def get_job(job_id) -> Job:
+        job = db.session.get(Job, job_id)
+
+        if not job:
+            raise NotFoundError("Job not found")
+
+        return job
+
+    @staticmethod
+    def find_by_idempotency_key(key: str) -> Job | None:
+        return Job.query.filter_by(idempotency_key=key).first()
+
+    @staticmethod
+    def claim_next() -> Job | None:
+        """Locks and marks RUNNING the next due job, highest priority first.
+
+        ``FOR UPDATE SKIP LOCKED`` lets any number of workers poll the same
+        table without blocking on, or double-claiming, each other's rows.
+        RUNNING jobs whose lease expired (the worker died mid-job) are
+        picked up again.
+
+        Jobs of a Google Ads account that already has
+        ``JOB_MAX_RUNNING_PER_CUSTOMER`` jobs running are passed over, so
+        workers spread across accounts instead of queueing on one
+        account's rate limits. Claims for one account are serialized by a
+        transaction-level advisory lock, under which its running jobs are
+        counted again.
+        """
+        now = datetime.utcnow()
+        lease_expired = now - timedelta(seconds=Config.JOB_LEASE_SECONDS)
+
+        running = db.aliased(Job)
+        busy_customers = (
+            db.select(running.customer_id)
+            .where(
+                running.customer_id.is_not(None),
+                _running(running, lease_expired),
+            )
+            .group_by(running.customer_id)
+            .having(db.func.count() >= Config.JOB_MAX_RUNNING_PER_CUSTOMER)
+        )
+
+        query = Job.query.filter(
+            db.or_(
+                db.and_(Job.status == "QUEUED", Job.run_after <= now),
+                db.and_(
+                    Job.status == "RUNNING",
+                    Job.started_at < lease_expired,
+                ),
+            ),
+            db.or_(
+                Job.customer_id.is_(None),
+                Job.customer_id.not_in(busy_customers),
+            ),
+        )
+
+        passed_over = set()
+        for _ in range(JobService.CLAIM_CANDIDATES):
+            candidates = query
+            if passed_over:
+                candidates = candidates.filter(
+                    db.or_(
+                        Job.customer_id.is_(None),
+                        Job.customer_id.not_in(passed_over),
+                    )
+                )
+
+            job = (
+                candidates
+                .order_by(Job.priority.desc(), Job.run_after)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+
+            if not job:
+                break
+
+            if job.customer_id is None or JobService._reserve_customer(
+                job.customer_id, lease_expired
+            ):
+                job.status = "RUNNING"
+                job.attempts += 1
+                job.started_at = now
+                job.error = None
+                db.session.commit()
+
+                return job
+
+            passed_over.add(job.customer_id)
+
+        db.session.rollback()
+        return None
+
+    @staticmethod
+    def _reserve_customer(customer_id: str, lease_expired: datetime) -> bool:
+        """Whether another job of ``customer_id`` may start now. The lock
+        taken lasts until the claim commits."""
+        if not try_advisory_xact_lock(f"jobs:customer:{customer_id}"):
+            return False
+
+        running = db.session.execute(
+            db.select(db.func.count())
+            .select_from(Job)
+            .where(Job.customer_id == customer_id, _running(Job, lease_expired))
+        ).scalar()
+
+        return running < Config.JOB_MAX_RUNNING_PER_CUSTOMER
+
+    @staticmethod
+    def complete(job: Job, result: dict | None = None):
+        job.status = "SUCCEEDED"
+        job.result = result
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+
+    @staticmethod
+    def fail(job: Job, error: Exception) -> bool:
+        """Records a failed attempt. Returns True when the job was requeued
+        and False when it has failed permanently."""
+        message = error.message if isinstance(error, AppError) else str(error)
+        retryable = (
+            isinstance(error, ExternalServiceError)
+            or not isinstance(error, AppError)
+        )
+
+        job.error = message
+
+        if isinstance(error, ServiceUnavailableError):
+            # The call was refused without being attempted (open circuit);
+            # wait it out without spending one of the job's attempts.
+            job.attempts -= 1
+            job.status = "QUEUED"
+            job.run_after = datetime.utcnow() + timedelta(
+                seconds=error.retry_after or Config.JOB_RETRY_BACKOFF
+            )
+            db.session.commit()
+            return True
+
+        if retryable and job.attempts < job.max_attempts:
+            backoff = Config.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1)
+            job.status = "QUEUED"
+            job.run_after = datetime.utcnow() + timedelta(seconds=backoff)
+            db.session.commit()
+            return True
+
+        job.status = "FAILED"
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return False
+
+
+def _running(job, lease_expired: datetime):
+    """Condition on ``job`` (the model or an alias) for jobs running under a
+    live lease."""
+    return db.and_(job.status == "RUNNING", job.started_at >= lease_expired)
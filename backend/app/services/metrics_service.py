@@ -0,0 +1,338 @@
+import csv
+import io
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import Config
+from app.errors.exceptions import NotFoundError, ValidationError
+from app.extensions import db, response_cache
+from app.models.campaign import Campaign
+from app.models.campaign_metrics import METRICS_ROLLUPS, CampaignMetricsDaily
+from app.models.sync_cursor import SyncCursor
+from app.services.account_service import AccountService
+from app.services.google_ads import GoogleAdsService
+
+# Response cache namespace of metrics reads; bumped after every ingestion.
+METRICS_CACHE = "campaign_metrics"
+
+GRANULARITIES = ("day", "week", "month")
+
+METRIC_COLUMNS = ("impressions", "clicks", "cost_micros", "conversions")
+
+MetricsRow = namedtuple("MetricsRow", ("date",) + METRIC_COLUMNS)
+
+# Per-transaction landing table for COPY; dropped at commit.
+_staging = db.Table(
+    "campaign_metrics_staging",
+    db.MetaData(),
+    db.Column("resource_name", db.Text),
+    db.Column("date", db.Date),
+    db.Column("impressions", db.BigInteger),
+    db.Column("clicks", db.BigInteger),
+    db.Column("cost_micros", db.BigInteger),
+    db.Column("conversions", db.Float),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+
+class MetricsService:
+    @staticmethod
+    def ingest(
+        start: date | None = None,
+        end: date | None = None,
+        min_interval: float | None = None,
+    ) -> dict | None:
+        """Loads daily campaign metrics for the accounts no other process
+        is loading, skipping those loaded less than ``min_interval``
+        seconds ago (``METRICS_INGEST_INTERVAL`` by default), then
+        refreshes the rollups once. Returns None when there was no account
+        to load."""
+        if min_interval is None:
+            min_interval = Config.METRICS_INGEST_INTERVAL
+
+        summaries = AccountService.for_each_account(
+            "campaign-metrics-ingest",
+            lambda google_ads: MetricsService.ingest_customer(
+                google_ads, start, end, refresh=False
+            ),
+            min_interval,
+        )
+        if not summaries:
+            return None
+
+        MetricsService._refresh_rollups()
+        response_cache.bump(METRICS_CACHE)
+
+        return {"accounts": summaries}
+
+    @staticmethod
+    def ingest_customer(
+        google_ads: GoogleAdsService,
+        start: date | None = None,
+        end: date | None = None,
+        refresh: bool = True,
+    ) -> dict:
+        """Streams daily metrics from Google Ads into
+        ``campaign_metrics_daily``.
+
+        Without ``start`` the run resumes from the customer's watermark
+        (the last day loaded) minus ``METRICS_LOOKBACK_DAYS``, so late
+        conversions restate recent days; the first run backfills
+        ``METRICS_BACKFILL_DAYS``. The range is fetched and committed in
+        chunks of ``METRICS_CHUNK_DAYS``, moving the watermark with each,
+        and with ``refresh`` the weekly and monthly rollups are refreshed
+        at the end.
+        """
+        key = f"metrics:{google_ads.customer_id}"
+        cursor = db.session.get(SyncCursor, key)
+
+        end = end or date.today()
+        if start is None:
+            if cursor is not None:
+                start = date.fromisoformat(cursor.value) - timedelta(
+                    days=Config.METRICS_LOOKBACK_DAYS
+                )
+            else:
+                start = end - timedelta(days=Config.METRICS_BACKFILL_DAYS)
+
+        if start > end:
+            raise ValidationError("start must not be after end")
+
+        fetched = 0
+        loaded = 0
+        chunk_start = start
+
+        while chunk_start <= end:
+            chunk_end = min(
+                end, chunk_start + timedelta(days=Config.METRICS_CHUNK_DAYS - 1)
+            )
+            rows = google_ads.campaign_metrics(chunk_start, chunk_end)
+            fetched += len(rows)
+
+            try:
+                MetricsService._ensure_partitions(chunk_start, chunk_end)
+                loaded += MetricsService._load(rows)
+
+                if cursor is None:
+                    cursor = SyncCursor(key=key, value=chunk_end.isoformat())
+                    db.session.add(cursor)
+                elif chunk_end.isoformat() > cursor.value:
+                    cursor.value = chunk_end.isoformat()
+
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
+
+            chunk_start = chunk_end + timedelta(days=1)
+
+        if refresh:
+            MetricsService._refresh_rollups()
+            response_cache.bump(METRICS_CACHE)
+
+        return {
+            "customer_id": google_ads.customer_id,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "fetched": fetched,
+            "loaded": loaded,
+        }
+
+    @staticmethod
+    def campaign_metrics(
+        campaign_id,
+        start: date,
+        end: date,
+        granularity: str = "day",
+    ) -> list:
+        """Metrics of one campaign between ``start`` and ``end``, one row
+        per day, or per week or month (periods overlapping the range, read
+        from the pre-aggregated rollups)."""
+        if granularity not in GRANULARITIES:
+            raise ValidationError(
+                f"granularity must be one of {', '.join(GRANULARITIES)}"
+            )
+
+        if not db.session.get(Campaign, campaign_id):
+            raise NotFoundError("Campaign not found")
+
+        daily = CampaignMetricsDaily
+        postgres = db.session.get_bind().dialect.name == "postgresql"
+
+        if granularity != "day" and postgres:
+            view = METRICS_ROLLUPS[granularity]
+            return db.session.execute(
+                db.select(
+                    view.c.period_start.label("date"),
+                    *(view.c[name] for name in METRIC_COLUMNS),
+                )
+                .where(
+                    view.c.campaign_id == campaign_id,
+                    view.c.period_start
+                    >= db.func.date_trunc(granularity, start).cast(db.Date),
+                    view.c.period_start <= end,
+                )
+                .order_by(view.c.period_start)
+            ).all()
+
+        rows = db.session.execute(
+            db.select(
+                daily.date, *(getattr(daily, name) for name in METRIC_COLUMNS)
+            )
+            .where(
+                daily.campaign_id == campaign_id,
+                daily.date >= start,
+                daily.date <= end,
+            )
+            .order_by(daily.date)
+        ).all()
+
+        if granularity == "day":
+            return rows
+
+        # Databases without the rollup views (SQLite in development).
+        return _rollup(rows, granularity)
+
+    @staticmethod
+    def _ensure_partitions(start: date, end: date):
+        """Creates the monthly partitions covering ``start``..``end``."""
+        if db.session.get_bind().dialect.name != "postgresql":
+            return
+
+        month = start.replace(day=1)
+        while month <= end:
+            following = _next_month(month)
+            db.session.execute(db.text(
+                f"CREATE TABLE IF NOT EXISTS "
+                f"campaign_metrics_daily_{month:%Y%m} "
+                f"PARTITION OF campaign_metrics_daily "
+                f"FOR VALUES FROM ('{month}') TO ('{following}')"
+            ))
+            month = following
+
+    @staticmethod
+    def _load(rows: list[tuple]) -> int:
+        """Upserts metrics rows for the campaigns we know, returning the
+        number of rows inserted or changed.
+
+        On PostgreSQL the rows are COPYed into a temporary staging table
+        and merged with one ``INSERT ... SELECT ... ON CONFLICT DO UPDATE``
+        that skips days whose numbers did not change.
+        """
+        if not rows:
+            return 0
+
+        if db.session.get_bind().dialect.name != "postgresql":
+            return _load_rows(rows)
+
+        connection = db.session.connection()
+        _staging.create(connection)
+
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(
+                "COPY campaign_metrics_staging FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+        table = CampaignMetricsDaily.__table__
+        statement = postgresql.insert(table).from_select(
+            ["campaign_id", "date", *METRIC_COLUMNS, "updated_at"],
+            db.select(
+                Campaign.id,
+                _staging.c.date,
+                *(_staging.c[name] for name in METRIC_COLUMNS),
+                db.func.timezone("utc", db.func.now()),
+            ).join(
+                _staging, _staging.c.resource_name == Campaign.google_campaign_id
+            ),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["campaign_id", "date"],
+            set_={
+                **{name: statement.excluded[name] for name in METRIC_COLUMNS},
+                "updated_at": statement.excluded.updated_at,
+            },
+            where=db.tuple_(*(table.c[name] for name in METRIC_COLUMNS))
+            .is_distinct_from(
+                db.tuple_(*(statement.excluded[name] for name in METRIC_COLUMNS))
+            ),
+        )
+
+        return db.session.execute(statement).rowcount
+
+    @staticmethod
+    def _refresh_rollups():
+        if db.session.get_bind().dialect.name != "postgresql":
+            return
+
+        try:
+            for view in METRICS_ROLLUPS.values():
+                db.session.execute(db.text(
+                    f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view.name}"
+                ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+
+def _load_rows(rows: list[tuple]) -> int:
+    campaign_ids = dict(
+        db.session.execute(
+            db.select(Campaign.google_campaign_id, Campaign.id).where(
+                Campaign.google_campaign_id.in_({row[0] for row in rows})
+            )
+        ).all()
+    )
+
+    records = [
+        {
+            "campaign_id": campaign_ids[resource_name],
+            "date": date.fromisoformat(str(day)),
+            **dict(zip(METRIC_COLUMNS, values)),
+            "updated_at": datetime.utcnow(),
+        }
+        for resource_name, day, *values in rows
+        if resource_name in campaign_ids
+    ]
+    if not records:
+        return 0
+
+    statement = sqlite.insert(CampaignMetricsDaily.__table__)
+    statement = statement.on_conflict_do_update(
+        index_elements=["campaign_id", "date"],
+        set_={
+            name: statement.excluded[name]
+            for name in (*METRIC_COLUMNS, "updated_at")
+        },
+    )
+    db.session.execute(statement, records)
+    return len(records)
+
+
+def _rollup(rows, granularity: str) -> list[MetricsRow]:
+    periods = {}
+    for row in rows:
+        if granularity == "week":
+            start = row.date - timedelta(days=row.date.weekday())
+        else:
+            start = row.date.replace(day=1)
+        totals = periods.setdefault(start, [0] * len(METRIC_COLUMNS))
+        for index, name in enumerate(METRIC_COLUMNS):
+            totals[index] += getattr(row, name)
+
+    return [MetricsRow(start, *totals) for start, totals in sorted(periods.items())]
+
+
+def _next_month(month: date) -> date:
+    return (month + timedelta(days=32)).replace(day=1)
@@ -0,0 +1,180 @@
+import hashlib
+import math
+import time
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import Config
+from app.errors.exceptions import RateLimitedError
+from app.extensions import db
+from app.models.ads_rate_bucket import AdsRateBucket
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Bucket rows already created by this process.
+_seeded = set()
+
+
+class QuotaService:
+    """Token-bucket limits on Google Ads mutate operations.
+
+    Every request is charged its number of ``MutateOperation``s against two
+    buckets: the customer account's and the developer token's (the daily
+    operations quota, refilled evenly over the day). Buckets live in
+    Postgres so every worker process draws from the same balance; each
+    acquisition is a single conditional ``UPDATE ... RETURNING`` per bucket,
+    so no locks are held while waiting.
+
+    ``BULK`` callers must leave ``ADS_QUOTA_RESERVED_FRACTION`` of each
+    bucket untouched, which keeps headroom for ``INTERACTIVE`` calls (a
+    user pausing a campaign) while a bulk publish is draining the quota.
+    """
+
+    @staticmethod
+    def acquire(customer_id: str, cost: int, priority: str = INTERACTIVE):
+        """Takes ``cost`` tokens from every bucket ``customer_id`` draws on,
+        waiting up to ``ADS_QUOTA_MAX_WAIT`` seconds for them to refill.
+        Raises ``RateLimitedError`` when they would not refill in time."""
+        buckets = QuotaService._buckets(customer_id)
+        deadline = time.monotonic() + Config.ADS_QUOTA_MAX_WAIT
+
+        while True:
+            wait = QuotaService._try_acquire(buckets, cost, priority)
+            if wait <= 0:
+                return
+
+            if time.monotonic() + wait > deadline:
+                raise RateLimitedError(
+                    "Google Ads operation quota exhausted, retry later",
+                    retry_after=math.ceil(wait),
+                )
+
+            time.sleep(wait)
+
+    @staticmethod
+    def status() -> list[dict]:
+        """Current balance of every bucket, refilled up to now."""
+        now = time.time()
+        buckets = db.session.execute(
+            db.select(AdsRateBucket).order_by(AdsRateBucket.key)
+        ).scalars()
+
+        return [
+            {
+                "key": bucket.key,
+                "capacity": bucket.capacity,
+                "refill_rate": bucket.refill_rate,
+                "tokens": round(
+                    min(
+                        bucket.capacity,
+                        bucket.tokens
+                        + bucket.refill_rate * (now - bucket.refilled_at),
+                    ),
+                    2,
+                ),
+                "reserved": bucket.capacity * Config.ADS_QUOTA_RESERVED_FRACTION,
+            }
+            for bucket in buckets
+        ]
+
+    @staticmethod
+    def _buckets(customer_id: str) -> list[tuple[str, float, float]]:
+        """(key, capacity, refill rate per second) of each bucket a call
+        for ``customer_id`` is charged against."""
+        # The developer token is a credential; key its bucket by a digest.
+        token_digest = hashlib.sha256(
+            (Config.GOOGLE_ADS_DEVELOPER_TOKEN or "").encode()
+        ).hexdigest()[:16]
+
+        return [
+            (
+                f"customer:{customer_id}",
+                float(Config.ADS_QUOTA_CUSTOMER_BURST),
+                Config.ADS_QUOTA_CUSTOMER_OPS_PER_SECOND,
+            ),
+            (
+                f"developer_token:{token_digest}",
+                float(Config.ADS_QUOTA_DAILY_OPERATIONS),
+                Config.ADS_QUOTA_DAILY_OPERATIONS / 86400,
+            ),
+        ]
+
+    @staticmethod
+    def _try_acquire(buckets, cost: int, priority: str) -> float:
+        """Charges every bucket in one transaction. Returns 0 on success,
+        otherwise the seconds until the emptiest bucket can cover ``cost``
+        (nothing is charged)."""
+        fraction = Config.ADS_QUOTA_RESERVED_FRACTION if priority == BULK else 0
+        bucket = AdsRateBucket.__table__.c
+        now = time.time()
+
+        with db.engine.connect() as conn:
+            QuotaService._seed(conn, buckets, now)
+
+            for key, capacity, rate in buckets:
+                reserve = capacity * fraction
+                # A request bigger than the bucket waits for a full one.
+                charge = min(cost, capacity - reserve)
+
+                refilled = bucket.tokens + bucket.refill_rate * (
+                    now - bucket.refilled_at
+                )
+                balance = db.case(
+                    (refilled > bucket.capacity, bucket.capacity),
+                    else_=refilled,
+                )
+
+                row = conn.execute(
+                    db.update(AdsRateBucket.__table__)
+                    .where(bucket.key == key, balance - charge >= reserve)
+                    .values(
+                        tokens=balance - charge,
+                        refilled_at=now,
+                        capacity=capacity,
+                        refill_rate=rate,
+                    )
+                    .returning(bucket.tokens)
+                ).first()
+
+                if row is None:
+                    conn.rollback()
+                    current = conn.execute(
+                        db.select(balance).where(bucket.key == key)
+                    ).scalar()
+                    if current is None:
+                        # The row was deleted after this process seeded
+                        # it; seed it again and retry.
+                        _seeded.discard(key)
+                        break
+                    return max((charge + reserve - current) / rate, 0.01)
+            else:
+                conn.commit()
+                return 0
+
+        return QuotaService._try_acquire(buckets, cost, priority)
+
+    @staticmethod
+    def _seed(conn, buckets, now: float):
+        missing = [key for key, _, _ in buckets if key not in _seeded]
+        if not missing:
+            return
+
+        dialect = postgresql if conn.dialect.name == "postgresql" else sqlite
+        conn.execute(
+            dialect.insert(AdsRateBucket.__table__)
+            .values([
+                {
+                    "key": key,
+                    "capacity": capacity,
+                    "refill_rate": rate,
+                    "tokens": capacity,
+                    "refilled_at": now,
+                }
+                for key, capacity, rate in buckets
+                if key in missing
+            ])
+            .on_conflict_do_nothing(index_elements=["key"])
+        )
+        conn.commit()
+        _seeded.update(missing)
@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from app.config import Config
+from app.errors.exceptions import ExternalServiceError
+from app.events import campaign_events
+from app.extensions import db, response_cache
+from app.models.campaign import Campaign
+from app.models.job import Job
+from app.services.account_service import AccountService
+from app.services.campaign_service import CAMPAIGNS_CACHE, remote_campaign_name
+from app.services.change_log_service import ChangeLogService
+
+
+class ReconcileService:
+    @staticmethod
+    def reconcile(limit: int | None = None) -> dict:
+        """Settles publishes whose outcome was never recorded.
+
+        Candidates are campaigns with ``publish_started_at`` set, no Google
+        Ads id and no queued or running job, whose publish started over
+        ``RECONCILE_GRACE_SECONDS`` ago: a worker died mid-publish, a
+        commit failed after the remote create, or a batch request failed
+        in flight. Their deterministic remote names are looked up with one
+        GAQL query per account; matches become PUBLISHED with the remote
+        id, the rest go back to DRAFT. Campaigns of an account that could
+        not be queried are left for the next run. Rows are updated in one
+        executemany that only touches rows still in the state that was
+        read, so a publish started meanwhile is left alone.
+        """
+        limit = limit or Config.RECONCILE_BATCH_SIZE
+        cutoff = datetime.utcnow() - timedelta(
+            seconds=Config.RECONCILE_GRACE_SECONDS
+        )
+
+        active_job = (
+            db.select(Job.id)
+            .where(
+                Job.campaign_id == Campaign.id,
+                Job.status.in_(("QUEUED", "RUNNING")),
+            )
+            .exists()
+        )
+
+        candidates = db.session.execute(
+            db.select(
+                Campaign.id,
+                Campaign.name,
+                Campaign.customer_id,
+                Campaign.status,
+                Campaign.publish_started_at,
+            )
+            .where(
+                Campaign.publish_started_at < cutoff,
+                Campaign.google_campaign_id.is_(None),
+                Campaign.status.in_(("PUBLISHING", "DRAFT")),
+                ~active_job,
+            )
+            .order_by(Campaign.publish_started_at)
+            .limit(limit)
+        ).all()
+        db.session.rollback()
+
+        if not candidates:
+            return {"checked": 0, "published": 0, "reverted": 0}
+
+        names = {
+            row.id: remote_campaign_name(row.name, row.id) for row in candidates
+        }
+        by_customer = {}
+        for row in candidates:
+            by_customer.setdefault(row.customer_id, []).append(names[row.id])
+
+        remote = {}
+        checked = set()
+        for customer_id, customer_names in by_customer.items():
+            try:
+                remote.update(
+                    AccountService.google_ads(customer_id)
+                    .find_campaigns_by_name(customer_names)
+                )
+            except ExternalServiceError as ex:
+                current_app.logger.warning(
+                    "Reconciler could not check customer %s: %s",
+                    customer_id, ex.message,
+                )
+                continue
+            checked.add(customer_id)
+
+        candidates = [row for row in candidates if row.customer_id in checked]
+        if not candidates:
+            return {"checked": 0, "published": 0, "reverted": 0}
+
+        table = Campaign.__table__
+        statement = (
+            db.update(table)
+            .where(
+                table.c.id == db.bindparam("b_id"),
+                table.c.status == db.bindparam("b_status"),
+                table.c.publish_started_at == db.bindparam("b_started_at"),
+                table.c.google_campaign_id.is_(None),
+            )
+            .values(
+                status=db.bindparam("new_status"),
+                google_campaign_id=db.bindparam("new_google_campaign_id"),
+                publish_started_at=None,
+            )
+        )
+
+        params = []
+        published = 0
+        for row in candidates:
+            resource_name = remote.get(names[row.id])
+            published += resource_name is not None
+            params.append({
+                "b_id": row.id,
+                "b_status": row.status,
+                "b_started_at": row.publish_started_at,
+                "new_status": "PUBLISHED" if resource_name else "DRAFT",
+                "new_google_campaign_id": resource_name,
+            })
+
+        try:
+            db.session.execute(statement, params)
+            ChangeLogService.record([row.id for row in candidates])
+            campaign_events.publish_current([row.id for row in candidates])
+            db.session.commit()
+            response_cache.bump(CAMPAIGNS_CACHE)
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {
+            "checked": len(candidates),
+            "published": published,
+            "reverted": len(candidates) - published,
+        }
@@ -0,0 +1,130 @@
+import random
+import threading
+import time
+
+from app.metrics import CIRCUIT_BREAKER_STATE
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter.
+
+    Attempt ``n`` sleeps a random time in ``[0, min(max_delay, base_delay *
+    2 ** (n - 1))]`` so that callers failing together don't retry together.
+    ``deadline`` bounds the total time spent on one call, sleeps included.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        deadline: float,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        delay = random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+        # A server-provided delay is a floor, not a suggestion.
+        return max(delay, retry_after or 0)
+
+    def should_retry(self, attempt: int, started: float, delay: float) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        return time.monotonic() - started + delay < self.deadline
+
+
+class CircuitBreaker:
+    """Per-process circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow`` refuses calls for ``reset_timeout`` seconds. It then lets a
+    single trial call through (half-open): success closes the circuit,
+    failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._stats = {"opened": 0, "rejected": 0}
+        CIRCUIT_BREAKER_STATE.labels(name).set(0)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self._stats["rejected"] += 1
+                    return False
+                self._set_state(self.HALF_OPEN)
+
+            if self._state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    self._stats["rejected"] += 1
+                    return False
+                self._trial_in_flight = True
+
+            return True
+
+    def retry_after(self) -> int:
+        """Seconds until the circuit will let a trial call through."""
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            return max(1, int(remaining + 0.999))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if (
+                self._state == self.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._stats["opened"] += 1
+                self._set_state(self.OPEN)
+
+    def release(self):
+        """Ends a call that says nothing about the service's health (it
+        failed before reaching it), freeing the half-open trial slot."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "failure_threshold": self.failure_threshold,
+                "reset_timeout": self.reset_timeout,
+                **self._stats,
+            }
+
+    def _set_state(self, state: str):
+        self._state = state
+        CIRCUIT_BREAKER_STATE.labels(self.name).set(self._STATE_VALUES[state])
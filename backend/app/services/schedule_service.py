@@ -0,0 +1,334 @@
+from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from flask import current_app
+
+from app.config import Config
+from app.errors.exceptions import ExternalServiceError, RateLimitedError
+from app.events import campaign_events, status_delta
+from app.extensions import db, response_cache
+from app.models.campaign import Campaign
+from app.services.account_service import AccountService
+from app.services.campaign_service import CAMPAIGNS_CACHE
+from app.services.change_log_service import ChangeLogService
+from app.services.quota_service import BULK
+
+LAUNCH = "launch"
+END = "end"
+
+# Action -> (status a campaign must have, status it is claimed with while
+# Google Ads is called, status it is moved to locally and in Google Ads,
+# status it is left in once SCHEDULER_MAX_ATTEMPTS attempts have failed).
+ACTIONS = {
+    LAUNCH: ("PUBLISHED", "LAUNCHING", "ENABLED", "LAUNCH_FAILED"),
+    END: ("ENABLED", "ENDING", "PAUSED", "END_FAILED"),
+}
+
+def schedule_zone() -> ZoneInfo:
+    return ZoneInfo(Config.SCHEDULE_TIMEZONE)
+
+
+def local_date(timestamp: float) -> date:
+    """The date in ``SCHEDULE_TIMEZONE`` at ``timestamp`` (epoch seconds)."""
+    return datetime.fromtimestamp(timestamp, schedule_zone()).date()
+
+
+def launch_grace_start(today: date) -> date:
+    """The earliest start date still launched on ``today``."""
+    return today - timedelta(days=Config.SCHEDULE_LAUNCH_GRACE_DAYS)
+
+
+def day_start(day: date) -> float:
+    """Epoch seconds of midnight starting ``day`` in ``SCHEDULE_TIMEZONE``."""
+    return datetime.combine(day, time.min, tzinfo=schedule_zone()).timestamp()
+
+
+class ScheduleService:
+    @staticmethod
+    def upcoming(now: float, until: float) -> list[tuple]:
+        """``(campaign id, action, deadline)`` of every launch and end due
+        by ``until`` (epoch seconds), overdue ones included.
+
+        A campaign launches at the start of its ``start_date`` and ends
+        after its ``end_date``; one whose last attempt failed is due again
+        at its ``schedule_retry_at``, and one left claimed by a scheduler
+        that stopped mid-switch once its claim lease has run out. Launches
+        overdue by more than ``SCHEDULE_LAUNCH_GRACE_DAYS`` are left alone:
+        a campaign whose start date passed long before it was published,
+        or before the scheduler first ran, is not enabled behind its
+        owner's back. Each query is a range scan of a ``(status, date)``
+        index; launched and ended campaigns change status and drop out of
+        it.
+        """
+        today, last_day = local_date(now), local_date(until)
+        retry_by = db.or_(
+            Campaign.schedule_retry_at.is_(None),
+            Campaign.schedule_retry_at <= _utc(until),
+        )
+
+        launches = db.session.execute(
+            db.select(
+                Campaign.id, Campaign.start_date, Campaign.schedule_retry_at
+            ).where(
+                Campaign.status.in_(ACTIONS[LAUNCH][:2]),
+                Campaign.start_date >= launch_grace_start(today),
+                Campaign.start_date <= last_day,
+                db.or_(Campaign.end_date.is_(None), Campaign.end_date >= today),
+                retry_by,
+            )
+        ).all()
+        ends = db.session.execute(
+            db.select(
+                Campaign.id, Campaign.end_date, Campaign.schedule_retry_at
+            ).where(
+                Campaign.status.in_(ACTIONS[END][:2]),
+                Campaign.end_date < last_day,
+                retry_by,
+            )
+        ).all()
+        db.session.rollback()
+
+        return [
+            (campaign_id, LAUNCH, _deadline(day_start(start_date), retry_at))
+            for campaign_id, start_date, retry_at in launches
+        ] + [
+            (
+                campaign_id,
+                END,
+                _deadline(day_start(end_date + timedelta(days=1)), retry_at),
+            )
+            for campaign_id, end_date, retry_at in ends
+        ]
+
+    @staticmethod
+    def apply(action: str, campaign_ids) -> dict:
+        """Launches or ends the given campaigns that are due now.
+
+        Campaigns are claimed ``SCHEDULER_BATCH_SIZE`` at a time: the due
+        rows are selected ``FOR UPDATE SKIP LOCKED``, rechecked against
+        today's date and their status, moved to ``LAUNCHING``/``ENDING``
+        and committed, so no row lock is held while Google Ads is called
+        and a pause requested meanwhile is refused instead of waiting.
+        Each account's campaigns are then switched with partial-failure
+        ``mutate_campaigns`` requests of up to
+        ``GOOGLE_ADS_MAX_OPERATIONS_PER_REQUEST`` operations, drawn from
+        the ``BULK`` operation quota.
+
+        Accepted switches are written back. Failed ones go back to their
+        previous status, due again after an exponential backoff, and to
+        ``LAUNCH_FAILED``/``END_FAILED`` after ``SCHEDULER_MAX_ATTEMPTS``
+        attempts; ones deferred for lack of quota don't use an attempt.
+        """
+        campaign_ids = sorted(set(campaign_ids))
+        summary = {"updated": 0, "failed": 0}
+
+        for start in range(0, len(campaign_ids), Config.SCHEDULER_BATCH_SIZE):
+            batch = campaign_ids[start:start + Config.SCHEDULER_BATCH_SIZE]
+            try:
+                updated, failed = _apply_batch(action, batch)
+            except Exception:
+                db.session.rollback()
+                raise
+            summary["updated"] += updated
+            summary["failed"] += failed
+
+        return summary
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before a switch that has failed ``attempts`` times is due
+    again."""
+    return min(
+        Config.SCHEDULER_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+        Config.SCHEDULER_RETRY_MAX_DELAY,
+    )
+
+
+def _utc(timestamp: float) -> datetime:
+    """Naive UTC datetime of ``timestamp``, as the columns store it."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def _deadline(due: float, retry_at: datetime | None) -> float:
+    if retry_at is None:
+        return due
+    return max(due, retry_at.replace(tzinfo=timezone.utc).timestamp())
+
+
+def _due(action: str, today: date, now: datetime) -> list:
+    required, claimed, _, _ = ACTIONS[action]
+    conditions = [
+        # Claimed rows are due again only once their claim lease ran out.
+        Campaign.status.in_((required, claimed)),
+        db.or_(
+            Campaign.schedule_retry_at.is_(None),
+            Campaign.schedule_retry_at <= now,
+        ),
+        Campaign.google_campaign_id.isnot(None),
+    ]
+    if action == LAUNCH:
+        conditions += [
+            Campaign.start_date >= launch_grace_start(today),
+            Campaign.start_date <= today,
+            db.or_(Campaign.end_date.is_(None), Campaign.end_date >= today),
+        ]
+    else:
+        conditions.append(Campaign.end_date < today)
+    return conditions
+
+
+def _claim(action: str, campaign_ids: list) -> list:
+    """Moves the due campaigns among ``campaign_ids`` to the action's
+    intermediate status for ``SCHEDULER_CLAIM_LEASE`` seconds, commits and
+    returns them."""
+    _, claimed, _, _ = ACTIONS[action]
+    timestamp = datetime.now(timezone.utc).timestamp()
+    now = _utc(timestamp)
+
+    rows = db.session.execute(
+        db.select(
+            Campaign.id,
+            Campaign.customer_id,
+            Campaign.google_campaign_id,
+            Campaign.schedule_attempts,
+        )
+        .where(
+            Campaign.id.in_(campaign_ids),
+            *_due(action, local_date(timestamp), now),
+        )
+        .order_by(Campaign.id)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+    if rows:
+        ids = [row.id for row in rows]
+        db.session.execute(
+            db.update(Campaign)
+            .where(Campaign.id.in_(ids))
+            .values(
+                status=claimed,
+                schedule_retry_at=now + timedelta(
+                    seconds=Config.SCHEDULER_CLAIM_LEASE
+                ),
+            )
+        )
+        ChangeLogService.record(ids)
+        campaign_events.publish([
+            status_delta(row.id, claimed, row.google_campaign_id)
+            for row in rows
+        ])
+    db.session.commit()
+
+    if rows:
+        response_cache.bump(CAMPAIGNS_CACHE)
+    return rows
+
+
+def _apply_batch(action: str, campaign_ids: list) -> tuple[int, int]:
+    required, claimed, new_status, failed_status = ACTIONS[action]
+    rows = _claim(action, campaign_ids)
+    if not rows:
+        return 0, 0
+
+    by_customer = {}
+    for row in rows:
+        by_customer.setdefault(row.customer_id, []).append(row)
+
+    done = []
+    # (row, attempts, seconds until due again) of the switches not made.
+    retries = []
+    size = Config.GOOGLE_ADS_MAX_OPERATIONS_PER_REQUEST
+
+    for customer_id, customer_rows in by_customer.items():
+        for start in range(0, len(customer_rows), size):
+            chunk = customer_rows[start:start + size]
+            try:
+                errors = AccountService.google_ads(
+                    customer_id, BULK
+                ).set_campaign_statuses(
+                    [row.google_campaign_id for row in chunk],
+                    enabled=new_status == "ENABLED",
+                )
+            except RateLimitedError as ex:
+                current_app.logger.warning(
+                    "Scheduled %s of %s campaigns of customer %s deferred: %s",
+                    action, len(chunk), customer_id, ex.message,
+                )
+                retries += [
+                    (row, row.schedule_attempts, ex.retry_after or 0)
+                    for row in chunk
+                ]
+                continue
+            except ExternalServiceError as ex:
+                current_app.logger.warning(
+                    "Scheduled %s of %s campaigns of customer %s failed: %s",
+                    action, len(chunk), customer_id, ex.message,
+                )
+                errors = [[ex.message]] * len(chunk)
+
+            for row, row_errors in zip(chunk, errors):
+                if not row_errors:
+                    done.append(row)
+                    continue
+                current_app.logger.warning(
+                    "Scheduled %s of campaign %s failed: %s",
+                    action, row.id, " | ".join(row_errors),
+                )
+                attempts = row.schedule_attempts + 1
+                retries.append((row, attempts, retry_delay(attempts)))
+
+    # Only rows still claimed are written, in case a claim outlived its
+    # lease and was taken over.
+    table = Campaign.__table__
+    now = datetime.utcnow()
+
+    if done:
+        db.session.execute(
+            db.update(table)
+            .where(
+                table.c.id.in_([row.id for row in done]),
+                table.c.status == claimed,
+            )
+            .values(
+                status=new_status,
+                remote_status=new_status,
+                schedule_attempts=0,
+                schedule_retry_at=None,
+            )
+        )
+    if retries:
+        db.session.execute(
+            db.update(table)
+            .where(
+                table.c.id == db.bindparam("b_id"),
+                table.c.status == claimed,
+            )
+            .values(
+                status=db.bindparam("new_status"),
+                schedule_attempts=db.bindparam("new_attempts"),
+                schedule_retry_at=db.bindparam("new_retry_at"),
+            ),
+            [
+                {
+                    "b_id": row.id,
+                    "new_attempts": attempts,
+                    **(
+                        {"new_status": failed_status, "new_retry_at": None}
+                        if attempts >= Config.SCHEDULER_MAX_ATTEMPTS
+                        else {
+                            "new_status": required,
+                            "new_retry_at": now + timedelta(seconds=delay),
+                        }
+                    ),
+                }
+                for row, attempts, delay in retries
+            ],
+        )
+
+    ids = [row.id for row in rows]
+    ChangeLogService.record(ids)
+    campaign_events.publish_current(ids)
+    db.session.commit()
+
+    response_cache.bump(CAMPAIGNS_CACHE)
+    return len(done), len(rows) - len(done)
@@ -0,0 +1,280 @@
+from datetime import datetime, timedelta
+
+from app.config import Config
+from app.events import campaign_events, status_delta
+from app.extensions import db, response_cache
+from app.models.campaign import Campaign
+from app.models.sync_cursor import SyncCursor
+from app.services.account_service import AccountService
+from app.services.campaign_service import CAMPAIGNS_CACHE
+from app.services.change_log_service import ChangeLogService
+from app.services.google_ads import GoogleAdsService
+
+# change_status only covers the last 90 days.
+CHANGE_STATUS_MAX_DAYS = 90
+
+CHANGE_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# change_status times are in the account's time zone, which we don't know;
+# a day either side of UTC covers every zone.
+TIME_ZONE_MARGIN = timedelta(days=1)
+
+
+class SyncService:
+    @staticmethod
+    def sync(min_interval: float | None = None) -> dict | None:
+        """Pulls status, serving status and budget from Google Ads for the
+        accounts no other process is syncing, skipping those synced less
+        than ``min_interval`` seconds ago (``STATUS_SYNC_INTERVAL`` by
+        default). Returns None when there was no account to sync."""
+        if min_interval is None:
+            min_interval = Config.STATUS_SYNC_INTERVAL
+
+        summaries = AccountService.for_each_account(
+            "campaign-status-sync", SyncService.sync_customer, min_interval
+        )
+        return {"accounts": summaries} if summaries else None
+
+    @staticmethod
+    def sync_customer(google_ads: GoogleAdsService) -> dict:
+        """Brings local campaigns in line with one customer account.
+
+        The account's ``change_status`` is read from the stored cursor to
+        find campaigns (and budgets) modified since the last run, and only
+        those and the ones whose local status has drifted from their remote
+        status are fetched, with a single streamed GAQL query. A full read
+        of the account replaces both steps on the first run, when the
+        cursor has fallen out of change_status' 90 day window, or when too
+        much changed for an incremental pass.
+        """
+        key = f"change_status:{google_ads.customer_id}"
+        cursor = db.session.get(SyncCursor, key)
+
+        now = datetime.utcnow()
+        until = (now + TIME_ZONE_MARGIN).strftime(CHANGE_TIME_FORMAT)
+        oldest = (
+            now - timedelta(days=CHANGE_STATUS_MAX_DAYS) + TIME_ZONE_MARGIN
+        ).strftime(CHANGE_TIME_FORMAT)
+        # Everything before this is known to have been read once the pass
+        # completes.
+        settled = (now - TIME_ZONE_MARGIN).strftime(CHANGE_TIME_FORMAT)
+
+        resource_names = None
+        new_cursor = settled
+
+        if cursor is not None and cursor.value >= oldest:
+            changes = google_ads.changed_campaigns(
+                cursor.value, until, Config.STATUS_SYNC_CHANGE_LIMIT
+            )
+            if not changes["truncated"]:
+                resource_names = SyncService._local_resource_names(
+                    changes["campaigns"], changes["budgets"]
+                ) | SyncService._drifted_resource_names(google_ads.customer_id)
+                new_cursor = max(changes["latest"] or settled, settled)
+                if len(resource_names) > Config.STATUS_SYNC_MAX_INCREMENTAL:
+                    resource_names = None
+
+        states = google_ads.campaign_states(
+            sorted(resource_names) if resource_names is not None else None
+        )
+
+        try:
+            updated = SyncService._apply(states)
+
+            if cursor is None:
+                cursor = SyncCursor(key=key, value=new_cursor)
+                db.session.add(cursor)
+            else:
+                cursor.value = new_cursor
+
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        if updated:
+            response_cache.bump(CAMPAIGNS_CACHE)
+
+        return {
+            "customer_id": google_ads.customer_id,
+            "mode": "full" if resource_names is None else "incremental",
+            "fetched": len(states),
+            "updated": updated,
+        }
+
+    @staticmethod
+    def _local_resource_names(campaigns: set, budgets: set) -> set:
+        """Our campaigns among those changed, plus the campaigns whose
+        budget changed."""
+        conditions = []
+        if campaigns:
+            conditions.append(Campaign.google_campaign_id.in_(campaigns))
+        if budgets:
+            conditions.append(Campaign.google_budget_id.in_(budgets))
+        if not conditions:
+            return set()
+
+        return set(
+            db.session.execute(
+                db.select(Campaign.google_campaign_id).where(db.or_(*conditions))
+            ).scalars()
+        )
+
+    @staticmethod
+    def _drifted_resource_names(customer_id: str) -> set:
+        """The account's campaigns whose local status disagrees with the
+        remote status last read (a sync that ran during a publish or pause,
+        a failed pause that restored the previous status), so they are
+        read again although nothing changed remotely."""
+        c = Campaign.__table__.c
+        return set(
+            db.session.execute(
+                db.select(c.google_campaign_id).where(
+                    c.google_campaign_id.startswith(f"customers/{customer_id}/"),
+                    c.remote_status.isnot(None),
+                    c.status.is_distinct_from(
+                        _status_from_remote(c, c.remote_status)
+                    ),
+                )
+            ).scalars()
+        )
+
+    @staticmethod
+    def _apply(states: list[dict]) -> int:
+        """Writes remote state onto the matching campaigns, publishes
+        their status deltas and returns how many rows changed.
+
+        On PostgreSQL each chunk is a single ``UPDATE ... FROM (VALUES
+        ...)`` joined on ``google_campaign_id`` that returns the changed
+        rows; rows whose state already matches are filtered out in the
+        WHERE clause, so they are neither written nor locked. Other
+        databases run the same statement as an executemany and read the
+        changed rows back.
+        """
+        rows = [
+            {
+                "resource_name": state["resource_name"],
+                "remote_status": state["status"],
+                "serving_status": state["serving_status"],
+                "google_budget_id": state["budget_resource_name"] or None,
+                "daily_budget": round(state["budget_micros"] / 1_000_000),
+            }
+            for state in states
+        ]
+        if not rows:
+            return 0
+
+        now = datetime.utcnow()
+        updated = []
+        postgres = db.session.get_bind().dialect.name == "postgresql"
+
+        for start in range(0, len(rows), Config.STATUS_SYNC_BATCH_SIZE):
+            chunk = rows[start:start + Config.STATUS_SYNC_BATCH_SIZE]
+
+            if postgres:
+                remote = db.values(
+                    db.column("resource_name", db.String),
+                    db.column("remote_status", db.String),
+                    db.column("serving_status", db.String),
+                    db.column("google_budget_id", db.String),
+                    db.column("daily_budget", db.Integer),
+                    name="remote",
+                ).data([tuple(row.values()) for row in chunk])
+                changed = db.session.execute(
+                    _sync_statement(remote.c, now).returning(
+                        Campaign.__table__.c.id,
+                        Campaign.__table__.c.status,
+                        Campaign.__table__.c.google_campaign_id,
+                    )
+                ).all()
+            else:
+                params = {name: db.bindparam(f"b_{name}") for name in chunk[0]}
+                db.session.execute(
+                    _sync_statement(params, now),
+                    [
+                        {f"b_{name}": value for name, value in row.items()}
+                        for row in chunk
+                    ],
+                )
+                changed = db.session.execute(
+                    db.select(
+                        Campaign.id, Campaign.status, Campaign.google_campaign_id
+                    ).where(
+                        Campaign.google_campaign_id.in_(
+                            [row["resource_name"] for row in chunk]
+                        ),
+                        Campaign.synced_at == now,
+                    )
+                ).all()
+
+            updated.extend(changed)
+
+        # Versioned once every chunk holds its row locks (see
+        # ChangeLogService.record).
+        ChangeLogService.record([row.id for row in updated])
+        campaign_events.publish([status_delta(*row) for row in updated])
+
+        return len(updated)
+
+
+def _status_from_remote(c, remote_status):
+    """The local status a campaign should have given its remote status.
+
+    In-flight local operations keep their status; otherwise the remote
+    status wins, except that a campaign created paused and never enabled
+    stays PUBLISHED, and one whose scheduled end was given up stays
+    END_FAILED while it is still enabled.
+    """
+    return db.case(
+        # Plain comparisons rather than IN, whose expanding parameters
+        # can't be used in the executemany of _apply.
+        (
+            db.or_(*(
+                c.status == status
+                for status in ("PUBLISHING", "PAUSING", "LAUNCHING", "ENDING")
+            )),
+            c.status,
+        ),
+        (remote_status == "REMOVED", "REMOVED"),
+        (db.and_(remote_status == "ENABLED", c.status == "END_FAILED"), c.status),
+        (remote_status == "ENABLED", "ENABLED"),
+        (
+            db.and_(
+                remote_status == "PAUSED",
+                db.or_(c.status == "ENABLED", c.status == "END_FAILED"),
+            ),
+            "PAUSED",
+        ),
+        else_=c.status,
+    )
+
+
+def _sync_statement(remote, now: datetime):
+    """UPDATE of campaigns from ``remote`` columns (a VALUES alias or bind
+    parameters), limited to rows whose remote state differs or whose
+    local status has drifted from it."""
+    table = Campaign.__table__
+    c = table.c
+    status = _status_from_remote(c, remote["remote_status"])
+
+    return (
+        db.update(table)
+        .where(
+            c.google_campaign_id == remote["resource_name"],
+            db.or_(
+                c.status.is_distinct_from(status),
+                c.remote_status.is_distinct_from(remote["remote_status"]),
+                c.serving_status.is_distinct_from(remote["serving_status"]),
+                c.google_budget_id.is_distinct_from(remote["google_budget_id"]),
+                c.daily_budget.is_distinct_from(remote["daily_budget"]),
+            ),
+        )
+        .values(
+            status=status,
+            remote_status=remote["remote_status"],
+            serving_status=remote["serving_status"],
+            google_budget_id=remote["google_budget_id"],
+            daily_budget=remote["daily_budget"],
+            synced_at=now,
+        )
+    )
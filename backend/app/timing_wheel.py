@@ -0,0 +1,102 @@
+import math
+
+
+class TimingWheel:
+    """Hierarchical timing wheel of keyed deadlines.
+
+    Level 0 has one slot per ``tick`` seconds; each slot of level ``i``
+    covers a full turn of level ``i - 1``. An entry goes into the lowest
+    level whose current turn contains its deadline, and moves down a level
+    each time its slot comes round, so scheduling and cancelling are O(1)
+    and ``advance`` only touches the slots it passes. Deadlines past the
+    top level's turn wait in an overflow set that is sorted back in once
+    per top-level turn. Scheduling a key again replaces its deadline.
+    Not thread-safe.
+    """
+
+    def __init__(self, now: float, tick: float = 1.0, levels=(60, 60, 24)):
+        self._tick = tick
+        self._sizes = tuple(levels)
+        # Ticks covered by one slot of each level, and by the whole wheel.
+        self._widths = [math.prod(self._sizes[:i]) for i in range(len(levels))]
+        self._span = math.prod(self._sizes)
+
+        self._wheels = [[{} for _ in range(size)] for size in self._sizes]
+        self._overflow = {}
+        self._ready = {}
+        # key -> the slot (dict of key -> deadline tick) holding it.
+        self._slots = {}
+        # Next tick to expire.
+        self._current = math.floor(now / tick)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key) -> bool:
+        return key in self._slots
+
+    def schedule(self, key, deadline: float):
+        """Expires ``key`` on the first ``advance`` at or after
+        ``deadline`` (seconds, like ``now``)."""
+        self.cancel(key)
+        self._place(key, math.ceil(deadline / self._tick))
+
+    def cancel(self, key):
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            del slot[key]
+
+    def advance(self, now: float) -> list:
+        """Moves the wheel to ``now`` and returns the keys that expired,
+        oldest deadline first."""
+        target = math.floor(now / self._tick)
+        expired = self._take(self._ready)
+
+        while self._current <= target:
+            if not self._slots:
+                self._current = target + 1
+                break
+
+            tick = self._current
+            if tick % self._span == 0:
+                for key, deadline in self._take(self._overflow).items():
+                    self._place(key, deadline)
+
+            # Highest level first: its entries may land in a lower slot that
+            # is cascaded (or expired) in this same tick.
+            for level in range(len(self._sizes) - 1, 0, -1):
+                if tick % self._widths[level] == 0:
+                    slot = self._wheels[level][
+                        tick // self._widths[level] % self._sizes[level]
+                    ]
+                    for key, deadline in self._take(slot).items():
+                        self._place(key, deadline)
+
+            expired.update(self._take(self._wheels[0][tick % self._sizes[0]]))
+            self._current += 1
+
+        return sorted(expired, key=expired.get)
+
+    def _place(self, key, deadline: int):
+        if deadline < self._current:
+            slot = self._ready
+        elif deadline // self._span != self._current // self._span:
+            slot = self._overflow
+        else:
+            for level in range(len(self._sizes)):
+                turn = self._widths[level] * self._sizes[level]
+                if deadline // turn == self._current // turn:
+                    break
+            slot = self._wheels[level][
+                deadline // self._widths[level] % self._sizes[level]
+            ]
+
+        slot[key] = deadline
+        self._slots[key] = slot
+
+    def _take(self, slot: dict) -> dict:
+        entries = dict(slot)
+        slot.clear()
+        for key in entries:
+            del self._slots[key]
+        return entries
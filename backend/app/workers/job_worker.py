@@ -0,0 +1,206 @@
+import multiprocessing
+import signal
+import threading
+import time
+import uuid
+
+from flask import current_app
+
+from app.config import Config
+from app.extensions import db
+from app.locks import advisory_lock
+from app.services.campaign_service import CampaignService
+from app.services.change_log_service import ChangeLogService
+from app.services.job_service import JobService
+from app.services.metrics_service import MetricsService
+from app.services.reconcile_service import ReconcileService
+from app.services.sync_service import SyncService
+
+
+def _publish_campaign(job):
+    # A retry may follow an attempt that created the campaign remotely but
+    # died before recording it.
+    campaign = CampaignService.publish_campaign(
+        job.campaign_id, check_remote=job.attempts > 1
+    )
+    return {
+        "campaign_id": str(campaign.id),
+        "status": campaign.status,
+        "google_campaign_id": campaign.google_campaign_id,
+    }
+
+
+def _pause_campaign(job):
+    campaign = CampaignService.pause_campaign(job.campaign_id)
+    return {
+        "campaign_id": str(campaign.id),
+        "status": campaign.status,
+    }
+
+
+def _publish_campaigns_batch(job):
+    campaign_ids = job.payload.get("campaign_ids")
+    results = CampaignService.publish_campaigns_batch(
+        campaign_ids=(
+            None if campaign_ids is None
+            else [uuid.UUID(campaign_id) for campaign_id in campaign_ids]
+        ),
+        filters=job.payload.get("filter"),
+    )
+    return {
+        "published": sum(1 for r in results if r["status"] == "PUBLISHED"),
+        "failed": sum(1 for r in results if r["status"] != "PUBLISHED"),
+        "results": results,
+    }
+
+
+# kind -> (handler, status to restore on the campaign if the job fails for good)
+JOB_HANDLERS = {
+    "publish_campaign": (_publish_campaign, lambda job: "DRAFT"),
+    "pause_campaign": (
+        _pause_campaign,
+        lambda job: job.payload.get("previous_status", "PUBLISHED"),
+    ),
+    # Campaigns left PUBLISHING by a failed batch are settled by the
+    # reconciler.
+    "publish_campaigns_batch": (_publish_campaigns_batch, lambda job: None),
+}
+
+
+def run_job(job):
+    handler, restore_status = JOB_HANDLERS[job.kind]
+
+    try:
+        result = handler(job)
+    except Exception as ex:
+        current_app.logger.warning(
+            "Job %s (%s) attempt %s failed: %s",
+            job.id, job.kind, job.attempts, ex,
+        )
+        requeued = JobService.fail(job, ex)
+        if not requeued and job.campaign_id:
+            CampaignService.restore_status(job.campaign_id, restore_status(job))
+        return
+
+    JobService.complete(job, result)
+
+
+# Tasks the job workers run periodically: name -> (Config attribute with the
+# interval in seconds, task). The name is also the advisory lock that keeps
+# each task to one process at a time.
+PERIODIC_TASKS = {
+    "campaign-reconciler": ("RECONCILE_INTERVAL", ReconcileService.reconcile),
+    "campaign-status-sync": ("STATUS_SYNC_INTERVAL", SyncService.sync),
+    "campaign-metrics-ingest": ("METRICS_INGEST_INTERVAL", MetricsService.ingest),
+    "campaign-change-log": ("CHANGE_LOG_INTERVAL", ChangeLogService.compact),
+}
+
+# Tasks that lock each Google Ads account instead (see
+# AccountService.for_each_account), so workers share their accounts out.
+SHARDED_TASKS = {"campaign-status-sync", "campaign-metrics-ingest"}
+
+
+def run_periodic(name: str) -> dict | None:
+    """Runs one pass of a periodic task unless another process is already
+    running it. Returns its summary, or None if it was skipped."""
+    _, task = PERIODIC_TASKS[name]
+
+    if name in SHARDED_TASKS:
+        return task()
+
+    with advisory_lock(name) as acquired:
+        if not acquired:
+            return None
+        return task()
+
+
+def _periodic_tick(name: str):
+    try:
+        summary = run_periodic(name)
+    except Exception:
+        current_app.logger.exception("Periodic task %s failed", name)
+        db.session.rollback()
+        return
+
+    if summary:
+        current_app.logger.info("Periodic task %s finished", name, extra=summary)
+
+
+def worker_loop(stop_event=None):
+    """Polls the jobs table until ``stop_event`` is set, running each of
+    ``PERIODIC_TASKS`` at its interval. Must run inside an application
+    context."""
+    next_run = {
+        name: time.monotonic() + getattr(Config, interval)
+        for name, (interval, _) in PERIODIC_TASKS.items()
+    }
+
+    while not (stop_event and stop_event.is_set()):
+        for name, (interval, _) in PERIODIC_TASKS.items():
+            seconds = getattr(Config, interval)
+            if seconds and time.monotonic() >= next_run[name]:
+                _periodic_tick(name)
+                next_run[name] = time.monotonic() + seconds
+
+        job = JobService.claim_next()
+
+        if job is None:
+            time.sleep(Config.JOB_POLL_INTERVAL)
+            continue
+
+        run_job(job)
+
+
+def _set_from_signal(event):
+    """Sets a multiprocessing ``event`` from a signal handler. Calling
+    ``event.set()`` in the handler itself deadlocks when the signal arrives
+    while the main thread holds the event's lock (in ``is_set`` or
+    ``wait``), so it is set from a new thread instead."""
+    threading.Thread(target=event.set, daemon=True).start()
+
+
+def _worker_main(stop_event):
+    # Each worker process builds its own app, engine and Ads client.
+    from app import create_app
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: _set_from_signal(stop_event))
+
+    app = create_app()
+    with app.app_context():
+        worker_loop(stop_event)
+
+
+def run_workers(concurrency: int):
+    """Runs ``concurrency`` worker processes and restarts any that die until
+    SIGINT/SIGTERM is received."""
+    ctx = multiprocessing.get_context("spawn")
+    stop_event = ctx.Event()
+
+    def stop(*_):
+        _set_from_signal(stop_event)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    def spawn():
+        process = ctx.Process(target=_worker_main, args=(stop_event,))
+        process.start()
+        return process
+
+    processes = [spawn() for _ in range(concurrency)]
+    current_app.logger.info("Started %s job workers", concurrency)
+
+    while not stop_event.is_set():
+        for index, process in enumerate(processes):
+            if not process.is_alive():
+                current_app.logger.warning(
+                    "Job worker %s exited with %s, restarting",
+                    process.pid, process.exitcode,
+                )
+                processes[index] = spawn()
+        stop_event.wait(1)
+
+    for process in processes:
+        process.join()
+
@@ -0,0 +1,113 @@
+import signal
+import threading
+import time
+
+from flask import current_app
+
+from app.config import Config
+from app.extensions import db
+from app.locks import leader_lock
+from app.services.schedule_service import ScheduleService
+from app.timing_wheel import TimingWheel
+from app.workers.job_worker import _set_from_signal
+
+# Advisory lock held by the leading scheduler instance.
+LEADER_LOCK = "campaign-scheduler"
+
+
+def run_due() -> dict:
+    """Launches and ends every campaign due now, once."""
+    now = time.time()
+    return _fire(
+        (campaign_id, action)
+        for campaign_id, action, deadline in ScheduleService.upcoming(now, now)
+        if deadline <= now
+    )
+
+
+def _fire(keys) -> dict:
+    by_action = {}
+    for campaign_id, action in keys:
+        by_action.setdefault(action, []).append(campaign_id)
+
+    summary = {"updated": 0, "failed": 0}
+    for action, campaign_ids in by_action.items():
+        result = ScheduleService.apply(action, campaign_ids)
+        summary["updated"] += result["updated"]
+        summary["failed"] += result["failed"]
+    return summary
+
+
+def _lead(stop_event, held):
+    """Runs the timing wheel until ``stop_event`` is set or the leader lock
+    is lost.
+
+    Every ``SCHEDULER_REFRESH_INTERVAL`` seconds the launches and ends due
+    within ``SCHEDULER_LOOKAHEAD`` are (re)loaded into the wheel, which
+    fires each at its deadline to the second. The database stays the
+    source of truth: a new leader (or a restarted one) loads everything
+    overdue on its first refresh, and a campaign whose launch failed is
+    loaded again for its retry once its backoff is within the lookahead.
+    """
+    wheel = TimingWheel(time.time())
+    next_refresh = 0.0
+
+    while not stop_event.is_set():
+        now = time.time()
+
+        if now >= next_refresh:
+            if not held():
+                current_app.logger.warning("Scheduler lost its leader lock")
+                return
+            try:
+                for campaign_id, action, deadline in ScheduleService.upcoming(
+                    now, now + Config.SCHEDULER_LOOKAHEAD
+                ):
+                    wheel.schedule((campaign_id, action), deadline)
+            except Exception:
+                current_app.logger.exception("Scheduler could not load campaigns")
+                db.session.rollback()
+            next_refresh = now + Config.SCHEDULER_REFRESH_INTERVAL
+
+        fired = wheel.advance(now)
+        if fired:
+            try:
+                summary = _fire(fired)
+            except Exception:
+                current_app.logger.exception("Scheduled launches failed")
+                db.session.rollback()
+            else:
+                current_app.logger.info(
+                    "Scheduled launches and ends applied", extra=summary
+                )
+
+        stop_event.wait(1)
+
+
+def run_scheduler():
+    """Runs one scheduler instance until SIGINT/SIGTERM is received.
+
+    Any number of instances can run: the one holding the ``LEADER_LOCK``
+    advisory lock leads, and the others try to take it over every
+    ``SCHEDULER_LEADER_RETRY`` seconds, so one takes over when the leader
+    stops or its connection drops.
+    """
+    stop_event = threading.Event()
+
+    def stop(*_):
+        _set_from_signal(stop_event)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while not stop_event.is_set():
+        try:
+            with leader_lock(LEADER_LOCK) as held:
+                if held is not None:
+                    current_app.logger.info("Scheduler is leading")
+                    _lead(stop_event, held)
+        except Exception:
+            current_app.logger.exception("Scheduler failed")
+            db.session.rollback()
+
+        stop_event.wait(Config.SCHEDULER_LEADER_RETRY)
@@ -0,0 +1,401 @@
+"""End-to-end API benchmark against the fake Google Ads backend.
+
+Starts Gunicorn (``run:app``) and a job worker pool with
+``GOOGLE_ADS_BACKEND=fake``, registers ``--customers`` accounts, then runs
+four scenarios with ``--concurrency`` clients:
+
+- create: ``POST /api/campaigns`` for ``--campaigns`` campaigns
+- list: ``GET /api/campaigns?limit=50``, ``--list-requests`` times
+- publish: ``POST /api/campaigns/<id>/publish`` for every campaign, then
+  waits for the jobs
+- pause: ``POST /api/campaigns/<id>/pause`` for every published campaign,
+  then waits for the jobs
+
+For each scenario it reports requests per second and p50/p95/p99 latency
+(for publish and pause also the jobs' throughput and queue-to-finish
+latency).
+
+No baseline is committed: results depend on the machine and database, so
+each environment records its own. ``--save-baseline [PATH]`` stores the
+results (in ``benchmarks/baseline.json`` by default); ``--compare [PATH]``
+compares a later run with them and exits with status 1 when a throughput
+dropped or a p95/p99 grew by more than ``--tolerance``, and with status 2
+when there is no baseline at PATH. Compare runs made with the same
+options. Without either flag the results are only printed.
+
+Run from ``backend/`` against a migrated PostgreSQL database
+(``DATABASE_URL``)::
+
+    python -m benchmarks.bench_api [--campaigns 500] [--concurrency 16]
+        [--fake-latency-ms 50] [--save-baseline [PATH] | --compare [PATH]]
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from benchmarks.load_test import percentile
+
+HOST = "127.0.0.1"
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Options that change the workload; a baseline saved with other values
+# is not comparable.
+WORKLOAD_ARGS = (
+    "campaigns",
+    "list_requests",
+    "customers",
+    "concurrency",
+    "workers",
+    "worker_class",
+    "job_workers",
+    "fake_latency_ms",
+    "fake_error_rate",
+)
+
+# Metrics compared with the baseline; throughput must not drop, latency
+# must not grow.
+HIGHER_IS_BETTER = ("throughput",)
+LOWER_IS_BETTER = ("p95", "p99")
+
+TERMINAL_JOB_STATUSES = ("SUCCEEDED", "FAILED")
+
+
+def request(port: int, method: str, path: str, body=None) -> tuple[int, dict]:
+    connection = http.client.HTTPConnection(HOST, port, timeout=120)
+    try:
+        connection.request(
+            method,
+            path,
+            body=json.dumps(body) if body is not None else None,
+            headers={"Content-Type": "application/json"},
+        )
+        response = connection.getresponse()
+        data = response.read()
+        return response.status, json.loads(data) if data else {}
+    finally:
+        connection.close()
+
+
+def start_processes(args) -> list[subprocess.Popen]:
+    env = {
+        **os.environ,
+        "GOOGLE_ADS_BACKEND": "fake",
+        "FAKE_ADS_LATENCY_MS": str(args.fake_latency_ms),
+        "FAKE_ADS_ERROR_RATE": str(args.fake_error_rate),
+        "GOOGLE_ADS_CUSTOMER_ID": os.getenv("GOOGLE_ADS_CUSTOMER_ID") or "1000000000",
+        "GUNICORN_BIND": f"{HOST}:{args.port}",
+        "GUNICORN_WORKER_CLASS": args.worker_class,
+        "WEB_CONCURRENCY": str(args.workers),
+        "JOB_POLL_INTERVAL": "0.05",
+        # Only the jobs under test run in the workers, and repeated runs
+        # must not exhaust the day's operation budget.
+        "RECONCILE_INTERVAL": "0",
+        "STATUS_SYNC_INTERVAL": "0",
+        "METRICS_INGEST_INTERVAL": "0",
+        "ADS_QUOTA_DAILY_OPERATIONS": "1000000000",
+        # The campaigns' landing pages don't exist.
+        "URL_CHECK_ENABLED": "false",
+        "LOG_FILE": "",
+        "LOG_LEVEL": "WARNING",
+    }
+    processes = [
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn",
+                "-c", "gunicorn.conf.py",
+                "--log-level", "warning",
+                "run:app",
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL,
+        ),
+        subprocess.Popen(
+            [
+                sys.executable, "-m", "flask", "--app", "run:app",
+                "jobs", "work", "--concurrency", str(args.job_workers),
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL,
+        ),
+    ]
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        for process in processes:
+            if process.poll() is not None:
+                stop_processes(processes)
+                raise SystemExit(f"{process.args[2]} exited with {process.returncode}")
+        try:
+            if request(args.port, "GET", "/api/campaigns?limit=1")[0] == 200:
+                return processes
+        except OSError:
+            pass
+        time.sleep(0.2)
+
+    stop_processes(processes)
+    raise SystemExit("gunicorn did not start")
+
+
+def stop_processes(processes: list[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def run_requests(args, fn, items) -> tuple[dict, list]:
+    """Calls ``fn(item)`` -> ``(ok, result)`` for every item on
+    ``--concurrency`` threads. Returns the scenario's stats and the results
+    of the successful calls."""
+
+    def timed(item):
+        start = time.perf_counter()
+        try:
+            ok, result = fn(item)
+        except OSError:
+            ok, result = False, None
+        return ok, result, time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        outcomes = list(pool.map(timed, items))
+    elapsed = time.perf_counter() - start
+
+    latencies = [seconds for ok, _, seconds in outcomes if ok]
+    stats = summarize(latencies, elapsed)
+    stats["errors"] = len(outcomes) - len(latencies)
+    return stats, [result for ok, result, _ in outcomes if ok]
+
+
+def summarize(latencies: list[float], elapsed: float) -> dict:
+    if not latencies:
+        return {"count": 0, "throughput": 0.0, "p50": None, "p95": None, "p99": None}
+    return {
+        "count": len(latencies),
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def wait_for_jobs(args, job_ids: list) -> tuple[dict, list]:
+    """Polls the jobs until they finish (or ``--job-timeout``). Returns
+    their throughput and queue-to-finish latency, and the jobs that
+    succeeded."""
+    jobs = {}
+    pending = list(job_ids)
+    deadline = time.monotonic() + args.job_timeout
+
+    def fetch(job_id):
+        status, job = request(args.port, "GET", f"/api/jobs/{job_id}")
+        return job if status == 200 else None
+
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        while pending and time.monotonic() < deadline:
+            for job in pool.map(fetch, pending):
+                if job and job["status"] in TERMINAL_JOB_STATUSES:
+                    jobs[job["id"]] = job
+            pending = [job_id for job_id in pending if job_id not in jobs]
+            if pending:
+                time.sleep(0.2)
+
+    succeeded = [job for job in jobs.values() if job["status"] == "SUCCEEDED"]
+    if not succeeded:
+        return {**summarize([], 0), "errors": len(job_ids)}, []
+
+    created = [datetime.fromisoformat(job["created_at"]) for job in succeeded]
+    finished = [datetime.fromisoformat(job["finished_at"]) for job in succeeded]
+    latencies = [
+        (end - start).total_seconds() for start, end in zip(created, finished)
+    ]
+    elapsed = (max(finished) - min(created)).total_seconds()
+
+    stats = summarize(latencies, elapsed)
+    stats["errors"] = len(job_ids) - len(succeeded)
+    return stats, succeeded
+
+
+def run(args) -> dict:
+    run_id = uuid.uuid4().hex[:8]
+    customer_ids = [str(9_000_000_000 + i) for i in range(args.customers)]
+    for customer_id in customer_ids:
+        status, _ = request(
+            args.port, "POST", "/api/accounts",
+            {"customer_id": customer_id, "name": f"Benchmark {customer_id}"},
+        )
+        if status >= 300:
+            raise SystemExit(f"Could not register account {customer_id}: {status}")
+
+    def create(index):
+        status, body = request(args.port, "POST", "/api/campaigns", {
+            "name": f"Benchmark {run_id} {index}",
+            "objective": "Sales",
+            "campaign_type": "Search",
+            "daily_budget": 10,
+            "start_date": "2030-01-01",
+            "ad_group_name": f"Ad group {index}",
+            "ad_headline": "Fast service",
+            "ad_description": "Simple. Fast. Reliable.",
+            "asset_url": f"https://example.com/landing/{index}",
+            "customer_id": customer_ids[index % len(customer_ids)],
+        })
+        return status == 201, body.get("id")
+
+    def list_page(_):
+        status, _ = request(args.port, "GET", "/api/campaigns?limit=50")
+        return status == 200, None
+
+    def enqueue(action):
+        def call(campaign_id):
+            status, body = request(
+                args.port, "POST", f"/api/campaigns/{campaign_id}/{action}"
+            )
+            return status == 202, body.get("job_id")
+        return call
+
+    results = {}
+    results["create"], campaign_ids = run_requests(
+        args, create, range(args.campaigns)
+    )
+    results["list"], _ = run_requests(args, list_page, range(args.list_requests))
+
+    results["publish"], job_ids = run_requests(
+        args, enqueue("publish"), campaign_ids
+    )
+    results["publish jobs"], published = wait_for_jobs(args, job_ids)
+
+    results["pause"], job_ids = run_requests(
+        args, enqueue("pause"), [job["campaign_id"] for job in published]
+    )
+    results["pause jobs"], _ = wait_for_jobs(args, job_ids)
+
+    return results
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> dict:
+    """``{scenario: [message, ...]}`` for the metrics that got worse than
+    the baseline by more than ``tolerance``."""
+    found = {}
+    for scenario, stats in results.items():
+        reference = baseline.get(scenario)
+        if not reference:
+            continue
+        for metric in HIGHER_IS_BETTER + LOWER_IS_BETTER:
+            new, old = stats.get(metric), reference.get(metric)
+            if not new or not old:
+                continue
+            change = new / old - 1
+            worse = (
+                change < -tolerance
+                if metric in HIGHER_IS_BETTER
+                else change > tolerance
+            )
+            if worse:
+                found.setdefault(scenario, []).append(f"{metric} {change:+.0%}")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=500)
+    parser.add_argument("--list-requests", type=int, default=2000)
+    parser.add_argument("--customers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--worker-class", default="sync")
+    parser.add_argument("--job-workers", type=int, default=4)
+    parser.add_argument("--job-timeout", type=float, default=300)
+    parser.add_argument("--fake-latency-ms", type=float, default=50)
+    parser.add_argument("--fake-error-rate", type=float, default=0)
+    parser.add_argument("--port", type=int, default=5097)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--save-baseline", nargs="?", const=DEFAULT_BASELINE, metavar="PATH"
+    )
+    mode.add_argument(
+        "--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # Loaded before the run, so a missing or mismatched baseline fails fast.
+    baseline = {}
+    if args.compare:
+        if not os.path.exists(args.compare):
+            print(
+                f"No baseline at {args.compare}; record one with "
+                f"--save-baseline {args.compare}",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+        with open(args.compare) as f:
+            saved = json.load(f)
+        differing = [
+            name for name in WORKLOAD_ARGS
+            if name in saved["args"] and saved["args"][name] != getattr(args, name)
+        ]
+        if differing:
+            print(
+                f"Baseline {args.compare} was saved with different "
+                f"{', '.join(differing)}; results are not comparable",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+        baseline = saved["results"]
+
+    processes = start_processes(args)
+    try:
+        results = run(args)
+    finally:
+        stop_processes(processes)
+
+    found = regressions(results, baseline, args.tolerance)
+
+    print(
+        f"{'scenario':14s} {'count':>6s} {'errors':>6s} {'per s':>8s}"
+        f" {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s}"
+    )
+    for scenario, stats in results.items():
+        latencies = "".join(
+            f" {stats[name]:8.1f}" if stats[name] is not None else f" {'-':>8s}"
+            for name in ("p50", "p95", "p99")
+        )
+        flag = f"  REGRESSION: {', '.join(found[scenario])}" if scenario in found else ""
+        print(
+            f"{scenario:14s} {stats['count']:6d} {stats['errors']:6d}"
+            f" {stats['throughput']:8.1f}{latencies}{flag}"
+        )
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(
+                {
+                    "saved_at": datetime.now().isoformat(timespec="seconds"),
+                    "args": vars(args),
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nBaseline saved to {args.save_baseline}")
+    elif args.compare:
+        print(f"\nCompared with {args.compare} (tolerance {args.tolerance:.0%})")
+
+    sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
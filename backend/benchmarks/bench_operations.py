@@ -0,0 +1,195 @@
+"""Mutate operation build time for a batch publish, per 1k campaigns.
+
+Compares the former per-call builder (``client.get_type`` and enum lookups
+for every message) with ``OperationBuilder`` (types and enums resolved
+once, messages copied from compiled prototypes), both with and without
+adding the operations to a ``MutateGoogleAdsRequest``. No API calls are
+made; the client only needs to be constructible.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_operations [--campaigns 1000] [--repeat 5]
+"""
+import argparse
+import time
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.oauth2.credentials import Credentials
+
+from app.services.ads_operations import OperationBuilder
+
+CUSTOMER_ID = "1234567890"
+
+
+def make_specs(count: int) -> list[dict]:
+    return [
+        {
+            "campaign_name": f"Campaign {i} [{i:08d}]",
+            "daily_budget_micros": (10 + i % 90) * 1_000_000,
+            "ad_group_name": f"Ad group {i}",
+            "headline": f"Fast service {i % 100}",
+            "description": "Simple. Fast. Reliable. " * 3,
+            "final_url": f"https://example.com/landing/{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def legacy(client, index: int, spec: dict) -> list:
+    """The operation builder as it was before OperationBuilder."""
+    operations = []
+    customer = f"customers/{CUSTOMER_ID}"
+    temp_id = -3 * index
+
+    budget_temp = f"{customer}/campaignBudgets/{temp_id - 1}"
+    campaign_temp = f"{customer}/campaigns/{temp_id - 2}"
+    ad_group_temp = f"{customer}/adGroups/{temp_id - 3}"
+
+    budget = client.get_type("CampaignBudget")
+    budget.resource_name = budget_temp
+    budget.name = f"{spec['campaign_name']} Budget"
+    budget.amount_micros = spec["daily_budget_micros"]
+    budget.delivery_method = client.enums.BudgetDeliveryMethodEnum.STANDARD
+
+    budget_op = client.get_type("MutateOperation")
+    budget_op.campaign_budget_operation.create = budget
+    operations.append(budget_op)
+
+    campaign = client.get_type("Campaign")
+    campaign.resource_name = campaign_temp
+    campaign.name = spec["campaign_name"]
+    campaign.campaign_budget = budget_temp
+    campaign.status = client.enums.CampaignStatusEnum.PAUSED
+    campaign.advertising_channel_type = (
+        client.enums.AdvertisingChannelTypeEnum.SEARCH
+    )
+
+    campaign_op = client.get_type("MutateOperation")
+    campaign_op.campaign_operation.create = campaign
+    operations.append(campaign_op)
+
+    ad_group = client.get_type("AdGroup")
+    ad_group.resource_name = ad_group_temp
+    ad_group.name = spec["ad_group_name"]
+    ad_group.campaign = campaign_temp
+    ad_group.status = client.enums.AdGroupStatusEnum.PAUSED
+    ad_group.type_ = client.enums.AdGroupTypeEnum.SEARCH_STANDARD
+
+    ad_group_op = client.get_type("MutateOperation")
+    ad_group_op.ad_group_operation.create = ad_group
+    operations.append(ad_group_op)
+
+    ad_group_ad = client.get_type("AdGroupAd")
+    ad_group_ad.ad_group = ad_group_temp
+    ad_group_ad.status = client.enums.AdGroupAdStatusEnum.PAUSED
+
+    ad = ad_group_ad.ad
+    ad.final_urls.append(spec["final_url"])
+
+    rsa = ad.responsive_search_ad
+    for text in (
+        spec["headline"], f"{spec['headline']} Official", "Get Started Today"
+    ):
+        asset = client.get_type("AdTextAsset")
+        asset.text = text
+        rsa.headlines.append(asset)
+    for text in (spec["description"], "Simple. Fast. Reliable."):
+        asset = client.get_type("AdTextAsset")
+        asset.text = text
+        rsa.descriptions.append(asset)
+
+    ad_op = client.get_type("MutateOperation")
+    ad_op.ad_group_ad_operation.create = ad_group_ad
+    operations.append(ad_op)
+
+    return operations
+
+
+def measure(fn, specs, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(specs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--campaigns", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    client = GoogleAdsClient(
+        credentials=Credentials(token="unused"),
+        developer_token="unused",
+        login_customer_id=CUSTOMER_ID,
+        use_proto_plus=True,
+    )
+    specs = make_specs(args.campaigns)
+
+    # Construction (type resolution, prototypes) happens once per process
+    # and is reported separately.
+    start = time.perf_counter()
+    builder = OperationBuilder(client)
+    builder.search_campaign(0, CUSTOMER_ID, **specs[0])
+    setup = time.perf_counter() - start
+
+    def build_legacy(specs):
+        for index, spec in enumerate(specs):
+            legacy(client, index, spec)
+
+    def build_templates(specs):
+        for index, spec in enumerate(specs):
+            builder.search_campaign(index, CUSTOMER_ID, **spec)
+
+    def request_legacy(specs):
+        request = client.get_type("MutateGoogleAdsRequest")
+        for index, spec in enumerate(specs):
+            request.mutate_operations.extend(legacy(client, index, spec))
+
+    def request_templates(specs):
+        request = client.get_type("MutateGoogleAdsRequest")
+        builder.search_campaigns_request(request, CUSTOMER_ID, specs)
+
+    # Both builders must produce the same messages.
+    for index, spec in enumerate(specs[:10]):
+        expected = [type(op).serialize(op) for op in legacy(client, index, spec)]
+        actual = [
+            type(op).serialize(op)
+            for op in builder.search_campaign(index, CUSTOMER_ID, **spec)
+        ]
+        assert expected == actual, f"operations of campaign {index} differ"
+
+    legacy_request = client.get_type("MutateGoogleAdsRequest")
+    for index, spec in enumerate(specs[:10]):
+        legacy_request.mutate_operations.extend(legacy(client, index, spec))
+    request = client.get_type("MutateGoogleAdsRequest")
+    builder.search_campaigns_request(request, CUSTOMER_ID, specs[:10])
+    assert type(request).serialize(request) == type(request).serialize(
+        legacy_request
+    ), "requests differ"
+
+    results = {
+        "legacy get_type per message": measure(build_legacy, specs, args.repeat),
+        "compiled prototypes": measure(build_templates, specs, args.repeat),
+        "legacy + request": measure(request_legacy, specs, args.repeat),
+        "prototypes + request": measure(request_templates, specs, args.repeat),
+    }
+
+    scale = 1000 / args.campaigns
+    print(f"{'builder setup (once)':28s} {setup * 1000:8.2f} ms")
+    for name, seconds in results.items():
+        baseline = results[
+            "legacy get_type per message"
+            if "request" not in name
+            else "legacy + request"
+        ]
+        print(
+            f"{name:28s} {seconds * scale * 1000:8.2f} ms / 1k campaigns"
+            f"  ({baseline / seconds:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
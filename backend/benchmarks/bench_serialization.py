@@ -0,0 +1,108 @@
+"""Serialization time of a campaign listing, per 10k campaigns.
+
+Compares the former hand-built dicts + stdlib ``jsonify`` encoding with
+``CampaignSchema`` + ``FastJSONProvider`` (orjson, and its stdlib fallback).
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_serialization [--rows 10000] [--repeat 5]
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from flask import Flask
+
+from app import serialization
+from app.schemas.campaign import CampaignSchema
+from app.serialization import FastJSONProvider
+
+
+def make_campaigns(count: int) -> list:
+    now = datetime.utcnow()
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            name=f"Campaign {i}",
+            objective="Traffic",
+            campaign_type="Search",
+            daily_budget=10 + i % 90,
+            start_date=date.today(),
+            end_date=None,
+            status="DRAFT" if i % 3 else "PUBLISHED",
+            google_campaign_id=None if i % 3 else f"customers/1/campaigns/{i}",
+            ad_group_name=f"Ad group {i}",
+            ad_headline="Fast, reliable service",
+            ad_description="Simple. Fast. Reliable. " * 4,
+            asset_url="https://example.com/landing",
+            created_at=now - timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def legacy(campaigns) -> str:
+    return json.dumps([
+        {
+            "id": str(c.id),
+            "name": c.name,
+            "objective": c.objective,
+            "campaign_type": c.campaign_type,
+            "daily_budget": c.daily_budget,
+            "status": c.status,
+            "google_campaign_id": c.google_campaign_id,
+            "created_at": c.created_at.isoformat(),
+        }
+        for c in campaigns
+    ], indent=None, separators=(",", ":"), sort_keys=True)
+
+
+def measure(fn, campaigns, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(campaigns)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    campaigns = make_campaigns(args.rows)
+    provider = FastJSONProvider(Flask(__name__))
+
+    def schema(campaigns):
+        return provider.dumps({
+            "data": CampaignSchema.dump_many(campaigns, CampaignSchema.list_fields)
+        })
+
+    results = {"legacy dicts + stdlib json": measure(legacy, campaigns, args.repeat)}
+
+    if serialization.orjson is not None:
+        results["schema + orjson"] = measure(schema, campaigns, args.repeat)
+
+    fast_encoder = serialization.orjson
+    serialization.orjson = None
+    try:
+        results["schema + stdlib fallback"] = measure(schema, campaigns, args.repeat)
+    finally:
+        serialization.orjson = fast_encoder
+
+    baseline = results["legacy dicts + stdlib json"]
+    scale = 10_000 / args.rows
+    for name, seconds in results.items():
+        print(
+            f"{name:28s} {seconds * scale * 1000:8.2f} ms / 10k campaigns"
+            f"  ({baseline / seconds:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
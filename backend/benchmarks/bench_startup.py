@@ -0,0 +1,97 @@
+"""Import and ``create_app()`` time of a fresh interpreter, with a budget.
+
+Runs ``python -X importtime`` on ``create_app()`` in ``--runs`` new
+processes and reports the best total import time, the wall time of import
+plus ``create_app()`` and the heaviest top-level imports. Exits with status
+1 when the import time is over ``--budget-ms`` or when a module that should
+only load on first use (the Google Ads SDK, gRPC) was imported, so it can
+run as a CI check.
+
+Run from ``backend/``::
+
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 800] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules app startup must not import.
+LAZY_MODULES = ("google.ads", "grpc")
+
+SCRIPT = """
+import time
+start = time.perf_counter()
+from app import create_app
+create_app()
+print(time.perf_counter() - start)
+"""
+
+
+def run_once() -> tuple[float, list[tuple[str, int, bool]]]:
+    """Wall seconds of import + ``create_app()`` and the ``(module,
+    cumulative microseconds, top-level)`` lines of ``-X importtime`` for
+    the imports made after interpreter startup."""
+    env = {**os.environ, "LOG_FILE": "", "LOG_LEVEL": "WARNING"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Names are indented by one space plus two per nesting level.
+        top_level = not name.startswith("  ")
+        if top_level and name.strip() == "site":
+            # Everything up to site is the interpreter's own startup.
+            imports = []
+            continue
+        imports.append((name.strip(), int(cumulative), top_level))
+
+    return float(result.stdout.strip().splitlines()[-1]), imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=800)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    wall, imports = min(runs, key=lambda run: run[0])
+    total = sum(micros for _, micros, top_level in imports if top_level) / 1000
+
+    print(f"{'import (-X importtime)':28s} {total:8.1f} ms")
+    print(f"{'import + create_app()':28s} {wall * 1000:8.1f} ms")
+    print("\nHeaviest imports (cumulative):")
+    for name, micros, _ in sorted(
+        imports, key=lambda item: item[1], reverse=True
+    )[:args.top]:
+        print(f"  {name:40s} {micros / 1000:8.1f} ms")
+
+    failures = []
+    if total > args.budget_ms:
+        failures.append(
+            f"import time {total:.1f} ms is over the "
+            f"{args.budget_ms:.0f} ms budget"
+        )
+    eager = sorted(
+        name for name, _, _ in imports if name.startswith(LAZY_MODULES)
+    )
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager[:5])}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
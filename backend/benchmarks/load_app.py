@@ -0,0 +1,26 @@
+"""WSGI app served by ``benchmarks.load_test``: the API plus
+``GET /bench/upstream``, which stands in for a request blocked on Google Ads
+for ``BENCH_UPSTREAM_LATENCY`` seconds (0.5) before reading the database.
+
+The upstream call is a plain ``time.sleep`` stub, not a gRPC call (not even
+to the fake backend): it measures how each worker class copes with blocked
+requests, not how the Google Ads client behaves under gevent.
+"""
+import os
+import time
+
+from app import create_app
+from app.extensions import db
+from app.models.campaign import Campaign
+
+UPSTREAM_LATENCY = float(os.getenv("BENCH_UPSTREAM_LATENCY", "0.5"))
+
+app = create_app()
+
+
+@app.route("/bench/upstream", methods=["GET"])
+def upstream():
+    # Patched to a greenlet sleep in gevent workers, like a gRPC wait.
+    time.sleep(UPSTREAM_LATENCY)
+    count = db.session.execute(db.select(db.func.count(Campaign.id))).scalar()
+    return {"campaigns": count}
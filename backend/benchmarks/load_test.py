@@ -0,0 +1,166 @@
+"""Throughput and tail latency of the API under sync and gevent workers.
+
+Starts Gunicorn once per worker class with ``benchmarks.load_app`` and the
+same number of workers, then keeps ``--concurrency`` clients busy for
+``--duration`` seconds. A share of the requests (``--upstream-fraction``)
+wait on a slow upstream call, standing in for Google Ads; the rest list
+campaigns. The upstream call is a ``time.sleep`` stub (see
+``benchmarks.load_app``), so no Google Ads client code runs; use
+``benchmarks.bench_api`` with the fake backend for that. Reported per worker class and route: requests per second and
+p50/p95/p99 latency. Uses ``DATABASE_URL``, whose schema must be migrated.
+
+Run from ``backend/``::
+
+    python -m benchmarks.load_test [--worker-class sync gevent] [--workers 2]
+        [--concurrency 64] [--duration 15] [--upstream-fraction 0.2]
+        [--upstream-latency 0.5]
+"""
+import argparse
+import http.client
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+
+HOST = "127.0.0.1"
+
+ROUTES = {
+    "list": "/api/campaigns?limit=20",
+    "upstream": "/bench/upstream",
+}
+
+
+def start_server(args, worker_class: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "GUNICORN_BIND": f"{HOST}:{args.port}",
+        "GUNICORN_WORKER_CLASS": worker_class,
+        "WEB_CONCURRENCY": str(args.workers),
+        "GUNICORN_WORKER_CONNECTIONS": str(args.concurrency),
+        "GUNICORN_PRELOAD": "false",
+        "BENCH_UPSTREAM_LATENCY": str(args.upstream_latency),
+        "LOG_FILE": "",
+        "LOG_LEVEL": "WARNING",
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn",
+            "-c", "gunicorn.conf.py",
+            "--log-level", "warning",
+            "benchmarks.load_app:app",
+        ],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"gunicorn ({worker_class}) exited with {server.returncode}")
+        try:
+            if get(args.port, ROUTES["list"]) < 500:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+
+    server.terminate()
+    raise SystemExit(f"gunicorn ({worker_class}) did not start")
+
+
+def get(port: int, path: str) -> int:
+    connection = http.client.HTTPConnection(HOST, port, timeout=120)
+    try:
+        connection.request("GET", path)
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def run_load(args) -> dict:
+    """Latencies (seconds) of the successful requests and error counts, per
+    route."""
+    latencies = {route: [] for route in ROUTES}
+    errors = {route: 0 for route in ROUTES}
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def client(seed: int):
+        rng = random.Random(seed)
+        while time.monotonic() < deadline:
+            route = "upstream" if rng.random() < args.upstream_fraction else "list"
+            start = time.perf_counter()
+            try:
+                ok = get(args.port, ROUTES[route]) < 500
+            except OSError:
+                ok = False
+            elapsed = time.perf_counter() - start
+
+            with lock:
+                if ok:
+                    latencies[route].append(elapsed)
+                else:
+                    errors[route] += 1
+
+    clients = [
+        threading.Thread(target=client, args=(seed,))
+        for seed in range(args.concurrency)
+    ]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+
+    return {"latencies": latencies, "errors": errors}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--worker-class", nargs="+", default=["sync", "gevent"])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--upstream-fraction", type=float, default=0.2)
+    parser.add_argument("--upstream-latency", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=5099)
+    args = parser.parse_args()
+
+    results = {}
+    for worker_class in args.worker_class:
+        server = start_server(args, worker_class)
+        try:
+            results[worker_class] = run_load(args)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(
+        f"{'workers':8s} {'route':9s} {'req/s':>8s} {'p50 ms':>8s}"
+        f" {'p95 ms':>8s} {'p99 ms':>8s} {'errors':>7s}"
+    )
+    for worker_class, result in results.items():
+        for route, latencies in result["latencies"].items():
+            if not latencies:
+                print(f"{worker_class:8s} {route:9s} {'-':>8s}")
+                continue
+            print(
+                f"{worker_class:8s} {route:9s}"
+                f" {len(latencies) / args.duration:8.1f}"
+                f" {percentile(latencies, 0.50) * 1000:8.1f}"
+                f" {percentile(latencies, 0.95) * 1000:8.1f}"
+                f" {percentile(latencies, 0.99) * 1000:8.1f}"
+                f" {result['errors'][route]:7d}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+# Concurrent requests per gevent worker; each may hold a pooled connection,
+# so size DB_POOL_SIZE + DB_MAX_OVERFLOW (or PgBouncer) to match.
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "100"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "0"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "false").lower() in ("1", "true", "yes")
+
+if preload_app and worker_class == "gevent":
+    # gevent workers patch the standard library only after the fork, too
+    # late for the modules (ssl, threading) the preloaded app has imported
+    # and the log listener thread it started. Patch the master first.
+    from gevent import monkey
+
+    monkey.patch_all()
+
+
+def on_starting(server):
+    # With preload_app, import the Google Ads SDK once in the master so
+    # workers share it copy-on-write instead of each importing it on their
+    # first Ads call. No channel is opened before the fork.
+    if preload_app:
+        from app.services.google_ads_client import preload_sdk
+
+        preload_sdk()
+
+    # Samples of workers from a previous run must not leak into /metrics.
+    metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for name in os.listdir(metrics_dir):
+            os.remove(os.path.join(metrics_dir, name))
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def pre_fork(server, worker):
+    # In a patched master the log listener is a greenlet, and greenlets,
+    # unlike threads, are copied into the child. Stop it so each worker
+    # runs only the listener post_fork starts; the master restarts its own
+    # right after the fork.
+    if preload_app and worker_class == "gevent":
+        from app.logging import stop_log_listener
+
+        stop_log_listener()
+
+
+def _restart_master_log_listener():
+    from app.logging import start_log_listener
+
+    start_log_listener()
+
+
+if preload_app and worker_class == "gevent":
+    # Gunicorn has no hook in the master after a fork.
+    os.register_at_fork(after_in_parent=_restart_master_log_listener)
+
+
+def post_fork(server, worker):
+    # With preload_app the app (and possibly its engine) was created in the
+    # master. Pooled connections inherited through fork would be shared by
+    # every worker, so drop them without closing the parent's sockets; each
+    # worker then opens its own connections on first use.
+    app = getattr(server.app, "callable", None)
+    if app is None:
+        return
+
+    from app.extensions import db
+    from app.logging import start_log_listener
+
+    # The master's log listener thread did not survive the fork.
+    start_log_listener()
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # gevent workers monkey patch after the master forked them; with
+    # preload_app the app was created before that and could not see it.
+    from app.cooperative import init_cooperative_io
+
+    init_cooperative_io()
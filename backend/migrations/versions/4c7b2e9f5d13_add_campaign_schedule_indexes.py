@@ -0,0 +1,28 @@
+"""add campaign schedule indexes
+
+Revision ID: 4c7b2e9f5d13
+Revises: 9d3b6f1e4a70
+Create Date: 2026-10-18 16:12:40.318254
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c7b2e9f5d13'
+down_revision = '9d3b6f1e4a70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.create_index('ix_campaigns_status_start_date', ['status', 'start_date'], unique=False)
+        batch_op.create_index('ix_campaigns_status_end_date', ['status', 'end_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_index('ix_campaigns_status_end_date')
+        batch_op.drop_index('ix_campaigns_status_start_date')
@@ -0,0 +1,42 @@
+"""add campaign listing indexes
+
+Revision ID: b7e41d0c9a25
+Revises: 3f9a2c7d1b64
+Create Date: 2026-10-18 11:02:17.540981
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e41d0c9a25'
+down_revision = '3f9a2c7d1b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination orders on (created_at, id), which needs created_at
+    # to be NOT NULL.
+    op.execute("UPDATE campaigns SET created_at = now() WHERE created_at IS NULL")
+
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=False)
+        batch_op.create_index('ix_campaigns_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_campaigns_status_created_at_id', ['status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_campaigns_objective_created_at_id', ['objective', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_campaigns_campaign_type_created_at_id', ['campaign_type', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('campaigns', schema=None) as batch_op:
+        batch_op.drop_index('ix_campaigns_campaign_type_created_at_id')
+        batch_op.drop_index('ix_campaigns_objective_created_at_id')
+        batch_op.drop_index('ix_campaigns_status_created_at_id')
+        batch_op.drop_index('ix_campaigns_created_at_id')
+        batch_op.alter_column('created_at',
+               existing_type=sa.DateTime(),
+               nullable=True)
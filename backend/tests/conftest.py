@@ -0,0 +1,54 @@
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db"
+)
+os.environ.setdefault("GOOGLE_ADS_BACKEND", "fake")
+os.environ.setdefault("GOOGLE_ADS_CUSTOMER_ID", "1234567890")
+os.environ.setdefault("LOG_FILE", "")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("FAKE_ADS_LATENCY_MS", "0")
+os.environ.setdefault("FAKE_ADS_JITTER_MS", "0")
+
+import pytest
+
+from app import create_app
+from app.extensions import db
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_campaign(client):
+    """Creates a DRAFT campaign through the API and returns its id."""
+    def make_campaign(name: str = "Shoes", **fields) -> str:
+        response = client.post("/api/campaigns", json={
+            "name": name,
+            "objective": "Sales",
+            "campaign_type": "Search",
+            "daily_budget": 5,
+            "start_date": "2030-01-01",
+            "ad_group_name": "Shoes",
+            "ad_headline": "Great shoes",
+            "ad_description": "Comfortable shoes for every day.",
+            "asset_url": "https://shop.example.org/shoes",
+            **fields,
+        })
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()["id"]
+
+    return make_campaign
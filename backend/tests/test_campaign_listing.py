@@ -0,0 +1,87 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db, response_cache
+from app.models.campaign import Campaign
+from app.services.campaign_service import CAMPAIGNS_CACHE
+
+
+def page(client, **params):
+    response = client.get("/api/campaigns", query_string=params)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def walk(client, **params) -> list[dict]:
+    rows, cursor = [], None
+    while True:
+        body = page(client, **params, **({"cursor": cursor} if cursor else {}))
+        rows += body["data"]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return rows
+
+
+def set_created_at(campaign_ids, created_at: datetime):
+    db.session.execute(
+        db.update(Campaign)
+        .where(Campaign.id.in_([uuid.UUID(c) for c in campaign_ids]))
+        .values(created_at=created_at)
+    )
+    db.session.commit()
+    response_cache.bump(CAMPAIGNS_CACHE)
+
+
+def test_pages_are_newest_first_and_cover_every_campaign_once(
+    client, make_campaign
+):
+    ids = [make_campaign(f"Campaign {n}") for n in range(5)]
+    # Equal timestamps are ordered by id, so no row is skipped or repeated
+    # at a page boundary.
+    set_created_at(ids, datetime(2030, 1, 1))
+
+    rows = walk(client, limit=2, fields="id")
+
+    assert [row["id"] for row in rows] == sorted(ids, reverse=True)
+    assert all(set(row) == {"id"} for row in rows)
+
+
+def test_newer_campaigns_do_not_shift_later_pages(client, make_campaign):
+    ids = [make_campaign(f"Campaign {n}") for n in range(4)]
+    for day, campaign_id in enumerate(ids, start=1):
+        set_created_at([campaign_id], datetime(2020, 1, day))
+    first = page(client, limit=2, fields="id")
+
+    make_campaign("Newer")
+    rest = page(client, limit=2, fields="id", cursor=first["next_cursor"])
+
+    seen = [row["id"] for row in first["data"] + rest["data"]]
+    assert seen == list(reversed(ids))
+    assert rest["next_cursor"] is None
+
+
+def test_filters_apply_to_every_page(client, make_campaign):
+    leads = [make_campaign(f"Leads {n}", objective="Leads") for n in range(3)]
+    make_campaign("Sales", objective="Sales")
+    for day, campaign_id in enumerate(leads, start=1):
+        set_created_at([campaign_id], datetime(2020, 1, day))
+
+    rows = walk(client, limit=1, objective="Leads", fields="id,objective")
+
+    assert [row["id"] for row in rows] == list(reversed(leads))
+    assert {row["objective"] for row in rows} == {"Leads"}
+
+
+@pytest.mark.parametrize("params, message", [
+    ({"cursor": "not-a-cursor"}, "Invalid cursor"),
+    ({"fields": "id,password"}, "Unknown fields: password"),
+    ({"limit": "0"}, "limit must be a positive integer"),
+    ({"limit": "100000"}, "limit must be between 1 and"),
+])
+def test_invalid_parameters_are_rejected(client, params, message):
+    response = client.get("/api/campaigns", query_string=params)
+
+    assert response.status_code == 422
+    assert message in response.get_json()["error"]
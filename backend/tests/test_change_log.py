@@ -0,0 +1,103 @@
+import uuid
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models.campaign_change import CampaignChange
+from app.services.change_log_service import ChangeLogService
+
+
+def record(*campaign_ids):
+    ChangeLogService.record([uuid.UUID(campaign_id) for campaign_id in campaign_ids])
+    db.session.commit()
+
+
+def changes(client, since, **params):
+    response = client.get(
+        "/api/campaigns/changes", query_string={"since": since, **params}
+    )
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_changes_are_returned_in_version_order_once_per_campaign(
+    client, make_campaign
+):
+    start = client.get("/api/campaigns/changes").get_json()["next_since"]
+    first = make_campaign("First")
+    second = make_campaign("Second")
+    third = make_campaign("Third")
+    record(first)
+
+    page = changes(client, start, limit=2, fields="id")
+    assert [row["id"] for row in page["data"]] == [second, third]
+    assert page["has_more"] is True
+
+    versions = [row["version"] for row in page["data"]]
+    assert versions == sorted(versions)
+
+    # The first campaign's original entry was superseded by the later one.
+    page = changes(client, start)
+    assert [row["id"] for row in page["data"]] == [second, third, first]
+    assert page["data"][-1]["version"] > page["data"][0]["version"]
+
+
+def test_paging_resumes_after_next_since(client, make_campaign):
+    start = client.get("/api/campaigns/changes").get_json()["next_since"]
+    ids = [make_campaign(f"Campaign {n}") for n in range(5)]
+
+    seen, since = [], start
+    while True:
+        page = changes(client, since, limit=2, fields="id")
+        seen += [row["id"] for row in page["data"]]
+        since = page["next_since"]
+        if not page["has_more"]:
+            break
+
+    assert seen == ids
+    assert changes(client, since)["data"] == []
+
+
+def test_invalid_since_is_rejected(client):
+    response = client.get("/api/campaigns/changes?since=abc")
+    assert response.status_code == 422
+
+
+def test_compact_drops_superseded_entries(app, make_campaign):
+    first = make_campaign("First")
+    second = make_campaign("Second")
+    record(first)
+    record(first)
+
+    assert ChangeLogService.compact() == {"compacted": 2, "expired": 0}
+
+    entries = db.session.execute(
+        db.select(CampaignChange.campaign_id).order_by(CampaignChange.version)
+    ).scalars().all()
+    assert [str(campaign_id) for campaign_id in entries] == [second, first]
+
+    # Only entries written since the last run are compared again.
+    assert ChangeLogService.compact() == {"compacted": 0, "expired": 0}
+
+
+def test_since_below_retention_horizon_is_gone(client, make_campaign):
+    start = client.get("/api/campaigns/changes").get_json()["next_since"]
+    make_campaign("Old")
+    db.session.execute(
+        db.update(CampaignChange).values(
+            changed_at=datetime.utcnow() - timedelta(days=30)
+        )
+    )
+    db.session.commit()
+    kept = make_campaign("New")
+
+    assert ChangeLogService.compact() == {"compacted": 0, "expired": 1}
+
+    response = client.get("/api/campaigns/changes", query_string={"since": start})
+    assert response.status_code == 410
+
+    # A fresh start is at or past the horizon and sees later changes.
+    restart = client.get("/api/campaigns/changes").get_json()["next_since"]
+    assert changes(client, restart)["data"] == []
+
+    record(kept)
+    assert [row["id"] for row in changes(client, restart)["data"]] == [kept]
@@ -0,0 +1,329 @@
+import socket
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.models.creative_validation import CreativeValidation
+from app.services import creative_validation_service
+from app.services.creative_validation_service import (
+    MAX_REDIRECTS,
+    CreativeValidationService,
+    _display_length,
+    _Unfetchable,
+    _fetch,
+    _follow,
+    _resolve,
+    _text_errors,
+    _url_error,
+)
+
+
+def creative(headline="Great shoes", description="Comfortable shoes."):
+    # Traffic campaigns use the default template: the headline, the
+    # headline + " Official" and "Get Started Today".
+    return SimpleNamespace(
+        objective="Traffic",
+        campaign_type="Search",
+        ad_headline=headline,
+        ad_description=description,
+    )
+
+
+def test_valid_texts_have_no_errors():
+    assert _text_errors(creative()) == []
+
+
+def test_rendered_headlines_are_checked_for_length():
+    # 25 characters fit alone but not with " Official" appended.
+    errors = _text_errors(creative(headline="A" * 25))
+    assert errors == [
+        f'Headline "{"A" * 25} Official" is 34 characters long; '
+        "at most 30 are allowed"
+    ]
+
+
+def test_full_width_characters_count_double():
+    assert _display_length("靴") == 2
+    errors = _text_errors(creative(headline="靴" * 12))
+    assert len(errors) == 1 and "is 33 characters long" in errors[0]
+
+
+@pytest.mark.parametrize("fields, expected", [
+    ({"headline": "Shoes!"}, "contains disallowed characters: '!'"),
+    ({"description": "Shoes ★ for all"}, "contains disallowed characters: '★'"),
+    ({"description": "Shoes <b>"}, "contains disallowed characters: '<' '>'"),
+    ({"description": "Really?? Yes"}, "repeats punctuation"),
+    ({"headline": "get started  TODAY"}, '"Get Started Today" is repeated'),
+    ({"description": "   "}, "Description must not be empty"),
+])
+def test_text_rules(fields, expected):
+    errors = _text_errors(creative(**fields))
+    assert any(expected in error for error in errors), errors
+
+
+@pytest.mark.parametrize("url", [
+    "https://shop.example.org/shoes?size=42",
+    "http://example.org:8080/",
+    "https://[2606:4700::1]/",
+])
+def test_url_error_accepts_public_urls(url):
+    assert _url_error(url) is None
+
+
+@pytest.mark.parametrize("url, expected", [
+    (None, "is required"),
+    ("https://example.org/" + "a" * 2048, "at most 2048 characters"),
+    ("ftp://example.org/file", "not a valid http(s) URL"),
+    ("https:///path", "not a valid http(s) URL"),
+    ("https://exa mple.org/", "not a valid http(s) URL"),
+    ("https://[::1/", "not a valid http(s) URL"),
+    ("https://example.org:99999/", "has an invalid port"),
+    ("https://example.org:http/", "has an invalid port"),
+    ("https://example.org:0/", "has an invalid port"),
+])
+def test_url_error_rejects_malformed_urls(url, expected):
+    assert expected in _url_error(url)
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/",
+    "http://10.1.2.3/",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://[::1]/",
+    "http://[fd00::1]/",
+    # The shorthand forms inet_aton resolves to 127.0.0.1.
+    "http://2130706433/",
+    "http://0x7f000001/",
+    "http://127.1/",
+    "http://0177.0.0.1/",
+    # Names that can't be public.
+    "http://intranet/",
+    "http://intranet./",
+    "http://db.internal/",
+    "http://app.localhost/",
+    "http://printer.local./",
+])
+def test_url_error_rejects_non_public_hosts(url):
+    assert _url_error(url) == f"Final URL {url} is not a public address"
+
+
+@pytest.fixture
+def resolver(monkeypatch):
+    """Resolves host names from ``resolver.addresses`` (an OSError when
+    missing) and records the (host, port) pairs looked up."""
+    stub = SimpleNamespace(addresses={}, lookups=[])
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        stub.lookups.append((host, port))
+        if host not in stub.addresses:
+            raise socket.gaierror("Name or service not known")
+        return [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))
+            for address in stub.addresses[host]
+        ]
+
+    monkeypatch.setattr(
+        creative_validation_service.socket, "getaddrinfo", getaddrinfo
+    )
+    return stub
+
+
+def test_resolve_accepts_hosts_with_only_public_addresses(resolver):
+    resolver.addresses["shop.example.org"] = ["93.184.216.34", "93.184.216.35"]
+
+    _resolve("https://shop.example.org/shoes")
+    _resolve("http://shop.example.org:8080/")
+
+    assert resolver.lookups == [
+        ("shop.example.org", 443), ("shop.example.org", 8080),
+    ]
+
+
+def test_resolve_rejects_any_non_public_address(resolver):
+    # One private answer is enough: the client may connect to either.
+    resolver.addresses["shop.example.org"] = ["93.184.216.34", "10.0.0.5"]
+
+    with pytest.raises(_Unfetchable, match="is not a public address"):
+        _resolve("https://shop.example.org/")
+
+
+def test_resolve_rejects_unresolvable_and_invalid_urls(resolver):
+    with pytest.raises(_Unfetchable, match="does not resolve"):
+        _resolve("https://missing.example.org/")
+
+    with pytest.raises(_Unfetchable, match="is not a public address"):
+        _resolve("http://2130706433/")
+    assert resolver.lookups == [("missing.example.org", 443)]
+
+
+class StubSession:
+    """Answers each request from ``responses`` (status, Location header)
+    by ``(method, url)`` or by URL, and records the requests made."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    def request(self, method, url, allow_redirects, timeout, stream):
+        assert allow_redirects is False
+        self.requests.append((method, url))
+        status, location = self.responses.get(
+            (method, url), self.responses.get(url)
+        )
+        return SimpleNamespace(
+            status_code=status,
+            is_redirect=location is not None,
+            headers={"Location": location},
+            close=lambda: None,
+        )
+
+
+@pytest.fixture
+def public_dns(resolver):
+    resolver.addresses.update({
+        "shop.example.org": ["93.184.216.34"],
+        "cdn.example.net": ["93.184.216.40"],
+    })
+    return resolver
+
+
+def test_follow_checks_every_redirect_hop(public_dns):
+    session = StubSession({
+        "https://shop.example.org/a": (301, "/b"),
+        "https://shop.example.org/b": (302, "https://cdn.example.net/c"),
+        "https://cdn.example.net/c": (200, None),
+    })
+
+    response = _follow(session, "HEAD", "https://shop.example.org/a")
+
+    assert response.status_code == 200
+    assert [host for host, _ in public_dns.lookups] == [
+        "shop.example.org", "shop.example.org", "cdn.example.net",
+    ]
+
+
+@pytest.mark.parametrize("location", [
+    "http://127.0.0.1/admin",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://db.internal/",
+    "https://unknown.example.org/",
+])
+def test_follow_never_requests_a_redirect_to_a_refused_url(public_dns, location):
+    session = StubSession({"https://shop.example.org/a": (302, location)})
+
+    with pytest.raises(_Unfetchable, match="redirects to a URL that is not allowed"):
+        _follow(session, "HEAD", "https://shop.example.org/a")
+    assert session.requests == [("HEAD", "https://shop.example.org/a")]
+
+
+def test_follow_stops_after_max_redirects(public_dns):
+    session = StubSession({"https://shop.example.org/loop": (302, "/loop")})
+
+    with pytest.raises(_Unfetchable, match="redirects too many times"):
+        _follow(session, "HEAD", "https://shop.example.org/loop")
+    assert len(session.requests) == MAX_REDIRECTS + 1
+
+
+def test_fetch_falls_back_to_get_and_reports_http_errors(public_dns):
+    session = StubSession({
+        ("HEAD", "https://shop.example.org/"): (405, None),
+        ("GET", "https://shop.example.org/"): (404, None),
+    })
+
+    assert _fetch(session, "https://shop.example.org/") == (
+        "Final URL https://shop.example.org/ answered HTTP 404"
+    )
+    assert [method for method, _ in session.requests] == ["HEAD", "GET"]
+
+
+@pytest.fixture
+def url_checks(monkeypatch):
+    """Replaces the URL checker; every URL answers, and the URLs checked are
+    recorded per call."""
+    calls = []
+
+    def check(urls):
+        urls = list(urls)
+        calls.append(urls)
+        return {url: None for url in urls}
+
+    monkeypatch.setattr(creative_validation_service.url_checker, "check", check)
+    return calls
+
+
+def campaigns(*campaign_ids):
+    return [db.session.get(Campaign, uuid.UUID(c)) for c in campaign_ids]
+
+
+def test_results_are_stored_by_creative_hash(app, make_campaign, url_checks):
+    first, second = campaigns(make_campaign("First"), make_campaign("Second"))
+    other = campaigns(make_campaign(
+        "Other", asset_url="https://shop.example.org/boots"
+    ))[0]
+
+    results = CreativeValidationService.validate([first, second, other])
+    assert results == {first.id: [], second.id: [], other.id: []}
+    # The two campaigns share a creative, so its URL is checked once.
+    assert sorted(url_checks[0]) == [
+        "https://shop.example.org/boots", "https://shop.example.org/shoes",
+    ]
+    assert db.session.query(CreativeValidation).count() == 2
+
+    # Unchanged creatives reuse the stored results ...
+    CreativeValidationService.validate([first, other])
+    assert len(url_checks) == 1
+
+    # ... and an edited one is checked again.
+    other.ad_headline = "New boots"
+    db.session.commit()
+    CreativeValidationService.validate([other])
+    assert url_checks[1] == ["https://shop.example.org/boots"]
+
+
+def test_request_path_checks_skip_urls_and_store_nothing(
+    app, make_campaign, url_checks
+):
+    valid, invalid = campaigns(
+        make_campaign("Valid"),
+        make_campaign("Invalid", ad_headline="Shoes!"),
+    )
+
+    results = CreativeValidationService.validate([valid, invalid], check_urls=False)
+
+    assert results[valid.id] == []
+    assert "contains disallowed characters: '!'" in results[invalid.id][0]
+    assert url_checks == []
+    assert db.session.query(CreativeValidation).count() == 0
+
+
+def test_validate_leaves_the_callers_session_alone(
+    app, make_campaign, url_checks
+):
+    campaign = campaigns(make_campaign())[0]
+
+    with db.session.no_autoflush:
+        campaign.name = "Renamed"
+        CreativeValidationService.validate([campaign])
+
+        # Neither committed nor rolled back (which would have expired the
+        # change), though the result was stored.
+        assert campaign in db.session.dirty
+        assert campaign.name == "Renamed"
+
+    assert db.session.query(CreativeValidation).count() == 1
+    db.session.rollback()
+    assert db.session.get(Campaign, campaign.id).name == "Shoes"
+
+
+def test_publish_request_does_not_fetch_urls(client, make_campaign, url_checks):
+    invalid = make_campaign("Invalid", ad_description="Really??")
+    response = client.post(f"/api/campaigns/{invalid}/publish")
+    assert response.status_code == 422
+    assert "repeats punctuation" in response.get_json()["error"]
+
+    valid = make_campaign("Valid")
+    assert client.post(f"/api/campaigns/{valid}/publish").status_code == 202
+    assert url_checks == []
@@ -0,0 +1,138 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import Config
+from app.errors.exceptions import (
+    ExternalServiceError,
+    ServiceUnavailableError,
+    ValidationError,
+)
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.models.job import Job
+from app.services.job_service import JobService
+from app.workers.job_worker import run_job
+
+
+def enqueue(kind="pause_campaign", **fields) -> Job:
+    job = JobService.enqueue(kind, **{
+        key: fields.pop(key)
+        for key in ("priority", "customer_id", "payload")
+        if key in fields
+    })
+    for key, value in fields.items():
+        setattr(job, key, value)
+    db.session.commit()
+    return job
+
+
+def test_claims_highest_priority_then_oldest_due_job(app):
+    now = datetime.utcnow()
+    later = enqueue(run_after=now + timedelta(minutes=5))
+    old = enqueue(run_after=now - timedelta(minutes=2))
+    new = enqueue(run_after=now - timedelta(minutes=1))
+    urgent = enqueue(priority=JobService.PRIORITY_HIGH)
+
+    claimed = [JobService.claim_next() for _ in range(4)]
+
+    assert [job.id for job in claimed[:3]] == [urgent.id, old.id, new.id]
+    assert claimed[3] is None
+    assert later.status == "QUEUED"
+
+    job = claimed[0]
+    assert (job.status, job.attempts, job.error) == ("RUNNING", 1, None)
+    assert job.started_at is not None
+
+
+def test_running_job_is_claimed_again_once_its_lease_expires(app):
+    job = enqueue()
+    assert JobService.claim_next().id == job.id
+    assert JobService.claim_next() is None
+
+    job.started_at = datetime.utcnow() - timedelta(
+        seconds=Config.JOB_LEASE_SECONDS + 1
+    )
+    db.session.commit()
+
+    reclaimed = JobService.claim_next()
+    assert reclaimed.id == job.id
+    assert (reclaimed.status, reclaimed.attempts) == ("RUNNING", 2)
+
+
+def test_busy_account_is_passed_over(app, monkeypatch):
+    monkeypatch.setattr(Config, "JOB_MAX_RUNNING_PER_CUSTOMER", 1)
+    first = enqueue(customer_id="1111111111")
+    second = enqueue(customer_id="1111111111")
+    other = enqueue(customer_id="2222222222")
+
+    assert JobService.claim_next().id == first.id
+    # The account's one slot is taken, so its next job waits.
+    assert JobService.claim_next().id == other.id
+    assert JobService.claim_next() is None
+
+    JobService.complete(first)
+    assert JobService.claim_next().id == second.id
+
+
+@pytest.mark.parametrize("error, requeued, status, attempts", [
+    (ExternalServiceError("Google Ads failed"), True, "QUEUED", 1),
+    (RuntimeError("worker bug"), True, "QUEUED", 1),
+    (ValidationError("bad creative"), False, "FAILED", 1),
+    # Refused without being attempted: the attempt is given back.
+    (ServiceUnavailableError("circuit open", retry_after=30), True, "QUEUED", 0),
+])
+def test_fail_requeues_with_backoff_only_retryable_errors(
+    app, error, requeued, status, attempts
+):
+    enqueue()
+    job = JobService.claim_next()
+
+    assert JobService.fail(job, error) is requeued
+    assert (job.status, job.attempts) == (status, attempts)
+    assert job.error == getattr(error, "message", str(error))
+    if requeued:
+        assert job.run_after > datetime.utcnow()
+
+
+def test_job_fails_for_good_after_max_attempts(app):
+    enqueue(attempts=Config.JOB_MAX_ATTEMPTS - 1)
+    job = JobService.claim_next()
+
+    assert JobService.fail(job, ExternalServiceError("Google Ads failed")) is False
+    assert job.status == "FAILED" and job.finished_at is not None
+
+
+def test_publish_job_publishes_the_campaign(client, make_campaign, monkeypatch):
+    monkeypatch.setattr(Config, "URL_CHECK_ENABLED", False)
+    campaign_id = make_campaign()
+
+    response = client.post(f"/api/campaigns/{campaign_id}/publish")
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    run_job(JobService.claim_next())
+
+    job = client.get(f"/api/jobs/{job_id}").get_json()
+    assert job["status"] == "SUCCEEDED"
+    campaign = db.session.get(Campaign, uuid.UUID(campaign_id))
+    assert campaign.status == "PUBLISHED"
+    assert job["result"]["google_campaign_id"] == campaign.google_campaign_id
+
+
+def test_failed_publish_job_restores_draft(client, make_campaign, monkeypatch):
+    monkeypatch.setattr(Config, "URL_CHECK_ENABLED", False)
+    campaign_id = make_campaign()
+    client.post(f"/api/campaigns/{campaign_id}/publish")
+
+    def fail(*args, **kwargs):
+        raise ValidationError("rejected")
+
+    monkeypatch.setattr(
+        "app.services.campaign_service.CampaignService.publish_campaign", fail
+    )
+    run_job(JobService.claim_next())
+
+    db.session.expire_all()
+    assert db.session.get(Campaign, uuid.UUID(campaign_id)).status == "DRAFT"
@@ -0,0 +1,98 @@
+import pytest
+
+from app.config import Config
+from app.errors.exceptions import RateLimitedError
+from app.services import quota_service
+from app.services.quota_service import BULK, INTERACTIVE, QuotaService
+
+CUSTOMER = "1234567890"
+
+
+class Clock:
+    """Stands in for the ``time`` module: ``sleep`` advances both clocks."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    monotonic = time
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(app, monkeypatch):
+    # A 10-operation customer bucket refilled at 1 operation per second,
+    # 2 of them reserved for interactive calls, under a roomy daily quota.
+    monkeypatch.setattr(Config, "ADS_QUOTA_CUSTOMER_BURST", 10)
+    monkeypatch.setattr(Config, "ADS_QUOTA_CUSTOMER_OPS_PER_SECOND", 1.0)
+    monkeypatch.setattr(Config, "ADS_QUOTA_RESERVED_FRACTION", 0.2)
+    monkeypatch.setattr(Config, "ADS_QUOTA_DAILY_OPERATIONS", 86400)
+    monkeypatch.setattr(Config, "ADS_QUOTA_MAX_WAIT", 0)
+
+    clock = Clock()
+    monkeypatch.setattr(quota_service, "time", clock)
+    return clock
+
+
+def tokens(key_prefix: str) -> float:
+    (bucket,) = [
+        bucket for bucket in QuotaService.status()
+        if bucket["key"].startswith(key_prefix)
+    ]
+    return bucket["tokens"]
+
+
+def test_acquire_charges_the_customer_and_developer_token_buckets(clock):
+    QuotaService.acquire(CUSTOMER, 4)
+
+    assert tokens("customer:") == 6
+    assert tokens("developer_token:") == 86400 - 4
+
+
+def test_bulk_calls_leave_the_reserved_share_to_interactive_ones(clock):
+    QuotaService.acquire(CUSTOMER, 8, BULK)
+
+    with pytest.raises(RateLimitedError) as raised:
+        QuotaService.acquire(CUSTOMER, 1, BULK)
+    assert raised.value.retry_after == 1
+    assert tokens("customer:") == 2
+
+    QuotaService.acquire(CUSTOMER, 2, INTERACTIVE)
+    assert tokens("customer:") == 0
+
+
+def test_buckets_refill_over_time_up_to_capacity(clock):
+    QuotaService.acquire(CUSTOMER, 10)
+
+    clock.now += 3
+    assert tokens("customer:") == 3
+
+    clock.now += 60
+    assert tokens("customer:") == 10
+
+
+def test_acquire_waits_for_the_refill_within_max_wait(clock, monkeypatch):
+    monkeypatch.setattr(Config, "ADS_QUOTA_MAX_WAIT", 10)
+    QuotaService.acquire(CUSTOMER, 10)
+
+    QuotaService.acquire(CUSTOMER, 4)
+
+    assert sum(clock.sleeps) == pytest.approx(4)
+    assert tokens("customer:") == pytest.approx(0)
+
+
+def test_request_larger_than_the_bucket_waits_for_a_full_one(clock, monkeypatch):
+    monkeypatch.setattr(Config, "ADS_QUOTA_MAX_WAIT", 60)
+    QuotaService.acquire(CUSTOMER, 5, BULK)
+
+    # 50 operations are charged as the most a bulk call may take (8).
+    QuotaService.acquire(CUSTOMER, 50, BULK)
+
+    assert sum(clock.sleeps) == pytest.approx(5)
+    assert tokens("customer:") == pytest.approx(2)
@@ -0,0 +1,134 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import Config
+from app.errors.exceptions import ExternalServiceError
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.services.account_service import AccountService
+from app.services.campaign_service import CampaignService, remote_campaign_name
+from app.services.job_service import JobService
+from app.services.reconcile_service import ReconcileService
+from app.workers.job_worker import run_job
+
+
+class StubAds:
+    """Finds campaigns by name in ``remote`` (name -> resource name), or
+    fails when ``error`` is set."""
+
+    def __init__(self):
+        self.remote = {}
+        self.error = None
+
+    def find_campaigns_by_name(self, names):
+        if self.error:
+            raise self.error
+        return {name: self.remote[name] for name in names if name in self.remote}
+
+
+@pytest.fixture
+def ads(app, monkeypatch):
+    stub = StubAds()
+    monkeypatch.setattr(
+        AccountService, "google_ads", staticmethod(lambda *args, **kwargs: stub)
+    )
+    return stub
+
+
+@pytest.fixture
+def orphan(make_campaign):
+    """Creates a campaign whose publish started ``age`` seconds ago and
+    was never recorded."""
+    def orphan(
+        name: str,
+        status: str = "PUBLISHING",
+        age: float = Config.RECONCILE_GRACE_SECONDS + 60,
+    ) -> Campaign:
+        campaign = db.session.get(Campaign, uuid.UUID(make_campaign(name)))
+        campaign.status = status
+        campaign.publish_started_at = datetime.utcnow() - timedelta(seconds=age)
+        db.session.commit()
+        return campaign
+
+    return orphan
+
+
+def state(campaign):
+    db.session.expire_all()
+    campaign = db.session.get(Campaign, campaign.id)
+    return campaign.status, campaign.google_campaign_id, campaign.publish_started_at
+
+
+def test_orphans_are_adopted_or_reverted(ads, orphan):
+    created = orphan("Created")
+    lost = orphan("Lost")
+    ads.remote[remote_campaign_name("Created", created.id)] = "customers/1/campaigns/7"
+
+    assert ReconcileService.reconcile() == {
+        "checked": 2, "published": 1, "reverted": 1,
+    }
+    assert state(created) == ("PUBLISHED", "customers/1/campaigns/7", None)
+    assert state(lost) == ("DRAFT", None, None)
+
+
+def test_recent_publishes_and_publishes_with_a_live_job_are_left_alone(
+    ads, orphan
+):
+    recent = orphan("Recent", age=1)
+    queued = orphan("Queued")
+    JobService.enqueue("publish_campaign", campaign_id=queued.id)
+    db.session.commit()
+
+    assert ReconcileService.reconcile()["checked"] == 0
+    assert state(recent)[0] == state(queued)[0] == "PUBLISHING"
+
+
+def test_campaigns_of_an_account_that_failed_are_left_for_the_next_run(
+    ads, orphan
+):
+    campaign = orphan("Shoes")
+    ads.error = ExternalServiceError("Google Ads failed")
+
+    assert ReconcileService.reconcile()["checked"] == 0
+    assert state(campaign)[0] == "PUBLISHING"
+
+
+def test_retried_publish_adopts_the_campaign_an_earlier_attempt_created(
+    client, make_campaign, monkeypatch
+):
+    monkeypatch.setattr(Config, "URL_CHECK_ENABLED", False)
+    campaign_id = make_campaign()
+    client.post(f"/api/campaigns/{campaign_id}/publish")
+    job = JobService.claim_next()
+
+    # The first attempt created the campaign but died before recording it.
+    run_job(job)
+    db.session.expire_all()
+    campaign = db.session.get(Campaign, uuid.UUID(campaign_id))
+    resource_name = campaign.google_campaign_id
+    campaign.status = "PUBLISHING"
+    campaign.google_campaign_id = None
+    db.session.commit()
+
+    adopted = CampaignService.publish_campaign(campaign.id, check_remote=True)
+
+    assert (adopted.status, adopted.google_campaign_id) == (
+        "PUBLISHED", resource_name,
+    )
+
+
+def test_repeated_publish_with_the_same_idempotency_key_returns_the_job(
+    client, make_campaign
+):
+    first, second = make_campaign("First"), make_campaign("Second")
+    headers = {"Idempotency-Key": "publish-first"}
+
+    response = client.post(f"/api/campaigns/{first}/publish", headers=headers)
+    again = client.post(f"/api/campaigns/{first}/publish", headers=headers)
+    other = client.post(f"/api/campaigns/{second}/publish", headers=headers)
+
+    assert response.status_code == again.status_code == 202
+    assert again.get_json()["job_id"] == response.get_json()["job_id"]
+    assert other.status_code == 409
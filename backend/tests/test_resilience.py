@@ -0,0 +1,179 @@
+import grpc
+import pytest
+
+from app.errors.exceptions import ExternalServiceError, ServiceUnavailableError
+from app.services import google_ads, resilience
+from app.services.google_ads import resilient_ads_call
+from app.services.resilience import CircuitBreaker, RetryPolicy
+
+
+class Clock:
+    """Stands in for the ``time`` module: ``sleep`` only advances
+    ``monotonic``."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience, "time", clock)
+    monkeypatch.setattr(google_ads, "time", clock)
+    return clock
+
+
+class RpcError(grpc.RpcError):
+    def __init__(self, code: grpc.StatusCode):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+def test_backoff_is_jittered_below_the_capped_exponential(monkeypatch):
+    policy = RetryPolicy(max_attempts=10, base_delay=0.5, max_delay=4, deadline=60)
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+
+    assert [policy.backoff(n) for n in range(1, 6)] == [0.5, 1, 2, 4, 4]
+    # The server's delay is a floor.
+    assert policy.backoff(1, retry_after=3) == 3
+
+
+def test_should_retry_stops_at_max_attempts_and_deadline(clock):
+    policy = RetryPolicy(max_attempts=3, base_delay=1, max_delay=8, deadline=10)
+    started = clock.monotonic()
+
+    assert policy.should_retry(1, started, delay=1)
+    assert not policy.should_retry(3, started, delay=1)
+
+    clock.now += 8
+    assert policy.should_retry(2, started, delay=1.5)
+    # Sleeping would run past the deadline.
+    assert not policy.should_retry(2, started, delay=2.5)
+
+
+def test_breaker_opens_after_threshold_and_lets_one_trial_through(clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
+
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.stats()["state"] == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    assert breaker.retry_after() == 30
+
+    clock.now += 30
+    # Half-open: one trial call at a time.
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.stats()["state"] == CircuitBreaker.OPEN
+
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.stats()["state"] == CircuitBreaker.CLOSED
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_release_frees_the_trial_slot_without_judging_health(clock):
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=5)
+    breaker.allow()
+    breaker.record_failure()
+
+    clock.now += 5
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.stats()["state"] == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+
+class StubService:
+    """A ``GoogleAdsService`` stand-in whose calls raise ``errors`` in turn
+    and then return "ok"."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def _raise_ads_error(self, ex):
+        raise ExternalServiceError(f"Google Ads failed: {ex.code().name}")
+
+    def _call(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+    create = resilient_ads_call(idempotent=False)(_call)
+    read = resilient_ads_call(idempotent=True)(_call)
+
+
+@pytest.fixture
+def breaker(monkeypatch, clock):
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+    monkeypatch.setattr(google_ads, "ads_circuit_breaker", breaker)
+    monkeypatch.setattr(google_ads, "ads_retry_policy", RetryPolicy(
+        max_attempts=4, base_delay=1, max_delay=8, deadline=60,
+    ))
+    return breaker
+
+
+def test_transient_errors_are_retried_with_backoff(breaker, clock):
+    service = StubService(
+        RpcError(grpc.StatusCode.UNAVAILABLE),
+        RpcError(grpc.StatusCode.RESOURCE_EXHAUSTED),
+    )
+
+    assert service.create() == "ok"
+    assert service.calls == 3
+    assert len(clock.sleeps) == 2
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_permanent_errors_fail_at_once_without_tripping_the_breaker(
+    breaker, clock
+):
+    service = StubService(RpcError(grpc.StatusCode.INVALID_ARGUMENT))
+
+    with pytest.raises(ExternalServiceError, match="INVALID_ARGUMENT"):
+        service.create()
+    assert service.calls == 1 and clock.sleeps == []
+    assert breaker.stats()["consecutive_failures"] == 0
+
+
+def test_deadline_exceeded_is_retried_only_when_idempotent(breaker, clock):
+    with pytest.raises(ExternalServiceError, match="DEADLINE_EXCEEDED"):
+        StubService(RpcError(grpc.StatusCode.DEADLINE_EXCEEDED)).create()
+
+    service = StubService(RpcError(grpc.StatusCode.DEADLINE_EXCEEDED))
+    assert service.read() == "ok"
+    assert service.calls == 2
+
+
+def test_open_breaker_stops_retries_and_fails_fast(breaker, clock):
+    service = StubService(*[RpcError(grpc.StatusCode.UNAVAILABLE)] * 4)
+
+    # The third failure opens the circuit, which ends the retries.
+    with pytest.raises(ServiceUnavailableError):
+        service.create()
+    assert service.calls == 3
+    assert breaker.stats()["state"] == CircuitBreaker.OPEN
+
+    with pytest.raises(ServiceUnavailableError) as raised:
+        service.create()
+    assert service.calls == 3
+    assert 0 < raised.value.retry_after <= 30
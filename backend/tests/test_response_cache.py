@@ -0,0 +1,18 @@
+def test_metrics_are_cached_per_campaign(client, make_campaign):
+    query = "?from=2026-01-01&to=2026-01-02"
+    first = make_campaign("First")
+    second = make_campaign("Second")
+
+    a = client.get(f"/api/campaigns/{first}/metrics{query}")
+    b = client.get(f"/api/campaigns/{second}/metrics{query}")
+
+    assert a.status_code == b.status_code == 200
+    assert a.get_json()["campaign_id"] == first
+    assert b.get_json()["campaign_id"] == second
+    assert a.headers["ETag"] != b.headers["ETag"]
+
+    again = client.get(
+        f"/api/campaigns/{first}/metrics{query}",
+        headers={"If-None-Match": a.headers["ETag"]},
+    )
+    assert again.status_code == 304
@@ -0,0 +1,172 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import Config
+from app.errors.exceptions import RateLimitedError
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.services.account_service import AccountService
+from app.services.schedule_service import LAUNCH, ScheduleService, local_date
+
+
+class StubAds:
+    """Answers ``set_campaign_statuses`` with ``errors`` (one list of
+    messages per campaign) and records what it was called with."""
+
+    def __init__(self, errors=None, raises=None, during_call=None):
+        self.errors = errors
+        self.raises = raises
+        self.during_call = during_call
+        self.calls = []
+
+    def set_campaign_statuses(self, resource_names, enabled):
+        self.calls.append((list(resource_names), enabled))
+        if self.during_call:
+            self.during_call()
+        if self.raises:
+            raise self.raises
+        return self.errors or [[] for _ in resource_names]
+
+
+@pytest.fixture
+def ads(monkeypatch):
+    stub = StubAds()
+    monkeypatch.setattr(
+        AccountService, "google_ads", staticmethod(lambda *args, **kwargs: stub)
+    )
+    return stub
+
+
+@pytest.fixture
+def published(make_campaign):
+    """Creates a campaign published to Google Ads that starts today."""
+    def published(name: str = "Shoes", **fields) -> uuid.UUID:
+        campaign_id = uuid.UUID(
+            make_campaign(name, start_date=local_date(time.time()).isoformat())
+        )
+        db.session.execute(
+            db.update(Campaign)
+            .where(Campaign.id == campaign_id)
+            .values(**{
+                "status": "PUBLISHED",
+                "google_campaign_id": f"customers/1234567890/campaigns/{name}",
+                **fields,
+            })
+        )
+        db.session.commit()
+        return campaign_id
+
+    return published
+
+
+def campaign(campaign_id) -> Campaign:
+    db.session.expire_all()
+    return db.session.get(Campaign, campaign_id)
+
+
+def test_due_launch_enables_campaign(app, ads, published):
+    campaign_id = published()
+
+    assert ScheduleService.apply(LAUNCH, [campaign_id]) == {
+        "updated": 1, "failed": 0,
+    }
+
+    row = campaign(campaign_id)
+    assert (row.status, row.remote_status) == ("ENABLED", "ENABLED")
+    assert (row.schedule_attempts, row.schedule_retry_at) == (0, None)
+    assert ads.calls == [([row.google_campaign_id], True)]
+
+
+def test_rows_are_claimed_and_committed_before_calling_ads(
+    app, client, ads, published
+):
+    campaign_id = published()
+    seen = {}
+
+    def during_call():
+        seen["status"] = campaign(campaign_id).status
+        seen["pause"] = client.post(f"/api/campaigns/{campaign_id}/pause")
+
+    ads.during_call = during_call
+    ScheduleService.apply(LAUNCH, [campaign_id])
+
+    assert seen["status"] == "LAUNCHING"
+    assert seen["pause"].status_code == 409
+    assert campaign(campaign_id).status == "ENABLED"
+
+
+def test_failed_launch_backs_off_and_is_not_due_until_then(app, ads, published):
+    campaign_id = published()
+    ads.errors = [["CAMPAIGN_ERROR"]]
+
+    before = datetime.utcnow()
+    assert ScheduleService.apply(LAUNCH, [campaign_id]) == {
+        "updated": 0, "failed": 1,
+    }
+
+    row = campaign(campaign_id)
+    assert (row.status, row.schedule_attempts) == ("PUBLISHED", 1)
+    assert row.schedule_retry_at >= before + timedelta(
+        seconds=Config.SCHEDULER_RETRY_BASE_DELAY
+    )
+
+    # Not retried before its backoff ends ...
+    assert ScheduleService.apply(LAUNCH, [campaign_id])["failed"] == 0
+    assert len(ads.calls) == 1
+
+    # ... and due again at its end.
+    now = time.time()
+    upcoming = {
+        key: deadline
+        for key, action, deadline in ScheduleService.upcoming(now, now + 3600)
+        if action == LAUNCH
+    }
+    assert upcoming[campaign_id] > now
+
+
+def test_launch_is_given_up_after_max_attempts(app, ads, published):
+    campaign_id = published(schedule_attempts=Config.SCHEDULER_MAX_ATTEMPTS - 1)
+    ads.errors = [["CAMPAIGN_ERROR"]]
+
+    ScheduleService.apply(LAUNCH, [campaign_id])
+
+    row = campaign(campaign_id)
+    assert row.status == "LAUNCH_FAILED"
+    assert row.schedule_attempts == Config.SCHEDULER_MAX_ATTEMPTS
+    assert row.schedule_retry_at is None
+
+    now = time.time()
+    assert ScheduleService.upcoming(now, now + 3600) == []
+
+
+def test_quota_deferral_does_not_use_an_attempt(app, ads, published):
+    campaign_id = published()
+    ads.raises = RateLimitedError("quota", retry_after=30)
+
+    assert ScheduleService.apply(LAUNCH, [campaign_id])["failed"] == 1
+
+    row = campaign(campaign_id)
+    assert (row.status, row.schedule_attempts) == ("PUBLISHED", 0)
+    assert row.schedule_retry_at > datetime.utcnow()
+
+
+def test_claim_left_by_stopped_scheduler_is_taken_over_after_its_lease(
+    app, ads, published
+):
+    expired = published(
+        "Expired",
+        status="LAUNCHING",
+        schedule_retry_at=datetime.utcnow() - timedelta(seconds=1),
+    )
+    held = published(
+        "Held",
+        status="LAUNCHING",
+        schedule_retry_at=datetime.utcnow() + timedelta(minutes=5),
+    )
+
+    assert ScheduleService.apply(LAUNCH, [expired, held])["updated"] == 1
+    assert campaign(expired).status == "ENABLED"
+    assert campaign(held).status == "LAUNCHING"
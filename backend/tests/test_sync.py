@@ -0,0 +1,181 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.campaign import Campaign
+from app.models.sync_cursor import SyncCursor
+from app.services.sync_service import CHANGE_TIME_FORMAT, SyncService
+
+CUSTOMER = "1234567890"
+
+
+class StubAds:
+    """Answers the sync's two queries from ``remote`` (resource name ->
+    state) and ``changed``, and records the resource names read."""
+
+    customer_id = CUSTOMER
+
+    def __init__(self):
+        self.remote = {}
+        self.changed = {"campaigns": set(), "budgets": set()}
+        self.truncated = False
+        self.reads = []
+
+    def changed_campaigns(self, since, until, limit):
+        return {
+            **self.changed,
+            "latest": None,
+            "truncated": self.truncated,
+        }
+
+    def campaign_states(self, resource_names=None):
+        self.reads.append(resource_names)
+        return [
+            {"resource_name": name, **state}
+            for name, state in self.remote.items()
+            if resource_names is None or name in resource_names
+        ]
+
+    def set(self, resource_name, status, budget=5, serving_status="SERVING"):
+        self.remote[resource_name] = {
+            "status": status,
+            "serving_status": serving_status,
+            "budget_resource_name": f"{resource_name}/budget",
+            "budget_micros": budget * 1_000_000,
+        }
+
+
+@pytest.fixture
+def ads(app):
+    return StubAds()
+
+
+@pytest.fixture
+def published(make_campaign):
+    """Creates a campaign published to Google Ads with ``status`` locally
+    and returns its resource name."""
+    def published(name: str, status: str = "PUBLISHED", **fields) -> str:
+        resource_name = f"customers/{CUSTOMER}/campaigns/{name}"
+        db.session.execute(
+            db.update(Campaign)
+            .where(Campaign.id == uuid.UUID(make_campaign(name)))
+            .values(
+                status=status, google_campaign_id=resource_name, **fields
+            )
+        )
+        db.session.commit()
+        return resource_name
+
+    return published
+
+
+def local(resource_name) -> Campaign:
+    db.session.expire_all()
+    return db.session.execute(
+        db.select(Campaign).where(Campaign.google_campaign_id == resource_name)
+    ).scalar_one()
+
+
+def test_first_run_reads_the_whole_account(ads, published):
+    shoes = published("Shoes")
+    ads.set(shoes, "ENABLED", budget=12)
+
+    summary = SyncService.sync_customer(ads)
+
+    assert summary == {
+        "customer_id": CUSTOMER, "mode": "full", "fetched": 1, "updated": 1,
+    }
+    assert ads.reads == [None]
+    campaign = local(shoes)
+    assert (campaign.status, campaign.remote_status) == ("ENABLED", "ENABLED")
+    assert campaign.daily_budget == 12
+    assert campaign.google_budget_id == f"{shoes}/budget"
+    assert db.session.get(SyncCursor, f"change_status:{CUSTOMER}") is not None
+
+
+def test_later_runs_read_only_changed_and_drifted_campaigns(ads, published):
+    changed, drifted, quiet = (
+        published("Changed"), published("Drifted"), published("Quiet")
+    )
+    for name in (changed, drifted, quiet):
+        ads.set(name, "PAUSED")
+    SyncService.sync_customer(ads)
+
+    # A pause that failed for good restored ENABLED locally.
+    db.session.execute(
+        db.update(Campaign)
+        .where(Campaign.google_campaign_id == drifted)
+        .values(status="ENABLED")
+    )
+    db.session.commit()
+    ads.set(changed, "PAUSED", budget=20)
+    ads.changed["campaigns"] = {changed}
+
+    summary = SyncService.sync_customer(ads)
+
+    assert summary["mode"] == "incremental"
+    assert sorted(ads.reads[-1]) == sorted([changed, drifted])
+    assert local(changed).daily_budget == 20
+    assert local(drifted).status == "PAUSED"
+
+
+def test_truncated_change_list_falls_back_to_a_full_read(ads, published):
+    ads.set(published("Shoes"), "PAUSED")
+    SyncService.sync_customer(ads)
+
+    ads.truncated = True
+    assert SyncService.sync_customer(ads)["mode"] == "full"
+    assert ads.reads[-1] is None
+
+
+def test_expired_cursor_falls_back_to_a_full_read(ads, published):
+    ads.set(published("Shoes"), "PAUSED")
+    db.session.add(SyncCursor(
+        key=f"change_status:{CUSTOMER}",
+        value=(datetime.utcnow() - timedelta(days=120)).strftime(
+            CHANGE_TIME_FORMAT
+        ),
+    ))
+    db.session.commit()
+
+    assert SyncService.sync_customer(ads)["mode"] == "full"
+
+
+def test_unchanged_campaigns_are_not_written(ads, published):
+    ads.set(published("Shoes"), "PAUSED")
+    assert SyncService.sync_customer(ads)["updated"] == 1
+
+    ads.truncated = True
+    assert SyncService.sync_customer(ads)["updated"] == 0
+
+
+@pytest.mark.parametrize("status, remote_status, expected", [
+    # In-flight local operations keep their status.
+    ("PUBLISHING", "ENABLED", "PUBLISHING"),
+    ("PAUSING", "ENABLED", "PAUSING"),
+    ("LAUNCHING", "ENABLED", "LAUNCHING"),
+    ("ENDING", "PAUSED", "ENDING"),
+    # Created paused and never enabled.
+    ("PUBLISHED", "PAUSED", "PUBLISHED"),
+    ("PUBLISHED", "ENABLED", "ENABLED"),
+    ("ENABLED", "PAUSED", "PAUSED"),
+    ("PAUSED", "ENABLED", "ENABLED"),
+    ("ENABLED", "REMOVED", "REMOVED"),
+    # A given-up scheduled end stays visible until it is resolved.
+    ("END_FAILED", "ENABLED", "END_FAILED"),
+    ("END_FAILED", "PAUSED", "PAUSED"),
+    ("LAUNCH_FAILED", "ENABLED", "ENABLED"),
+])
+def test_local_status_follows_remote_status(
+    ads, published, status, remote_status, expected
+):
+    shoes = published("Shoes", status=status)
+    ads.set(shoes, remote_status)
+
+    SyncService.sync_customer(ads)
+
+    campaign = local(shoes)
+    assert campaign.status == expected
+    assert campaign.remote_status == remote_status
@@ -16,8 +16,19 @@ export async function createCampaign(data) {
   return response.json();
 }
 
-export async function getCampaigns() {
-  const response = await fetch(`${API_BASE_URL}/campaigns`);
+export async function getAccounts() {
+  const response = await fetch(`${API_BASE_URL}/accounts`);
+
+  if (!response.ok) {
+    throw new Error("Failed to fetch accounts");
+  }
+
+  return response.json();
+}
+
+export async function getCampaigns(cursor = null) {
+  const params = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+  const response = await fetch(`${API_BASE_URL}/campaigns${params}`);
 
   if (!response.ok) {
     throw new Error("Failed to fetch campaigns");
@@ -52,4 +63,49 @@ export async function pauseCampaign(campaignId) {
   }
 
   return response.json();
-}
\ No newline at end of file
+}
+
+// Streams campaign status changes. onStatus gets a list of
+// {id, status, google_campaign_id} deltas; onReset is called when changes
+// may have been missed and the list should be reloaded. The
+// browser reconnects (and resumes) by itself; a backend on sync workers
+// refuses the stream, which then stays closed. Returns a function that
+// closes the stream.
+export function subscribeCampaignEvents({ onStatus, onReset }) {
+  const source = new EventSource(`${API_BASE_URL}/campaigns/events`);
+
+  source.addEventListener("status", (event) => {
+    onStatus(JSON.parse(event.data));
+  });
+  source.addEventListener("reset", () => onReset());
+
+  return () => source.close();
+}
+
+export async function getJob(jobId) {
+  const response = await fetch(`${API_BASE_URL}/jobs/${jobId}`);
+
+  if (!response.ok) {
+    throw new Error("Failed to fetch job");
+  }
+
+  return response.json();
+}
+
+export async function waitForJob(jobId, intervalMs = 1000) {
+  for (;;) {
+    const job = await getJob(jobId);
+
+    if (job.status === "SUCCEEDED") {
+      return job;
+    }
+
+    if (job.status === "FAILED") {
+      const error = new Error(job.error || "Job failed");
+      error.job = job;
+      throw error;
+    }
+
+    await new Promise((resolve) => setTimeout(resolve, intervalMs));
+  }
+}
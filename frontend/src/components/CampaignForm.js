@@ -1,5 +1,5 @@
-import { useState } from "react";
-import { createCampaign } from "../api/campaigns";
+import { useEffect, useState } from "react";
+import { createCampaign, getAccounts } from "../api/campaigns";
 
 function CampaignForm({ onCreated }) {
   const [form, setForm] = useState({
@@ -13,11 +13,20 @@ function CampaignForm({ onCreated }) {
     ad_headline: "",
     ad_description: "",
     asset_url: "",
+    customer_id: "",
   });
 
+  const [accounts, setAccounts] = useState([]);
+
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
 
+  useEffect(() => {
+    getAccounts()
+      .then((result) => setAccounts(result.data))
+      .catch(() => setAccounts([]));
+  }, []);
+
   function handleChange(e) {
     setForm({ ...form, [e.target.name]: e.target.value });
   }
@@ -55,6 +64,23 @@ function CampaignForm({ onCreated }) {
           required
         />
 
+        {accounts.length > 0 && (
+          <select
+            name="customer_id"
+            value={form.customer_id}
+            onChange={handleChange}
+          >
+            <option value="">Default Google Ads account</option>
+            {accounts
+              .filter((account) => account.status === "ENABLED")
+              .map((account) => (
+                <option key={account.customer_id} value={account.customer_id}>
+                  {account.name || account.customer_id}
+                </option>
+              ))}
+          </select>
+        )}
+
         <div className="row">
           <select
             name="objective"
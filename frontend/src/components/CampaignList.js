@@ -8,18 +8,22 @@ import {
   getCampaigns,
   publishCampaign,
   pauseCampaign,
+  subscribeCampaignEvents,
+  waitForJob,
 } from "../api/campaigns";
 
 const CampaignList = forwardRef((props, ref) => {
   const [campaigns, setCampaigns] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [actionLoading, setActionLoading] = useState(null);
 
   async function loadCampaigns() {
     try {
       setLoading(true);
-      const data = await getCampaigns();
-      setCampaigns(data);
+      const page = await getCampaigns();
+      setCampaigns(page.data);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       alert(err.message || "Failed to load campaigns");
     } finally {
@@ -27,12 +31,30 @@ const CampaignList = forwardRef((props, ref) => {
     }
   }
 
+  async function loadMore() {
+    try {
+      const page = await getCampaigns(nextCursor);
+      setCampaigns((current) => [...current, ...page.data]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      alert(err.message || "Failed to load campaigns");
+    }
+  }
+
   async function handlePublish(id) {
     try {
       setActionLoading(id);
-      await publishCampaign(id);
-      await loadCampaigns();
+      const { job_id, status } = await publishCampaign(id);
+      applyStatuses([{ id, status }]);
+      const { result } = await waitForJob(job_id);
+      applyStatuses([{
+        id,
+        status: result.status,
+        google_campaign_id: result.google_campaign_id,
+      }]);
     } catch (err) {
+      // A publish job that failed for good puts the campaign back to DRAFT.
+      if (err.job) applyStatuses([{ id, status: "DRAFT" }]);
       if (err.message?.includes("DEVELOPER_TOKEN_NOT_APPROVED")) {
         alert(
           "Publishing is disabled until Google Ads developer access is approved."
@@ -46,11 +68,17 @@ const CampaignList = forwardRef((props, ref) => {
   }
 
   async function handlePause(id) {
+    const previous = campaigns.find((c) => c.id === id)?.status;
+
     try {
       setActionLoading(id);
-      await pauseCampaign(id);
-      await loadCampaigns();
+      const { job_id, status } = await pauseCampaign(id);
+      applyStatuses([{ id, status }]);
+      const { result } = await waitForJob(job_id);
+      applyStatuses([{ id, status: result.status }]);
     } catch (err) {
+      // A pause job that failed for good restores the previous status.
+      if (err.job) applyStatuses([{ id, status: previous }]);
       alert(err.message || "Failed to pause campaign");
     } finally {
       setActionLoading(null);
@@ -61,8 +89,23 @@ const CampaignList = forwardRef((props, ref) => {
     reload: loadCampaigns,
   }));
 
+  function applyStatuses(deltas) {
+    const byId = new Map(deltas.map((delta) => [delta.id, delta]));
+    setCampaigns((current) =>
+      current.map((c) => (byId.has(c.id) ? { ...c, ...byId.get(c.id) } : c))
+    );
+  }
+
   useEffect(() => {
     loadCampaigns();
+
+    // Status changes (ours and everyone else's) arrive as deltas and are
+    // applied to the rows; the list is only reloaded when the stream
+    // reports that changes may have been missed.
+    return subscribeCampaignEvents({
+      onStatus: applyStatuses,
+      onReset: loadCampaigns,
+    });
   }, []);
 
   if (loading) return <p>Loading campaigns…</p>;
@@ -112,7 +155,7 @@ const CampaignList = forwardRef((props, ref) => {
                   </button>
                 )}
 
-                {c.status === "PUBLISHED" && (
+                {["PUBLISHED", "ENABLED", "END_FAILED"].includes(c.status) && (
                   <button
                     disabled={actionLoading === c.id}
                     onClick={() => handlePause(c.id)}
@@ -125,6 +168,8 @@ const CampaignList = forwardRef((props, ref) => {
           ))}
         </tbody>
       </table>
+
+      {nextCursor && <button onClick={loadMore}>Load more</button>}
     </div>
   );
 });